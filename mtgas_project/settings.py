@@ -123,6 +123,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # MTG Arena specific settings
 MTGA_LOG_PATH = None  # Set via environment or command line
 SCRYFALL_CACHE_DIR = BASE_DIR / "data" / "cache"
+# Rows per INSERT when imports bulk-create cards and game events, so a long
+# match does not become one oversized statement
+IMPORT_BULK_BATCH_SIZE = int(os.environ.get("MTGAS_BULK_BATCH", "500"))
 
 # --- Media files (local filesystem) ---
 MEDIA_URL = "/media/"
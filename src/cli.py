@@ -1,21 +1,58 @@
-#!/usr/bin/env python3
 """
 MTG Arena Statistics Tracker CLI.
 
 Command-line interface for importing log files and querying statistics.
+Installed as the ``mtgas`` command; from a checkout, run ``python -m src.cli``.
 """
 
 import argparse
 import logging
 import sys
 from pathlib import Path
-
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.db.database import init_db  # noqa: E402
-from src.services.import_service import import_log  # noqa: E402
-from src.services.scryfall import get_scryfall  # noqa: E402
+from string import Template
+
+# Heavy dependencies (sqlite3, requests, scrython, the import pipeline) are
+# imported inside the command that needs them so `--help` and argument errors
+# stay fast.
+
+# Rows fetched per round trip when streaming match listings
+MATCHES_FETCH_SIZE = 64
+
+# Marker shown next to each match in `matches` output
+_RESULT_EMOJI = {"win": "✓", "loss": "✗", "incomplete": "?"}
+
+# "Top N by games played" breakdown shown by `stats`, grouped by $key
+_TOP_N_SQL = Template("""
+    SELECT $label, COUNT(*) AS games,
+           SUM(m.result = 'win') AS wins,
+           SUM(m.result = 'win') * 100.0 / COUNT(*) AS win_rate
+    FROM matches m $join
+    WHERE $key IS NOT NULL
+    GROUP BY $key
+    ORDER BY games DESC
+    LIMIT ?
+""")
+
+# (heading, query, row limit) for each `stats` breakdown section
+_STATS_SECTIONS = (
+    (
+        "Top Decks",
+        _TOP_N_SQL.substitute(
+            label="d.name", key="m.deck_id", join="JOIN decks d ON m.deck_id = d.id"
+        ),
+        5,
+    ),
+    (
+        "Most Played Opponents",
+        _TOP_N_SQL.substitute(label="m.opponent_name", key="m.opponent_name", join=""),
+        5,
+    ),
+    (
+        "Format Breakdown",
+        _TOP_N_SQL.substitute(label="m.event_id", key="m.event_id", join=""),
+        20,
+    ),
+)
 
 
 def setup_logging(verbose: bool = False):
@@ -25,21 +62,26 @@ def setup_logging(verbose: bool = False):
 
 
 def cmd_import(args):
-    """Import a log file into the database."""
-    log_path = args.log_file
+    """Import one or more log files into the database."""
+    from .services.import_service import import_logs
 
-    if not Path(log_path).exists():
-        print(f"Error: Log file not found: {log_path}")
-        return 1
+    log_paths = args.log_file
 
-    print(f"Importing log file: {log_path}")
-    count = import_log(log_path, args.database)
+    for log_path in log_paths:
+        if not Path(log_path).exists():
+            print(f"Error: Log file not found: {log_path}")
+            return 1
+
+    print(f"Importing log file{'s' if len(log_paths) > 1 else ''}: {', '.join(log_paths)}")
+    count = import_logs(log_paths, args.database)
     print(f"Successfully imported {count} matches")
     return 0
 
 
 def cmd_init(args):
     """Initialize the database."""
+    from .db.database import init_db
+
     db = init_db(args.database)
     print(f"Database initialized at: {db.db_path}")
     return 0
@@ -47,60 +89,31 @@ def cmd_init(args):
 
 def cmd_stats(args):
     """Show overall statistics."""
-    db = init_db(args.database)
+    from .db.database import init_db
 
-    # Total matches
-    cursor = db.execute("SELECT COUNT(*) as count FROM matches")
-    total_matches = cursor.fetchone()["count"]
-
-    # Win/loss record
-    cursor = db.execute("""
-        SELECT result, COUNT(*) as count
-        FROM matches
-        WHERE result IS NOT NULL
-        GROUP BY result
-    """)
-    results = {row["result"]: row["count"] for row in cursor.fetchall()}
-
-    wins = results.get("win", 0)
-    losses = results.get("loss", 0)
-    win_rate = (wins / (wins + losses) * 100) if (wins + losses) > 0 else 0
-
-    # Top decks
-    cursor = db.execute("""
-        SELECT d.name,
-               COUNT(*) as games,
-               SUM(CASE WHEN m.result = 'win' THEN 1 ELSE 0 END) as wins
-        FROM matches m
-        JOIN decks d ON m.deck_id = d.id
-        GROUP BY d.id
-        ORDER BY games DESC
-        LIMIT 5
-    """)
-    top_decks = cursor.fetchall()
-
-    # Most played opponents
-    cursor = db.execute("""
-        SELECT opponent_name, COUNT(*) as games,
-               SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END) as wins
-        FROM matches
-        WHERE opponent_name IS NOT NULL
-        GROUP BY opponent_name
-        ORDER BY games DESC
-        LIMIT 5
-    """)
-    top_opponents = cursor.fetchall()
-
-    # Format breakdown
-    cursor = db.execute("""
-        SELECT event_id, COUNT(*) as games,
-               SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END) as wins
-        FROM matches
-        WHERE event_id IS NOT NULL
-        GROUP BY event_id
-        ORDER BY games DESC
-    """)
-    formats = cursor.fetchall()
+    db = init_db(args.database)
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.row_factory = None  # rows are unpacked positionally below
+
+    # Run every aggregate inside one read transaction on a single cursor so
+    # SQLite takes one snapshot and reuses its cached statement plans.
+    cursor.execute("BEGIN")
+    try:
+        # Totals and win/loss record, maintained by triggers on matches
+        total_matches, wins, losses = cursor.execute(
+            "SELECT total, wins, losses FROM match_summary WHERE id = 1"
+        ).fetchone()
+
+        sections = [
+            (heading, cursor.execute(query, (limit,)).fetchall())
+            for heading, query, limit in _STATS_SECTIONS
+        ]
+    finally:
+        conn.rollback()
+
+    decided = wins + losses
+    win_rate = wins * 100.0 / decided if decided else 0
 
     # Print stats
     print("\n" + "=" * 50)
@@ -110,20 +123,12 @@ def cmd_stats(args):
     print(f"\nTotal Matches: {total_matches}")
     print(f"Record: {wins}W - {losses}L ({win_rate:.1f}% win rate)")
 
-    print("\n--- Top Decks ---")
-    for deck in top_decks:
-        deck_wr = (deck["wins"] / deck["games"] * 100) if deck["games"] > 0 else 0
-        print(f"  {deck['name']}: {deck['games']} games, {deck['wins']}W ({deck_wr:.1f}%)")
-
-    print("\n--- Most Played Opponents ---")
-    for opp in top_opponents:
-        opp_wr = (opp["wins"] / opp["games"] * 100) if opp["games"] > 0 else 0
-        print(f"  {opp['opponent_name']}: {opp['games']} games, {opp['wins']}W ({opp_wr:.1f}%)")
-
-    print("\n--- Format Breakdown ---")
-    for fmt in formats:
-        fmt_wr = (fmt["wins"] / fmt["games"] * 100) if fmt["games"] > 0 else 0
-        print(f"  {fmt['event_id']}: {fmt['games']} games, {fmt['wins']}W ({fmt_wr:.1f}%)")
+    for heading, rows in sections:
+        if not rows:
+            continue
+        print(f"\n--- {heading} ---")
+        for label, games, group_wins, group_wr in rows:
+            print(f"  {label}: {games} games, {group_wins}W ({group_wr:.1f}%)")
 
     print()
     return 0
@@ -131,13 +136,20 @@ def cmd_stats(args):
 
 def cmd_matches(args):
     """List recent matches."""
+    from .db.database import init_db
+
     db = init_db(args.database)
 
     limit = args.limit or 10
 
-    cursor = db.execute(
+    # Count is bounded by the limit, so this never scans more rows than we print
+    cursor = db.execute("SELECT COUNT(*) FROM (SELECT 1 FROM matches LIMIT ?)", (limit,))
+    print(f"\n--- Last {cursor.fetchone()[0]} Matches ---\n")
+
+    cursor = db.execute_tuples(
         """
-        SELECT m.*, d.name as deck_name
+        SELECT m.result, m.start_time, m.opponent_name, d.name as deck_name,
+               m.event_id, m.total_turns, m.duration_seconds
         FROM matches m
         LEFT JOIN decks d ON m.deck_id = d.id
         ORDER BY m.start_time DESC
@@ -146,44 +158,82 @@ def cmd_matches(args):
         (limit,),
     )
 
-    matches = cursor.fetchall()
+    # Stream rows in fixed-size batches rather than materializing the whole
+    # result set for large --limit values; each batch is written in one call.
+    cursor.arraysize = MATCHES_FETCH_SIZE
+    get_emoji = _RESULT_EMOJI.get
+    while True:
+        batch = cursor.fetchmany()
+        if not batch:
+            break
+
+        out_lines = []
+        for result, start_time, opponent, deck_name, event_id, turns, duration in batch:
+            result_emoji = get_emoji(result or "incomplete", "?")
+
+            time_str = start_time or "Unknown time"
+            deck_str = deck_name or "Unknown deck"
+            opp_str = opponent or "Unknown"
+            turns = turns or 0
+
+            out_lines.append(
+                f"  [{result_emoji}] {time_str}\n"
+                f"      vs {opp_str} | {deck_str} | {event_id or 'Unknown format'}\n"
+                f"      {turns} turns\n"
+            )
+            if duration:
+                mins = duration // 60
+                secs = duration % 60
+                out_lines.append(f"      Duration: {mins}m {secs}s\n")
+            out_lines.append("\n")
+        sys.stdout.write("".join(out_lines))
 
-    print(f"\n--- Last {len(matches)} Matches ---\n")
+    return 0
 
-    for match in matches:
-        result_str = match["result"] or "incomplete"
-        result_emoji = {"win": "✓", "loss": "✗", "incomplete": "?"}.get(result_str, "?")
 
-        time_str = match["start_time"] or "Unknown time"
-        deck_str = match["deck_name"] or "Unknown deck"
-        opp_str = match["opponent_name"] or "Unknown"
-        turns = match["total_turns"] or 0
+def _fts_prefix_query(text):
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    terms = text.replace('"', '""').split()
+    return " ".join(f'"{term}"*' for term in terms)
 
-        print(f"  [{result_emoji}] {time_str}")
-        print(f"      vs {opp_str} | {deck_str} | {match['event_id'] or 'Unknown format'}")
-        print(f"      {turns} turns")
-        if match["duration_seconds"]:
-            mins = match["duration_seconds"] // 60
-            secs = match["duration_seconds"] % 60
-            print(f"      Duration: {mins}m {secs}s")
-        print()
 
-    return 0
+def _find_deck(db, deck_name):
+    """Find a deck by exact Arena deck ID, then by name.
+
+    Names are matched through the decks_fts index (word-prefix match); the
+    substring LIKE scan only runs when the index finds nothing.
+    """
+    deck = db.execute("SELECT * FROM decks WHERE deck_id = ?", (deck_name,)).fetchone()
+    if deck:
+        return deck
+
+    fts_query = _fts_prefix_query(deck_name)
+    if fts_query:
+        deck = db.execute(
+            """
+            SELECT d.* FROM decks_fts f
+            JOIN decks d ON d.id = f.rowid
+            WHERE decks_fts MATCH ?
+            ORDER BY f.rank
+            LIMIT 1
+        """,
+            (fts_query,),
+        ).fetchone()
+        if deck:
+            return deck
+
+    return db.execute(
+        "SELECT * FROM decks WHERE name LIKE ? LIMIT 1", (f"%{deck_name}%",)
+    ).fetchone()
 
 
 def cmd_deck(args):
     """Show deck details."""
-    db = init_db(args.database)
+    from .db.database import init_db
 
-    # Find deck
-    cursor = db.execute(
-        """
-        SELECT * FROM decks WHERE name LIKE ? OR deck_id = ?
-    """,
-        (f"%{args.deck_name}%", args.deck_name),
-    )
+    db = init_db(args.database)
 
-    deck = cursor.fetchone()
+    deck = _find_deck(db, args.deck_name)
     if not deck:
         print(f"Deck not found: {args.deck_name}")
         return 1
@@ -191,118 +241,168 @@ def cmd_deck(args):
     print(f"\n--- Deck: {deck['name']} ---")
     print(f"Format: {deck['format']}")
 
-    # Get deck cards with names
+    # Fetch the card list, its total size and the deck's match record in one
+    # round trip. The stats subquery always yields a row, so a deck with no
+    # cards still reports its games.
     cursor = db.execute(
         """
-        SELECT dc.quantity, c.name, c.mana_cost, c.type_line, c.rarity
-        FROM deck_cards dc
+        SELECT dc.quantity, c.name, c.mana_cost, c.type_line, c.rarity,
+               SUM(dc.quantity) OVER () as total_qty,
+               stats.games, stats.wins
+        FROM (
+            SELECT COUNT(*) as games,
+                   SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END) as wins
+            FROM matches WHERE deck_id = ?
+        ) stats
+        LEFT JOIN deck_cards dc ON dc.deck_id = ?
         LEFT JOIN cards c ON dc.card_grp_id = c.grp_id
-        WHERE dc.deck_id = ?
         ORDER BY c.cmc, c.name
     """,
-        (deck["id"],),
+        (deck["id"], deck["id"]),
     )
 
-    cards = cursor.fetchall()
+    rows = cursor.fetchall()
+    cards = [row for row in rows if row["quantity"] is not None]
+    summary = rows[0]
 
-    print(f"\nMain Deck ({sum(c['quantity'] for c in cards)} cards):")
+    out_lines = [f"\nMain Deck ({summary['total_qty'] or 0} cards):\n"]
     for card in cards:
         name = card["name"] or "Unknown"
         mana = card["mana_cost"] or ""
-        print(f"  {card['quantity']}x {name} {mana}")
-
-    # Match stats with this deck
-    cursor = db.execute(
-        """
-        SELECT COUNT(*) as games,
-               SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END) as wins
-        FROM matches WHERE deck_id = ?
-    """,
-        (deck["id"],),
-    )
+        out_lines.append(f"  {card['quantity']}x {name} {mana}\n")
+    sys.stdout.write("".join(out_lines))
 
-    stats = cursor.fetchone()
-    if stats["games"] > 0:
-        wr = stats["wins"] / stats["games"] * 100
-        print(f"\nStats: {stats['games']} games, {stats['wins']}W ({wr:.1f}%)")
+    if summary["games"] > 0:
+        wr = summary["wins"] / summary["games"] * 100
+        print(f"\nStats: {summary['games']} games, {summary['wins']}W ({wr:.1f}%)")
 
     return 0
 
 
 def cmd_cards(args):
     """Download and index card data from Scryfall."""
-    print("Downloading card data from Scryfall...")
-    scryfall = get_scryfall()
-
-    if args.full:
-        # Download full bulk data
-        bulk_file = scryfall.download_bulk_data()
-        if bulk_file:
-            count = scryfall.build_arena_id_index(bulk_file)
-            print(f"Indexed {count} cards with Arena IDs")
-    else:
+    if not args.full:
         print("Use --full to download complete card database (~350MB)")
         print("Otherwise, cards will be looked up individually as needed.")
+        return 0
 
-    return 0
-
+    from .services.scryfall import get_scryfall
 
-def main():
-    """Main CLI entry point."""
-    parser = argparse.ArgumentParser(
-        description="MTG Arena Statistics Tracker",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
+    print("Downloading card data from Scryfall...")
+    scryfall = get_scryfall()
+    if not scryfall.ensure_bulk_data(force_download=True, keep_raw=args.keep_raw):
+        print("Error: Failed to download card data")
+        return 1
 
-    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
-    parser.add_argument("-d", "--database", type=str, default=None, help="Path to database file")
+    print(f"Indexed {scryfall.stats()['total_cards']} cards with Arena IDs")
+    return 0
 
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
 
-    # Init command
+def _add_init_parser(subparsers):
     subparsers.add_parser("init", help="Initialize database")
 
-    # Import command
+
+def _add_import_parser(subparsers):
     import_parser = subparsers.add_parser("import", help="Import log file")
-    import_parser.add_argument("log_file", help="Path to Player.log file")
+    import_parser.add_argument(
+        "log_file", nargs="+", help="Path to Player.log file (several are parsed in parallel)"
+    )
+
 
-    # Stats command
+def _add_stats_parser(subparsers):
     subparsers.add_parser("stats", help="Show statistics")
 
-    # Matches command
+
+def _add_matches_parser(subparsers):
     matches_parser = subparsers.add_parser("matches", help="List recent matches")
     matches_parser.add_argument(
         "-n", "--limit", type=int, default=10, help="Number of matches to show"
     )
 
-    # Deck command
+
+def _add_deck_parser(subparsers):
     deck_parser = subparsers.add_parser("deck", help="Show deck details")
     deck_parser.add_argument("deck_name", help="Deck name or ID")
 
-    # Cards command
+
+def _add_cards_parser(subparsers):
     cards_parser = subparsers.add_parser("cards", help="Download card data")
     cards_parser.add_argument(
         "--full", action="store_true", help="Download full Scryfall bulk data"
     )
+    cards_parser.add_argument(
+        "--keep-raw",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Keep the raw bulk file on disk (--no-keep-raw indexes the download directly)",
+    )
+
+
+# Subcommand name -> (subparser builder, handler)
+_COMMANDS = {
+    "init": (_add_init_parser, cmd_init),
+    "import": (_add_import_parser, cmd_import),
+    "stats": (_add_stats_parser, cmd_stats),
+    "matches": (_add_matches_parser, cmd_matches),
+    "deck": (_add_deck_parser, cmd_deck),
+    "cards": (_add_cards_parser, cmd_cards),
+}
+
+# Global options that consume the following token as their value
+_OPTIONS_WITH_VALUE = {"-d", "--database"}
+
+
+def _sniff_subcommand(argv):
+    """Return the subcommand named in argv (without the program name), or None.
+
+    None when ``-h``/``--help`` comes before the command, since the top-level
+    help that argparse prints then must list every subcommand.
+    """
+    skip_next = False
+    for tok in argv:
+        if skip_next:
+            skip_next = False
+            continue
+        if tok in ("-h", "--help"):
+            return None
+        if tok in _OPTIONS_WITH_VALUE:
+            skip_next = True
+            continue
+        if tok.startswith("-"):
+            continue
+        return tok if tok in _COMMANDS else None
+    return None
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="MTG Arena Statistics Tracker",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument("-d", "--database", type=str, default=None, help="Path to database file")
+
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+
+    # Only build the subparser that will actually run; fall back to all of them
+    # for top-level help and for unknown commands so argparse can list choices.
+    command = _sniff_subcommand(sys.argv[1:])
+    if command is not None:
+        _COMMANDS[command][0](subparsers)
+    else:
+        for add_parser, _ in _COMMANDS.values():
+            add_parser(subparsers)
 
     args = parser.parse_args()
     setup_logging(args.verbose)
 
-    if args.command == "init":
-        return cmd_init(args)
-    elif args.command == "import":
-        return cmd_import(args)
-    elif args.command == "stats":
-        return cmd_stats(args)
-    elif args.command == "matches":
-        return cmd_matches(args)
-    elif args.command == "deck":
-        return cmd_deck(args)
-    elif args.command == "cards":
-        return cmd_cards(args)
-    else:
-        parser.print_help()
-        return 0
+    if args.command in _COMMANDS:
+        return _COMMANDS[args.command][1](args)
+
+    parser.print_help()
+    return 0
 
 
 if __name__ == "__main__":
@@ -12,6 +12,27 @@ CREATE TABLE IF NOT EXISTS decks (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Full-text index over deck names for `deck` lookups (kept in sync by triggers)
+CREATE VIRTUAL TABLE IF NOT EXISTS decks_fts USING fts5(
+    name, content='decks', content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS decks_fts_ai AFTER INSERT ON decks BEGIN
+    INSERT INTO decks_fts(rowid, name) VALUES (new.id, new.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS decks_fts_ad AFTER DELETE ON decks BEGIN
+    INSERT INTO decks_fts(decks_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS decks_fts_au AFTER UPDATE OF name ON decks BEGIN
+    INSERT INTO decks_fts(decks_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO decks_fts(rowid, name) VALUES (new.id, new.name);
+END;
+
+-- Index decks that existed before decks_fts was added
+INSERT INTO decks_fts(decks_fts) VALUES ('rebuild');
+
 -- Stores the cards in each deck
 CREATE TABLE IF NOT EXISTS deck_cards (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -89,6 +110,48 @@ CREATE TABLE IF NOT EXISTS matches (
     FOREIGN KEY (deck_id) REFERENCES decks(id)
 );
 
+-- Running match totals for `stats`, so it never has to scan matches (kept in sync by triggers)
+CREATE TABLE IF NOT EXISTS match_summary (
+    id INTEGER PRIMARY KEY CHECK (id = 1),   -- Single row
+    total INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL
+);
+
+-- Seeded from matches that existed before match_summary was added
+INSERT OR IGNORE INTO match_summary (id, total, wins, losses)
+SELECT 1, COUNT(*), COALESCE(SUM(result = 'win'), 0), COALESCE(SUM(result = 'loss'), 0)
+FROM matches;
+
+-- IS rather than = so a NULL (unfinished) result counts as 0, not NULL.
+-- Dropped first so databases created with the earlier `=` versions are fixed.
+DROP TRIGGER IF EXISTS match_summary_ai;
+DROP TRIGGER IF EXISTS match_summary_ad;
+DROP TRIGGER IF EXISTS match_summary_au;
+
+CREATE TRIGGER match_summary_ai AFTER INSERT ON matches BEGIN
+    UPDATE match_summary
+    SET total = total + 1,
+        wins = wins + (new.result IS 'win'),
+        losses = losses + (new.result IS 'loss')
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER match_summary_ad AFTER DELETE ON matches BEGIN
+    UPDATE match_summary
+    SET total = total - 1,
+        wins = wins - (old.result IS 'win'),
+        losses = losses - (old.result IS 'loss')
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER match_summary_au AFTER UPDATE OF result ON matches BEGIN
+    UPDATE match_summary
+    SET wins = wins - (old.result IS 'win') + (new.result IS 'win'),
+        losses = losses - (old.result IS 'loss') + (new.result IS 'loss')
+    WHERE id = 1;
+END;
+
 -- Stores each action/play during a game
 CREATE TABLE IF NOT EXISTS game_actions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -154,11 +217,27 @@ CREATE TABLE IF NOT EXISTS zone_transfers (
 -- Indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_matches_start_time ON matches(start_time);
 CREATE INDEX IF NOT EXISTS idx_matches_result ON matches(result);
-CREATE INDEX IF NOT EXISTS idx_matches_deck_id ON matches(deck_id);
-CREATE INDEX IF NOT EXISTS idx_matches_opponent ON matches(opponent_name);
 CREATE INDEX IF NOT EXISTS idx_matches_format ON matches(format);
 
-CREATE INDEX IF NOT EXISTS idx_game_actions_match ON game_actions(match_id);
+-- Covering indexes for the per-deck/opponent/event win-rate GROUP BYs
+DROP INDEX IF EXISTS idx_matches_deck_id;
+DROP INDEX IF EXISTS idx_matches_opponent;
+CREATE INDEX IF NOT EXISTS idx_matches_deck_result ON matches(deck_id, result);
+CREATE INDEX IF NOT EXISTS idx_matches_opponent_result ON matches(opponent_name, result);
+CREATE INDEX IF NOT EXISTS idx_matches_event_result ON matches(event_id, result);
+
+-- One row per (game state, action type, instance) within a match; imports
+-- rely on INSERT OR IGNORE against these to drop repeated events. NULLs are
+-- folded so they compare equal. Both also serve lookups by match_id.
+DROP INDEX IF EXISTS idx_game_actions_match;
+DROP INDEX IF EXISTS idx_zone_transfers_match;
+CREATE UNIQUE INDEX IF NOT EXISTS ux_game_actions_event ON game_actions(
+    match_id, IFNULL(game_state_id, -1), action_type, IFNULL(instance_id, -1)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_zone_transfers_event ON zone_transfers(
+    match_id, IFNULL(game_state_id, -1), IFNULL(instance_id, -1), IFNULL(category, '')
+);
+
 CREATE INDEX IF NOT EXISTS idx_game_actions_turn ON game_actions(match_id, turn_number);
 CREATE INDEX IF NOT EXISTS idx_game_actions_card ON game_actions(card_grp_id);
 
@@ -166,5 +245,6 @@ CREATE INDEX IF NOT EXISTS idx_deck_cards_deck ON deck_cards(deck_id);
 CREATE INDEX IF NOT EXISTS idx_deck_cards_card ON deck_cards(card_grp_id);
 
 CREATE INDEX IF NOT EXISTS idx_life_changes_match ON life_changes(match_id);
-CREATE INDEX IF NOT EXISTS idx_zone_transfers_match ON zone_transfers(match_id);
 
+-- Schema version (keep in sync with SCHEMA_VERSION in database.py)
+PRAGMA user_version = 6;
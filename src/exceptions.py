@@ -18,13 +18,9 @@ class LogParseError(MTGAStatsError):
         self.line_number = line_number
         self.details = details
 
-        full_message = message
-        if line_number:
-            full_message += f" (line {line_number})"
-        if details:
-            full_message += f": {details}"
-
-        super().__init__(full_message)
+        line_suffix = f" (line {line_number})" if line_number else ""
+        details_suffix = f": {details}" if details else ""
+        super().__init__(f"{message}{line_suffix}{details_suffix}")
 
 
 class InvalidLogFormatError(LogParseError):
@@ -44,10 +40,8 @@ class CardLookupError(MTGAStatsError):
 
     def __init__(self, message: str, grp_id: int = None):
         self.grp_id = grp_id
-        full_message = message
-        if grp_id:
-            full_message += f" (grpId: {grp_id})"
-        super().__init__(full_message)
+        grp_suffix = f" (grpId: {grp_id})" if grp_id else ""
+        super().__init__(f"{message}{grp_suffix}")
 
 
 class ScryfallError(MTGAStatsError):
@@ -73,10 +67,8 @@ class ImportError(MTGAStatsError):
 
     def __init__(self, message: str, match_id: str = None):
         self.match_id = match_id
-        full_message = message
-        if match_id:
-            full_message += f" (matchId: {match_id[:20]}...)"
-        super().__init__(full_message)
+        match_suffix = f" (matchId: {match_id[:20]}...)" if match_id else ""
+        super().__init__(f"{message}{match_suffix}")
 
 
 class DuplicateMatchError(ImportError):
@@ -7,18 +7,150 @@ The log file contains JSON events embedded in log lines with various prefixes.
 
 import json
 import logging
+import queue
 import re
+import sys
+import threading
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
 
 from ..exceptions import InvalidLogFormatError
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:  # orjson is an optional speedup (pip install mtgas[speedups])
+    _json_loads = json.loads
+    # json.loads raises UnicodeDecodeError for bytes that are not valid UTF-8
+    _JSONDecodeError = (json.JSONDecodeError, UnicodeDecodeError)
+
 logger = logging.getLogger(__name__)
 
+# Non-fatal event errors echoed as warnings after a parse; the rest are
+# only counted (all are available from get_parse_errors())
+LOGGED_PARSE_ERRORS = 5
+
+# Events are handed from the reader thread to match aggregation in batches
+# of this size, with at most EVENT_QUEUE_DEPTH batches in flight
+EVENT_BATCH_SIZE = 256
+EVENT_QUEUE_DEPTH = 4
+
+# Marks the end of the event stream on the reader thread's queue
+_END_OF_EVENTS = object()
+
+# Read buffer for Player.log, which routinely runs to hundreds of megabytes
+LOG_READ_BUFFER_SIZE = 1 << 20
+
+# Top-level keys that identify an event, in priority order
+_EVENT_KEYS = {
+    "matchGameRoomStateChangedEvent": "match_state",
+    "greToClientEvent": "gre_event",
+    "CourseDeck": "course_deck",
+    "CourseDeckSummary": "course_deck",
+}
+
 
-@dataclass
+def _parse_log_timestamp(text: str) -> datetime:
+    """Parse a log timestamp such as ``1/15/2026 10:30:00 PM`` as UTC.
+
+    Equivalent to ``strptime(text, "%m/%d/%Y %I:%M:%S %p")`` without
+    strptime's per-call format and locale handling.
+    """
+    date_part, time_part, meridiem = text.split()
+    month, day, year = date_part.split("/")
+    hour, minute, second = time_part.split(":")
+    hour = int(hour)
+    if not 1 <= hour <= 12:
+        raise ValueError(f"hour out of range for 12-hour clock: {text}")
+    hour %= 12
+    if meridiem == "PM":
+        hour += 12
+    return datetime(
+        int(year), int(month), int(day), hour, int(minute), int(second), tzinfo=timezone.utc
+    )
+
+
+@lru_cache(maxsize=256)
+def _datetime_from_ms(timestamp_ms: int) -> datetime:
+    """Convert an event's millisecond epoch timestamp to an aware UTC datetime.
+
+    Cached because the match-state events of one match repeat timestamps.
+    """
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+
+
+def _intern(value):
+    """Intern a string from the small phase/step/action/category vocabulary.
+
+    Every game state repeats the same few dozen values; interning makes them
+    share one object instead of one copy per action or zone transfer.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Timestamp at the start of a `[UnityCrossThreadLogger]` log line
+_RE_TIMESTAMP = re.compile(rb"\[UnityCrossThreadLogger\](\d+/\d+/\d+\s+\d+:\d+:\d+\s+[AP]M)")
+
+# Every event _classify_event recognises contains one of these names; JSON
+# without any of them is skipped before it is decoded
+_RE_EVENT_HINT = re.compile(
+    rb"matchGameRoomStateChangedEvent|greToClientEvent|gameStateMessage"
+    rb"|CourseDeck|DeckUpsertDeckV2|EventSetDeckV2"
+)
+
+# Complete JSON string literals, and the rest of one continued from a previous line
+_JSON_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_JSON_STRING_TAIL = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+def _life_rows(
+    game_state_id: Any, turn_number: Any, players: List[Dict]
+) -> Iterator[Tuple[int, int, int, int]]:
+    """Yield integer ``LifeChangeLog`` rows for ``players``.
+
+    Values that do not convert to int (a malformed life total, say) skip only
+    their own row instead of failing the whole game state message.
+    """
+    for player in players:
+        life_total = player.get("lifeTotal")
+        seat_id = player.get("systemSeatNumber")
+        if life_total is None or seat_id is None:
+            continue
+        try:
+            row = (int(game_state_id), int(turn_number), int(seat_id), int(life_total))
+        except (TypeError, ValueError, OverflowError):
+            continue
+        yield row
+
+
+def _scan_json_depth(text: bytes, depth: int, in_string: bool) -> Tuple[int, bool]:
+    """Advance brace depth and in-string state across one line of JSON text.
+
+    Lets a multi-line JSON object be parsed once, when its closing brace
+    arrives, instead of re-parsing the growing buffer on every line. String
+    literals are dropped by the regex engine and the remaining braces
+    counted, so the scan runs in C rather than per character.
+    """
+    if in_string:
+        tail = _JSON_STRING_TAIL.match(text)
+        if tail is None:
+            return depth, True
+        text = text[tail.end() :]
+    text = _JSON_STRING.sub(b"", text)
+    # An unterminated string carries over to the next line
+    quote = text.find(b'"')
+    if quote != -1:
+        text = text[:quote]
+    return depth + text.count(b"{") - text.count(b"}"), quote != -1
+
+
+@dataclass(slots=True)
 class ParsedEvent:
     """Represents a parsed event from the log file."""
 
@@ -26,10 +158,64 @@ class ParsedEvent:
     data: Dict[str, Any]
     timestamp: Optional[int] = None  # milliseconds
     line_number: int = 0
-    raw_line: str = ""
+    raw_line: str = ""  # first 200 characters, only when DEBUG logging is enabled
+    log_timestamp: Optional[datetime] = None  # last log-line timestamp before the event
 
 
-@dataclass
+class LifeChangeLog:
+    """Life totals observed during a match, stored column-wise.
+
+    A long match records thousands of these, so they are kept as parallel
+    integer arrays instead of one dict each. Iterating yields the
+    ``game_state_id``/``turn_number``/``seat_id``/``life_total`` dicts the
+    importers consume.
+    """
+
+    __slots__ = ("game_state_ids", "turn_numbers", "seat_ids", "life_totals")
+
+    def __init__(self):
+        self.game_state_ids = array("q")
+        self.turn_numbers = array("q")
+        self.seat_ids = array("q")
+        self.life_totals = array("q")
+
+    def append(self, game_state_id: int, turn_number: int, seat_id: int, life_total: int):
+        """Record one life total observation."""
+        self.game_state_ids.append(game_state_id)
+        self.turn_numbers.append(turn_number)
+        self.seat_ids.append(seat_id)
+        self.life_totals.append(life_total)
+
+    def extend(self, rows: Iterable[Tuple[int, int, int, int]]):
+        """Record ``(game_state_id, turn_number, seat_id, life_total)`` rows."""
+        for row in rows:
+            self.append(*row)
+
+    def __len__(self) -> int:
+        return len(self.life_totals)
+
+    def rows(self) -> Iterator[Tuple[int, int, int, int]]:
+        """Yield ``(game_state_id, turn_number, seat_id, life_total)`` tuples."""
+        return zip(self.game_state_ids, self.turn_numbers, self.seat_ids, self.life_totals)
+
+    def __iter__(self) -> Iterator[Dict[str, int]]:
+        for game_state_id, turn_number, seat_id, life_total in zip(
+            self.game_state_ids, self.turn_numbers, self.seat_ids, self.life_totals
+        ):
+            yield {
+                "game_state_id": game_state_id,
+                "turn_number": turn_number,
+                "seat_id": seat_id,
+                "life_total": life_total,
+            }
+
+    def __eq__(self, other):
+        if not isinstance(other, LifeChangeLog):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+@dataclass(slots=True)
 class MatchData:
     """Aggregated data for a single match."""
 
@@ -55,7 +241,7 @@ class MatchData:
     total_turns: int = 0
     game_states: List[Dict] = field(default_factory=list)
     actions: List[Dict] = field(default_factory=list)
-    life_changes: List[Dict] = field(default_factory=list)
+    life_changes: LifeChangeLog = field(default_factory=LifeChangeLog)
     zone_transfers: List[Dict] = field(default_factory=list)
     card_instances: Dict[int, Dict] = field(default_factory=dict)  # instance_id -> card data
 
@@ -67,6 +253,10 @@ class MTGALogParser:
     Designed to handle large files efficiently using generators.
     """
 
+    # How much of each game state to extract: results/turns/format only,
+    # plus life totals, or everything (card instances, actions, zone transfers)
+    DETAIL_LEVELS = ("match_only", "life_only", "full")
+
     # Patterns to identify different event types
     PATTERNS = {
         "match_state": re.compile(r"matchGameRoomStateChangedEvent"),
@@ -74,26 +264,27 @@ class MTGALogParser:
         "deck_set": re.compile(r"EventSetDeckV2"),
         "deck_upsert": re.compile(r"DeckUpsertDeckV2"),
         "course_deck": re.compile(r'"CourseDeck"'),
-        "timestamp_line": re.compile(
-            r"\[UnityCrossThreadLogger\](\d+/\d+/\d+\s+\d+:\d+:\d+\s+[AP]M)"
-        ),
-        "json_start": re.compile(r"^\s*\{"),
+        "timestamp_line": _RE_TIMESTAMP,
     }
 
-    # Pattern to extract JSON from log lines
-    JSON_EXTRACT = re.compile(r"(\{.*\})\s*$")
-
-    def __init__(self, log_path: str):
+    def __init__(self, log_path: str, detail_level: str = "full"):
         """
         Initialize parser with path to log file.
 
         Args:
             log_path: Path to Player.log file
+            detail_level: One of DETAIL_LEVELS; lower levels skip the costly
+                per-card game state extraction
 
         Raises:
             FileNotFoundError: If log file doesn't exist
             InvalidLogFormatError: If file is not a valid log file
+            ValueError: If detail_level is not recognised
         """
+        if detail_level not in self.DETAIL_LEVELS:
+            raise ValueError(f"Unknown detail level: {detail_level}")
+        self.detail_level = detail_level
+
         self.log_path = Path(log_path)
         if not self.log_path.exists():
             raise FileNotFoundError(f"Log file not found: {log_path}")
@@ -120,9 +311,19 @@ class MTGALogParser:
 
         self.current_match: Optional[MatchData] = None
         self.completed_matches: List[MatchData] = []
-        self._last_timestamp: Optional[datetime] = None
         self._last_turn_number: int = 0  # Track last seen turn for messages without turnInfo
         self._parse_errors: List[Dict] = []  # Track non-fatal parse errors
+        # ParsedEvent.raw_line is only filled in for debug logging
+        self._keep_raw_lines = False
+
+        # Event type -> handler; event types without a handler are ignored
+        self._dispatch = {
+            "match_state": self._process_match_state,
+            "gre_event": self._process_gre_event,
+            "course_deck": self._process_deck_event,
+            "deck_set": self._process_deck_event,
+            "deck_upsert": self._process_deck_event,
+        }
 
     def parse_events(self) -> Generator[ParsedEvent, None, None]:
         """
@@ -131,83 +332,125 @@ class MTGALogParser:
         Yields:
             ParsedEvent objects for each relevant event found
         """
-        with open(self.log_path, "r", encoding="utf-8", errors="ignore") as f:
+        self._keep_raw_lines = logger.isEnabledFor(logging.DEBUG)
+
+        # Lines stay bytes: most are discarded undecoded, and JSON payloads are
+        # handed to the decoder as UTF-8 bytes directly.
+        with open(self.log_path, "rb", buffering=LOG_READ_BUFFER_SIZE) as f:
             line_number = 0
             current_json_lines = []
             in_json_block = False
+            json_depth = 0
+            json_in_string = False
+            last_ts_text = None
+            last_timestamp = None
+            # Hot-loop lookups bound to locals once
+            match_timestamp = _RE_TIMESTAMP.match
+            json_loads = _json_loads
+            classify = self._classify_event
+            has_event_hint = _RE_EVENT_HINT.search
 
             for line in f:
                 line_number += 1
                 stripped = line.strip()
 
-                # Track timestamps
-                ts_match = self.PATTERNS["timestamp_line"].match(line)
-                if ts_match:
-                    try:
-                        self._last_timestamp = datetime.strptime(
-                            ts_match.group(1), "%m/%d/%Y %I:%M:%S %p"
-                        ).replace(tzinfo=timezone.utc)
-                    except ValueError:
-                        pass
+                # Track timestamps (cheap prefix check before the regex)
+                if line.startswith(b"[UnityCrossThreadLogger]"):
+                    ts_match = match_timestamp(line)
+                    # Runs of lines share a timestamp; only parse when it changes
+                    if ts_match and ts_match.group(1) != last_ts_text:
+                        last_ts_text = ts_match.group(1)
+                        try:
+                            last_timestamp = _parse_log_timestamp(last_ts_text.decode("ascii"))
+                        except ValueError:
+                            pass
 
                 # Handle multi-line JSON blocks
                 if in_json_block:
                     current_json_lines.append(stripped)
-                    # Try to parse accumulated JSON
+                    json_depth, json_in_string = _scan_json_depth(
+                        stripped, json_depth, json_in_string
+                    )
+                    if json_depth > 0 or json_in_string:
+                        # Not complete yet, continue accumulating
+                        continue
+
+                    # Closing brace reached: parse the accumulated JSON once
+                    in_json_block = False
+                    block = b"\n".join(current_json_lines)
+                    current_json_lines = []
+                    if not has_event_hint(block):
+                        continue
                     try:
-                        full_json = "\n".join(current_json_lines)
-                        data = json.loads(full_json)
-                        in_json_block = False
-                        event = self._classify_event(data, line_number, stripped)
+                        data = json_loads(block)
+                        event = classify(data, line_number, stripped, last_timestamp)
                         if event:
                             yield event
-                        current_json_lines = []
-                    except json.JSONDecodeError:
-                        # Not complete yet, continue accumulating
+                    except _JSONDecodeError:
                         pass
                     continue
 
                 # Check for JSON starting on this line
-                if self.PATTERNS["json_start"].match(stripped):
-                    try:
-                        data = json.loads(stripped)
-                        event = self._classify_event(data, line_number, stripped)
-                        if event:
-                            yield event
-                    except json.JSONDecodeError:
-                        # Multi-line JSON, start accumulating
+                if stripped.startswith(b"{"):
+                    if has_event_hint(stripped):
+                        try:
+                            data = json_loads(stripped)
+                            event = classify(data, line_number, stripped, last_timestamp)
+                            if event:
+                                yield event
+                            continue
+                        except _JSONDecodeError:
+                            pass
+                    # Unclosed braces mean multi-line JSON, start accumulating;
+                    # otherwise the line is malformed or not an event.
+                    json_depth, json_in_string = _scan_json_depth(stripped, 0, False)
+                    if json_depth > 0:
                         in_json_block = True
                         current_json_lines = [stripped]
                     continue
 
-                # Try to extract JSON from the end of the line
-                json_match = self.JSON_EXTRACT.search(stripped)
-                if json_match:
-                    try:
-                        data = json.loads(json_match.group(1))
-                        event = self._classify_event(data, line_number, stripped)
-                        if event:
-                            yield event
-                    except json.JSONDecodeError:
-                        pass
-
-    def _classify_event(self, data: Dict, line_number: int, raw_line: str) -> Optional[ParsedEvent]:
+                # Try to extract JSON from the end of the line: everything from
+                # the first "{" onwards, when the line ends with "}"
+                if not stripped.endswith(b"}"):
+                    continue
+                json_start = stripped.find(b"{")
+                if json_start == -1 or not has_event_hint(stripped, json_start):
+                    continue
+                try:
+                    data = json_loads(stripped[json_start:])
+                    event = classify(data, line_number, stripped, last_timestamp)
+                    if event:
+                        yield event
+                except _JSONDecodeError:
+                    pass
+
+    def _classify_event(
+        self,
+        data: Dict,
+        line_number: int,
+        raw_line: bytes,
+        log_timestamp: Optional[datetime] = None,
+    ) -> Optional[ParsedEvent]:
         """Classify and create a ParsedEvent from JSON data."""
         event_type = None
         timestamp = data.get("timestamp")
 
-        if "matchGameRoomStateChangedEvent" in data:
-            event_type = "match_state"
-        elif "greToClientEvent" in data:
-            event_type = "gre_event"
-        elif "CourseDeck" in data or "CourseDeckSummary" in data:
-            event_type = "course_deck"
-        elif "request" in data and "DeckUpsertDeckV2" in str(data):
-            event_type = "deck_upsert"
-        elif "request" in data and "EventSetDeckV2" in str(data):
-            event_type = "deck_set"
-        elif "gameStateMessage" in str(data):
-            event_type = "game_state"
+        for key, key_event_type in _EVENT_KEYS.items():
+            if key in data:
+                event_type = key_event_type
+                break
+        else:
+            # Deck requests carry their payload as a JSON string under "request";
+            # probe that field rather than repr-ing the whole event.
+            request = data.get("request")
+            if request is not None and not isinstance(request, str):
+                request = str(request)
+            if request is not None and "DeckUpsertDeckV2" in request:
+                event_type = "deck_upsert"
+            elif request is not None and "EventSetDeckV2" in request:
+                event_type = "deck_set"
+            elif "gameStateMessage" in data:
+                event_type = "game_state"
 
         if event_type:
             return ParsedEvent(
@@ -215,7 +458,11 @@ class MTGALogParser:
                 data=data,
                 timestamp=int(timestamp) if timestamp else None,
                 line_number=line_number,
-                raw_line=raw_line[:200],  # Truncate for memory
+                # Only kept (truncated) when debugging; no copy per event otherwise
+                raw_line=(
+                    raw_line[:200].decode("utf-8", errors="ignore") if self._keep_raw_lines else ""
+                ),
+                log_timestamp=log_timestamp,
             )
 
         return None
@@ -227,31 +474,108 @@ class MTGALogParser:
         Returns:
             List of MatchData objects for completed matches
         """
+        for _ in self.iter_matches():
+            pass
+        return self.completed_matches
+
+    def iter_matches(self) -> Generator[MatchData, None, None]:
+        """
+        Parse the log file, yielding each match as soon as it is complete.
+
+        A match is complete once the next match starts (or the file ends), so
+        consumers can start storing earlier matches while the rest of the log
+        is still being parsed. ``completed_matches`` is filled in as well.
+        """
         self.completed_matches = []
         self.current_match = None
         self._parse_errors = []
+        yielded = 0
+        log_each_error = logger.isEnabledFor(logging.DEBUG)
 
-        for event in self.parse_events():
+        for event in self._iter_events_threaded():
             try:
                 self._process_event(event)
             except Exception as e:
-                # Log error but continue processing
+                # Record error and continue processing; reported once at the end
                 error_info = {
                     "event_type": event.event_type,
                     "line_number": event.line_number,
                     "error": str(e),
                 }
                 self._parse_errors.append(error_info)
-                logger.warning(f"Error processing event at line {event.line_number}: {e}")
+                if log_each_error:
+                    logger.debug(f"Error processing event at line {event.line_number}: {e}")
+
+            while yielded < len(self.completed_matches):
+                yield self.completed_matches[yielded]
+                yielded += 1
 
         # If there's an ongoing match at end of file, add it
         if self.current_match:
             self.completed_matches.append(self.current_match)
+            yield self.current_match
 
         if self._parse_errors:
             logger.info(f"Completed with {len(self._parse_errors)} non-fatal parse errors")
+            for error_info in self._parse_errors[:LOGGED_PARSE_ERRORS]:
+                logger.warning(
+                    f"Error processing event at line {error_info['line_number']}: "
+                    f"{error_info['error']}"
+                )
 
-        return self.completed_matches
+    def _iter_events_threaded(self) -> Generator[ParsedEvent, None, None]:
+        """
+        Yield the same events as ``parse_events``, read on a worker thread.
+
+        File reads and JSON decoding overlap with match aggregation in the
+        calling thread. Errors raised while reading are re-raised here.
+        """
+        events: "queue.Queue" = queue.Queue(maxsize=EVENT_QUEUE_DEPTH)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._read_events_into_queue,
+            args=(events, stop),
+            name="mtga-log-reader",
+            daemon=True,
+        )
+        reader.start()
+        try:
+            while True:
+                batch = events.get()
+                if batch is _END_OF_EVENTS:
+                    break
+                if isinstance(batch, BaseException):
+                    raise batch
+                yield from batch
+        finally:
+            # Unblock and wait for the reader if the consumer stopped early
+            stop.set()
+            while not events.empty():
+                events.get_nowait()
+            reader.join()
+
+    def _read_events_into_queue(self, out: "queue.Queue", stop: threading.Event):
+        """Feed batches of ``parse_events`` into ``out``, ending with ``_END_OF_EVENTS``.
+
+        A read failure is put on the queue in place of the sentinel so the
+        consuming thread can re-raise it.
+        """
+        try:
+            batch = []
+            for event in self.parse_events():
+                batch.append(event)
+                if len(batch) >= EVENT_BATCH_SIZE:
+                    if stop.is_set():
+                        return
+                    out.put(batch)
+                    batch = []
+            if batch and not stop.is_set():
+                out.put(batch)
+            item = _END_OF_EVENTS
+        except Exception as e:
+            item = e
+        if not stop.is_set():
+            out.put(item)
 
     def get_parse_errors(self) -> List[Dict]:
         """Get list of non-fatal errors encountered during parsing."""
@@ -259,12 +583,9 @@ class MTGALogParser:
 
     def _process_event(self, event: ParsedEvent):
         """Process a single event and update match data."""
-        if event.event_type == "match_state":
-            self._process_match_state(event)
-        elif event.event_type == "gre_event":
-            self._process_gre_event(event)
-        elif event.event_type in ("course_deck", "deck_set", "deck_upsert"):
-            self._process_deck_event(event)
+        handler = self._dispatch.get(event.event_type)
+        if handler:
+            handler(event)
 
     def _process_match_state(self, event: ParsedEvent):
         """Process matchGameRoomStateChangedEvent."""
@@ -287,11 +608,11 @@ class MTGALogParser:
             self.current_match = MatchData(match_id=match_id)
             self._last_turn_number = 0
             if event.timestamp:
-                self.current_match.start_time = datetime.fromtimestamp(
-                    event.timestamp / 1000, tz=timezone.utc
-                )
-            elif self._last_timestamp:
-                self.current_match.start_time = self._last_timestamp
+                self.current_match.start_time = _datetime_from_ms(event.timestamp)
+            elif event.log_timestamp:
+                self.current_match.start_time = event.log_timestamp
+
+        match = self.current_match
 
         # Extract player information from reservedPlayers
         reserved_players = config.get("reservedPlayers", [])
@@ -306,37 +627,35 @@ class MTGALogParser:
             # We'll use the convention that the logged-in user sees themselves as seat 2
             # in their own logs (based on the log analysis)
             if seat_id == 2:
-                self.current_match.player_name = player_name
-                self.current_match.player_seat_id = seat_id
-                self.current_match.player_user_id = user_id
+                match.player_name = player_name
+                match.player_seat_id = seat_id
+                match.player_user_id = user_id
             else:
-                self.current_match.opponent_name = player_name
-                self.current_match.opponent_seat_id = seat_id
-                self.current_match.opponent_user_id = user_id
+                match.opponent_name = player_name
+                match.opponent_seat_id = seat_id
+                match.opponent_user_id = user_id
 
-            if event_id and not self.current_match.event_id:
-                self.current_match.event_id = event_id
+            if event_id and not match.event_id:
+                match.event_id = event_id
 
         # Check for match completion
         if state_type == "MatchGameRoomStateType_MatchCompleted":
             if event.timestamp:
-                self.current_match.end_time = datetime.fromtimestamp(
-                    event.timestamp / 1000, tz=timezone.utc
-                )
+                match.end_time = _datetime_from_ms(event.timestamp)
 
             # Extract result from finalMatchResult if available
             final_result = game_room_info.get("finalMatchResult", {})
-            self.current_match.winning_team_id = final_result.get("winningTeamId")
+            match.winning_team_id = final_result.get("winningTeamId")
 
             result_list = final_result.get("resultList", [])
             for result in result_list:
                 if result.get("scope") == "MatchScope_Match":
                     winning_team = result.get("winningTeamId")
-                    if winning_team == self.current_match.player_seat_id:
-                        self.current_match.result = "win"
+                    if winning_team == match.player_seat_id:
+                        match.result = "win"
                     elif winning_team:
-                        self.current_match.result = "loss"
-                    self.current_match.winning_reason = result.get("reason")
+                        match.result = "loss"
+                    match.winning_reason = result.get("reason")
 
     def _process_gre_event(self, event: ParsedEvent):
         """Process greToClientEvent containing game state updates."""
@@ -354,8 +673,10 @@ class MTGALogParser:
 
     def _process_game_state_message(self, msg: Dict, timestamp: Optional[int]):
         """Process a game state message."""
-        if not self.current_match:
+        match = self.current_match
+        if not match:
             return
+        card_instances = match.card_instances
 
         game_state = msg.get("gameStateMessage", {})
         game_state_id = game_state.get("gameStateId", 0)
@@ -367,34 +688,25 @@ class MTGALogParser:
             self._last_turn_number = turn_number
         elif self._last_turn_number > 0:
             turn_number = self._last_turn_number
-        if turn_number > self.current_match.total_turns:
-            self.current_match.total_turns = turn_number
-
-        phase = turn_info.get("phase", "")
-        step = turn_info.get("step", "")
-        active_player = turn_info.get("activePlayer")
+        if turn_number > match.total_turns:
+            match.total_turns = turn_number
 
         # Extract game info (format, type)
         game_info = game_state.get("gameInfo", {})
         if game_info:
-            self.current_match.format = game_info.get("superFormat")
-            self.current_match.match_type = game_info.get("type")
+            match.format = game_info.get("superFormat")
+            match.match_type = game_info.get("type")
+
+        if self.detail_level == "match_only":
+            return
 
         # Extract player life totals (both player and opponent)
-        players = game_state.get("players", [])
-        for player in players:
-            seat = player.get("systemSeatNumber")
-            life = player.get("lifeTotal")
+        match.life_changes.extend(
+            _life_rows(game_state_id, turn_number, game_state.get("players", []))
+        )
 
-            if life is not None and seat is not None:
-                self.current_match.life_changes.append(
-                    {
-                        "game_state_id": game_state_id,
-                        "turn_number": turn_number,
-                        "seat_id": seat,
-                        "life_total": life,
-                    }
-                )
+        if self.detail_level == "life_only":
+            return
 
         # Extract game objects (cards)
         # Game state messages are often diffs — later updates may omit fields that
@@ -419,100 +731,91 @@ class MTGALogParser:
                     "source_grp_id": obj.get("objectSourceGrpId"),
                     "zone_id": obj.get("zoneId"),
                 }
-                existing = self.current_match.card_instances.get(instance_id)
+                existing = card_instances.get(instance_id)
                 if existing:
                     # Merge: keep existing non-empty values when the new update is sparse.
                     merged = dict(existing)
                     for key, val in incoming.items():
                         if val or not existing.get(key):
                             merged[key] = val
-                    self.current_match.card_instances[instance_id] = merged
+                    card_instances[instance_id] = merged
                 else:
-                    self.current_match.card_instances[instance_id] = incoming
-
-        # Extract actions
-        actions = game_state.get("actions", [])
-        for action in actions:
-            seat_id = action.get("seatId")
-            action_data = action.get("action", {})
-
-            if action_data:
-                action_type = action_data.get("actionType", "")
-                instance_id = action_data.get("instanceId")
-
-                # Get card info if we have it
-                card_info = self.current_match.card_instances.get(instance_id, {})
+                    card_instances[instance_id] = incoming
 
-                self.current_match.actions.append(
-                    {
-                        "game_state_id": game_state_id,
-                        "turn_number": turn_number,
-                        "phase": phase,
-                        "step": step,
-                        "active_player": active_player,
-                        "seat_id": seat_id,
-                        "action_type": action_type,
-                        "instance_id": instance_id,
-                        "card_grp_id": card_info.get("grp_id") or action_data.get("grpId"),
-                        "ability_grp_id": action_data.get("abilityGrpId"),
-                        "mana_cost": action_data.get("manaCost"),
-                        "timestamp": timestamp,
-                    }
-                )
+        # Extract actions, taking the card from instance data when we have it
+        phase = _intern(turn_info.get("phase", ""))
+        step = _intern(turn_info.get("step", ""))
+        active_player = turn_info.get("activePlayer")
+        match.actions.extend(
+            {
+                "game_state_id": game_state_id,
+                "turn_number": turn_number,
+                "phase": phase,
+                "step": step,
+                "active_player": active_player,
+                "seat_id": action.get("seatId"),
+                "action_type": _intern(action_data.get("actionType", "")),
+                "instance_id": action_data.get("instanceId"),
+                "card_grp_id": (
+                    card_instances.get(action_data.get("instanceId"), {}).get("grp_id")
+                    or action_data.get("grpId")
+                ),
+                "ability_grp_id": action_data.get("abilityGrpId"),
+                "mana_cost": action_data.get("manaCost"),
+                "timestamp": timestamp,
+            }
+            for action in game_state.get("actions", [])
+            if (action_data := action.get("action"))
+        )
 
         # Extract zone transfers from annotations
         annotations = game_state.get("annotations", [])
         for annotation in annotations:
             ann_type = annotation.get("type", [])
             if "AnnotationType_ZoneTransfer" in ann_type:
-                details = {d.get("key"): d for d in annotation.get("details", [])}
+                affected_ids = annotation.get("affectedIds")
+                if not affected_ids:
+                    continue
 
-                affected_ids = annotation.get("affectedIds", [])
-                for inst_id in affected_ids:
-                    card_info = self.current_match.card_instances.get(inst_id, {})
-
-                    zone_src = None
-                    zone_dest = None
-                    category = None
-
-                    if "zone_src" in details:
-                        zone_src = details["zone_src"].get("valueInt32", [None])[0]
-                    if "zone_dest" in details:
-                        zone_dest = details["zone_dest"].get("valueInt32", [None])[0]
-                    if "category" in details:
-                        category = details["category"].get("valueString", [None])[0]
-
-                    self.current_match.zone_transfers.append(
-                        {
-                            "game_state_id": game_state_id,
-                            "turn_number": turn_number,
-                            "instance_id": inst_id,
-                            "card_grp_id": card_info.get("grp_id"),
-                            "from_zone": zone_src,
-                            "to_zone": zone_dest,
-                            "category": category,
-                        }
-                    )
+                # The details are shared by every affected instance
+                details = {d.get("key"): d for d in annotation.get("details", [])}
+                zone_src = zone_dest = category = None
+                if (detail := details.get("zone_src")) is not None:
+                    zone_src = detail.get("valueInt32", [None])[0]
+                if (detail := details.get("zone_dest")) is not None:
+                    zone_dest = detail.get("valueInt32", [None])[0]
+                if (detail := details.get("category")) is not None:
+                    category = _intern(detail.get("valueString", [None])[0])
+
+                match.zone_transfers.extend(
+                    {
+                        "game_state_id": game_state_id,
+                        "turn_number": turn_number,
+                        "instance_id": inst_id,
+                        "card_grp_id": card_instances.get(inst_id, {}).get("grp_id"),
+                        "from_zone": zone_src,
+                        "to_zone": zone_dest,
+                        "category": category,
+                    }
+                    for inst_id in affected_ids
+                )
 
             elif "AnnotationType_TokenCreated" in ann_type:
                 # Tokens don't have a ZoneTransfer annotation when created — emit a
                 # synthetic zone_transfer so the replay can show the creation event.
-                for inst_id in annotation.get("affectedIds", []):
-                    card_info = self.current_match.card_instances.get(inst_id, {})
-                    grp_id = card_info.get("grp_id")
-                    if not grp_id:
-                        continue
-                    self.current_match.zone_transfers.append(
-                        {
-                            "game_state_id": game_state_id,
-                            "turn_number": turn_number,
-                            "instance_id": inst_id,
-                            "card_grp_id": grp_id,
-                            "from_zone": None,
-                            "to_zone": card_info.get("zone_id"),
-                            "category": "TokenCreated",
-                        }
-                    )
+                match.zone_transfers.extend(
+                    {
+                        "game_state_id": game_state_id,
+                        "turn_number": turn_number,
+                        "instance_id": inst_id,
+                        "card_grp_id": card_info["grp_id"],
+                        "from_zone": None,
+                        "to_zone": card_info.get("zone_id"),
+                        "category": "TokenCreated",
+                    }
+                    for inst_id in annotation.get("affectedIds", [])
+                    if (card_info := card_instances.get(inst_id, {})).get("grp_id")
+                )
 
     def _process_deck_event(self, event: ParsedEvent):
         """Process deck-related events."""
@@ -549,15 +852,16 @@ class MTGALogParser:
             self.current_match.deck_sideboard = side_deck
 
 
-def parse_log_file(log_path: str) -> List[MatchData]:
+def parse_log_file(log_path: str, detail_level: str = "full") -> List[MatchData]:
     """
     Convenience function to parse a log file.
 
     Args:
         log_path: Path to the Player.log file
+        detail_level: How much game state to extract (see MTGALogParser.DETAIL_LEVELS)
 
     Returns:
         List of MatchData objects
     """
-    parser = MTGALogParser(log_path)
+    parser = MTGALogParser(log_path, detail_level=detail_level)
     return parser.parse_matches()
@@ -6,10 +6,16 @@ Coordinates log parsing, card lookup, and database storage.
 
 import json
 import logging
-from typing import Dict, Optional, Set, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from ..db.database import DatabaseManager, get_db, init_db
-from ..parser.log_parser import MatchData, parse_log_file
+from ..parser.log_parser import MatchData, MTGALogParser, parse_log_file
 from .scryfall import ScryfallBulkService, get_scryfall
 
 logger = logging.getLogger(__name__)
@@ -32,6 +38,127 @@ _TOKEN_OBJECT_TYPES = frozenset(
     }
 )
 
+# Action types worth storing; the rest (passes, mana payments, ...) are dropped.
+_SIGNIFICANT_ACTION_TYPES = frozenset(
+    {
+        "ActionType_Cast",
+        "ActionType_Play",
+        "ActionType_Attack",
+        "ActionType_Block",
+        "ActionType_Activate",
+        "ActionType_Activate_Mana",
+        "ActionType_Resolution",
+    }
+)
+
+# Once an import has written this many matches, and at least as many as the
+# database held before it, the per-event tables' secondary indexes are dropped
+# and rebuilt at the end, rather than updated row by row. Rebuilding covers
+# every stored row, so small imports into a large history never defer.
+_DEFER_INDEXES_AFTER = 20
+_PER_EVENT_TABLES = ("game_actions", "life_changes", "zone_transfers")
+
+# Statements run for every imported match, kept at module level so each one
+# is a single shared string object hitting the connection's statement cache.
+
+_SQL_MATCH_EXISTS = "SELECT 1 FROM matches WHERE match_id = ?"
+_SQL_SELECT_DECK_ID = "SELECT id FROM decks WHERE deck_id = ?"
+_SQL_EXISTING_CARDS = (
+    "SELECT grp_id, name FROM cards WHERE grp_id IN (SELECT value FROM json_each(?))"
+)
+
+_SQL_INSERT_MATCH = """
+INSERT INTO matches (
+    match_id, game_number,
+    player_seat_id, player_name, player_user_id,
+    opponent_seat_id, opponent_name, opponent_user_id,
+    deck_id, event_id, format, match_type,
+    result, winning_team_id, winning_reason,
+    start_time, end_time, duration_seconds, total_turns
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_DECK = """
+INSERT INTO decks (deck_id, name, format)
+VALUES (?, ?, ?)
+"""
+
+_SQL_INSERT_DECK_CARD = """
+INSERT OR IGNORE INTO deck_cards (deck_id, card_grp_id, quantity, is_sideboard)
+VALUES (?, ?, ?, ?)
+"""
+
+# Every new cards row (Scryfall card, placeholder, token or special object)
+# goes through this one statement; columns a row has no data for are NULL.
+_SQL_UPSERT_CARD = """
+INSERT INTO cards (
+    grp_id, name, mana_cost, cmc, type_line,
+    colors, color_identity, set_code, rarity,
+    oracle_text, power, toughness, scryfall_id, image_uri,
+    is_token, object_type, source_grp_id
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (grp_id) DO UPDATE SET
+    name = excluded.name, mana_cost = excluded.mana_cost,
+    cmc = excluded.cmc, type_line = excluded.type_line,
+    colors = excluded.colors, color_identity = excluded.color_identity,
+    set_code = excluded.set_code, rarity = excluded.rarity,
+    oracle_text = excluded.oracle_text, power = excluded.power,
+    toughness = excluded.toughness, scryfall_id = excluded.scryfall_id,
+    image_uri = excluded.image_uri, is_token = excluded.is_token,
+    object_type = excluded.object_type, source_grp_id = excluded.source_grp_id
+"""
+
+_SQL_UPGRADE_UNKNOWN_CARD = """
+UPDATE cards
+SET name = ?, type_line = ?, colors = ?, power = ?, toughness = ?, mana_cost = ?
+WHERE grp_id = ? AND name = ?
+"""
+
+_SQL_INSERT_ACTION = """
+INSERT OR IGNORE INTO game_actions (
+    match_id, game_state_id, turn_number, phase, step,
+    active_player_seat, seat_id, action_type,
+    instance_id, card_grp_id, ability_grp_id, mana_cost, timestamp_ms
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_LIFE_CHANGE = """
+INSERT INTO life_changes (
+    match_id, game_state_id, turn_number, seat_id, life_total, change_amount
+) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_INSERT_ZONE_TRANSFER = """
+INSERT OR IGNORE INTO zone_transfers (
+    match_id, game_state_id, turn_number,
+    instance_id, card_grp_id, from_zone, to_zone, category
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Parser-built action and zone transfer dicts always carry every key, so the
+# row fields are pulled out with one C-level call each in column order.
+_ACTION_ROW_FIELDS = itemgetter(
+    "game_state_id",
+    "turn_number",
+    "phase",
+    "step",
+    "active_player",
+    "seat_id",
+    "action_type",
+    "instance_id",
+    "card_grp_id",
+    "ability_grp_id",
+)
+_ZONE_TRANSFER_ROW_FIELDS = itemgetter(
+    "game_state_id",
+    "turn_number",
+    "instance_id",
+    "card_grp_id",
+    "from_zone",
+    "to_zone",
+    "category",
+)
+
 _COLOR_LABELS: Dict[str, str] = {
     "CardColor_White": "White",
     "CardColor_Blue": "Blue",
@@ -59,6 +186,18 @@ _MANA_COLOR_SYMBOLS: Dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=128)
+def _json_list(values: tuple) -> str:
+    return json.dumps(list(values))
+
+
+def _colors_json(colors) -> str:
+    """JSON for a colour list; the few distinct combinations are serialised once."""
+    if not isinstance(colors, list):
+        return json.dumps(colors)
+    return _json_list(tuple(colors))
+
+
 def format_mana_cost(mana_cost: list) -> str:
     """Convert Arena mana cost JSON to standard MTG notation like {2}{U}{R}."""
     parts = []
@@ -132,6 +271,36 @@ def generate_unknown_card_description(
     return f"{' '.join(parts)} [{grp_id}]"
 
 
+def _scryfall_card_row(grp_id: int, card_data: dict, object_type: Optional[str] = None) -> tuple:
+    """Build a ``_SQL_UPSERT_CARD`` row from a Scryfall lookup result."""
+    return (
+        grp_id,
+        card_data.get("name"),
+        card_data.get("mana_cost"),
+        card_data.get("cmc"),
+        card_data.get("type_line"),
+        _colors_json(card_data.get("colors", [])),
+        _colors_json(card_data.get("color_identity", [])),
+        card_data.get("set_code"),
+        card_data.get("rarity"),
+        card_data.get("oracle_text"),
+        card_data.get("power"),
+        card_data.get("toughness"),
+        card_data.get("scryfall_id"),
+        card_data.get("image_uri"),
+        0,
+        object_type,
+        None,
+    )
+
+
+def _special_object_row(
+    grp_id: int, name: str, is_token: int, object_type: str, source_grp_id: Optional[int]
+) -> tuple:
+    """Build a ``_SQL_UPSERT_CARD`` row for a token or a placeholder game object."""
+    return (grp_id, name, *(None,) * 12, is_token, object_type, source_grp_id)
+
+
 def generate_token_name(inst_data: dict) -> str:
     """Build a human-readable name for a token from its game-state data.
 
@@ -144,22 +313,22 @@ def generate_token_name(inst_data: dict) -> str:
         return "Emblem"
 
     parts = []
+    append = parts.append
     power = inst_data.get("power")
     toughness = inst_data.get("toughness")
     if power is not None and toughness is not None:
-        parts.append(f"{power}/{toughness}")
-
-    colors = [_COLOR_LABELS.get(c, c) for c in (inst_data.get("colors") or [])]
-    parts.extend(colors)
-
-    subtypes = [s.replace("SubType_", "") for s in (inst_data.get("subtypes") or [])]
-    card_types = [
-        _CARD_TYPE_LABELS.get(t, t.replace("CardType_", ""))
-        for t in (inst_data.get("card_types") or [])
-    ]
-    parts.extend(subtypes)
-    parts.extend(card_types)
-    parts.append("Token")
+        append(f"{power}/{toughness}")
+
+    for color in inst_data.get("colors") or ():
+        append(_COLOR_LABELS.get(color, color))
+    for subtype in inst_data.get("subtypes") or ():
+        append(subtype[8:] if subtype.startswith("SubType_") else subtype)
+    for card_type in inst_data.get("card_types") or ():
+        label = _CARD_TYPE_LABELS.get(card_type)
+        if label is None:
+            label = card_type[9:] if card_type.startswith("CardType_") else card_type
+        append(label)
+    append("Token")
     return " ".join(parts)
 
 
@@ -180,17 +349,19 @@ class DataImportService:
         """
         self.db = db or get_db()
         self.scryfall = scryfall or get_scryfall()
-        self._imported_matches: Set[str] = set()
-        self._load_existing_matches()
+        # grpIds whose card rows are final, for the duration of one import
+        self._known_card_ids: Set[int] = set()
+        # grpIds settled by the match being imported; known once it commits
+        self._settled_card_ids: Set[int] = set()
 
-    def _load_existing_matches(self):
-        """Load IDs of already imported matches."""
-        try:
-            cursor = self.db.execute("SELECT match_id FROM matches")
-            self._imported_matches = {row["match_id"] for row in cursor.fetchall()}
-            logger.info(f"Found {len(self._imported_matches)} existing matches")
-        except Exception as e:
-            logger.warning(f"Failed to load existing matches: {e}")
+    def _match_exists(self, match_id: str) -> bool:
+        """Check whether a match has already been imported.
+
+        One lookup on the unique match_id index per parsed match, rather than
+        holding every imported match ID in memory.
+        """
+        cursor = self.db.execute(_SQL_MATCH_EXISTS, (match_id,))
+        return cursor.fetchone() is not None
 
     def import_log_file(self, log_path: str, skip_existing: bool = True) -> int:
         """
@@ -204,26 +375,115 @@ class DataImportService:
             Number of matches imported
         """
         logger.info(f"Parsing log file: {log_path}")
-        matches = parse_log_file(log_path)
-        logger.info(f"Found {len(matches)} matches in log file")
+        # Constructed here so a missing or invalid file raises immediately.
+        parser = MTGALogParser(log_path)
 
-        imported_count = 0
-        for match in matches:
-            if skip_existing and match.match_id in self._imported_matches:
-                logger.debug(f"Skipping existing match: {match.match_id}")
-                continue
+        # iter_matches reads the log on its own worker thread; this thread, which
+        # owns the database connection, stores each match as soon as it is complete.
+        with closing(parser.iter_matches()) as matches:
+            return self._store_matches(matches, skip_existing)
+
+    def import_log_files(self, log_paths: List[str], skip_existing: bool = True) -> int:
+        """
+        Import all matches from several log files (e.g. Player.log and Player-prev.log).
 
-            try:
-                self._import_match(match)
-                self._imported_matches.add(match.match_id)
-                imported_count += 1
-            except Exception as e:
-                logger.error(f"Failed to import match {match.match_id}: {e}")
+        The logs are parsed in parallel worker processes; their matches are
+        stored in log order by this process in a single transaction.
 
-        self.db.commit()
+        Args:
+            log_paths: Paths to the log files
+            skip_existing: Whether to skip already imported matches
+
+        Returns:
+            Number of matches imported
+        """
+        if len(log_paths) == 1:
+            return self.import_log_file(log_paths[0], skip_existing)
+
+        logger.info(f"Parsing {len(log_paths)} log files")
+        workers = min(len(log_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = pool.map(parse_log_file, log_paths)
+            return self._store_matches(chain.from_iterable(parsed), skip_existing)
+
+    def _store_matches(self, matches: Iterable[MatchData], skip_existing: bool) -> int:
+        """Store parsed matches, returning how many were imported."""
+        found_count = 0
+        imported_count = 0
+        deferred_indexes = None
+        prior_match_count = None
+        self._known_card_ids = set()
+
+        try:
+            # The whole import is one write transaction (one sync on commit);
+            # each match gets a savepoint so a bad match is undone on its own.
+            with self.db.batch():
+                for match in matches:
+                    found_count += 1
+
+                    if skip_existing and self._match_exists(match.match_id):
+                        logger.debug(f"Skipping existing match: {match.match_id}")
+                        continue
+
+                    if deferred_indexes is None and imported_count >= _DEFER_INDEXES_AFTER:
+                        if prior_match_count is None:
+                            prior_match_count = self._match_count() - imported_count
+                        if imported_count >= prior_match_count:
+                            deferred_indexes = self._drop_secondary_indexes()
+
+                    self._settled_card_ids = set()
+                    try:
+                        with self.db.savepoint("import_match"):
+                            self._import_match(match)
+                        imported_count += 1
+                        self._known_card_ids |= self._settled_card_ids
+                    except Exception as e:
+                        logger.error(f"Failed to import match {match.match_id}: {e}")
+
+                # Part of the same transaction: a failed import restores them
+                # by rolling back the drop instead.
+                if deferred_indexes:
+                    self._recreate_indexes(deferred_indexes)
+        finally:
+            # Only trustworthy while the transaction that wrote the cards is alive
+            self._known_card_ids = set()
+
+        logger.info(f"Found {found_count} matches in log file")
         logger.info(f"Imported {imported_count} new matches")
         return imported_count
 
+    def _match_count(self) -> int:
+        """Return the number of stored matches, from the trigger-maintained summary."""
+        return self.db.execute("SELECT total FROM match_summary WHERE id = 1").fetchone()[0]
+
+    def _drop_secondary_indexes(self) -> list:
+        """Drop the non-unique indexes on the per-event tables.
+
+        Returns:
+            (name, sql) pairs for ``_recreate_indexes``
+        """
+        placeholders = ",".join("?" * len(_PER_EVENT_TABLES))
+        indexes = [
+            (row["name"], row["sql"])
+            for row in self.db.execute(
+                f"""
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'index' AND tbl_name IN ({placeholders})
+                  AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'
+            """,
+                _PER_EVENT_TABLES,
+            )
+        ]
+        for name, _ in indexes:
+            self.db.execute(f'DROP INDEX "{name}"')
+        logger.debug(f"Deferred {len(indexes)} indexes until the end of the import")
+        return indexes
+
+    def _recreate_indexes(self, indexes: list):
+        """Rebuild indexes dropped by ``_drop_secondary_indexes``."""
+        for _, sql in indexes:
+            self.db.execute(sql)
+
     def _import_match(self, match: MatchData):
         """Import a single match into the database."""
         # First, ensure deck exists
@@ -243,16 +503,7 @@ class DataImportService:
 
         # Insert match record
         cursor = self.db.execute(
-            """
-            INSERT INTO matches (
-                match_id, game_number,
-                player_seat_id, player_name, player_user_id,
-                opponent_seat_id, opponent_name, opponent_user_id,
-                deck_id, event_id, format, match_type,
-                result, winning_team_id, winning_reason,
-                start_time, end_time, duration_seconds, total_turns
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+            _SQL_INSERT_MATCH,
             (
                 match.match_id,
                 1,
@@ -295,34 +546,28 @@ class DataImportService:
             return None
 
         # Check if deck already exists
-        cursor = self.db.execute("SELECT id FROM decks WHERE deck_id = ?", (match.deck_id,))
+        cursor = self.db.execute(_SQL_SELECT_DECK_ID, (match.deck_id,))
         row = cursor.fetchone()
         if row:
             return row["id"]
 
         # Insert new deck
         cursor = self.db.execute(
-            """
-            INSERT INTO decks (deck_id, name, format)
-            VALUES (?, ?, ?)
-        """,
+            _SQL_INSERT_DECK,
             (match.deck_id, match.deck_name, match.format),
         )
 
         deck_db_id = cursor.lastrowid
 
         # Insert deck cards
-        for card in match.deck_cards:
-            card_id = card.get("cardId")
-            quantity = card.get("quantity", 1)
-            if card_id:
-                self.db.execute(
-                    """
-                    INSERT OR IGNORE INTO deck_cards (deck_id, card_grp_id, quantity, is_sideboard)
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (deck_db_id, card_id, quantity, False),
-                )
+        self.db.executemany(
+            _SQL_INSERT_DECK_CARD,
+            [
+                (deck_db_id, card["cardId"], card.get("quantity", 1), False)
+                for card in match.deck_cards
+                if card.get("cardId")
+            ],
+        )
 
         return deck_db_id
 
@@ -338,48 +583,54 @@ class DataImportService:
         """
         real_cards: Dict[int, dict] = {}
         special_objects: Dict[int, dict] = {}
+        # Bound once; the instance loop below runs for every object in the match
+        real_get = real_cards.get
+        real_pop = real_cards.pop
+        real_setdefault = real_cards.setdefault
+        special_pop = special_objects.pop
+        special_setdefault = special_objects.setdefault
+        skip_types = _SKIP_OBJECT_TYPES
 
         # Deck cards are always real cards (no instance data available)
         for card in match.deck_cards:
-            if card.get("cardId"):
-                real_cards.setdefault(card["cardId"], {})
+            card_id = card.get("cardId")
+            if card_id:
+                real_setdefault(card_id, {})
 
         # Categorise each card instance by its Arena object type
         for inst_data in match.card_instances.values():
             grp_id = inst_data.get("grp_id")
-            obj_type = inst_data.get("type", "")
             if not grp_id:
                 continue
-            if obj_type in _SKIP_OBJECT_TYPES:
-                continue  # Engine-only objects — ignore entirely
+            obj_type = inst_data.get("type", "")
             if obj_type == "GameObjectType_Card":
                 # Confirmed real card; remove from special_objects if seen earlier.
                 # Prefer instance with the most data (first public sighting wins).
-                if grp_id not in real_cards or not real_cards[grp_id].get("card_types"):
+                known = real_get(grp_id)
+                if known is None or not known.get("card_types"):
                     real_cards[grp_id] = inst_data
-                special_objects.pop(grp_id, None)
+                special_pop(grp_id, None)
+            elif obj_type in skip_types:
+                continue  # Engine-only objects — ignore entirely
             elif obj_type == "GameObjectType_Omen":
                 # Omen back-face grpIds share their Arena ID with the front-face
                 # GameObjectType_Card (the spell being cast). Card is processed first,
                 # so we must override: back-face IDs are not in Scryfall.
-                real_cards.pop(grp_id, None)
+                real_pop(grp_id, None)
                 special_objects[grp_id] = inst_data
             elif grp_id not in real_cards:
                 # Token, emblem, adventure face, MDFC back, etc.
                 # First occurrence wins; real-card sighting takes priority above.
-                special_objects.setdefault(grp_id, inst_data)
+                special_setdefault(grp_id, inst_data)
 
-        # Actions may reference grpIds not captured as card instances
-        for action in match.actions:
-            cid = action.get("card_grp_id")
+        # Actions may reference grpIds not captured as card instances; many
+        # actions share a card, so each distinct grpId is checked once
+        for cid in dict.fromkeys(action.get("card_grp_id") for action in match.actions):
             if cid and cid not in special_objects:
-                real_cards.setdefault(cid, {})
+                real_setdefault(cid, {})
 
         return real_cards, special_objects
 
-    def _generate_token_name(self, inst_data: dict) -> str:
-        return generate_token_name(inst_data)
-
     def _collect_cast_mana_costs(self, match: MatchData) -> Dict[int, list]:
         """Collect mana costs paid for cast actions, keyed by card grpId.
 
@@ -414,13 +665,23 @@ class DataImportService:
         if cast_mana_costs is None:
             cast_mana_costs = {}
 
-        all_ids = set(real_cards) | set(special_objects)
+        # Cards already settled earlier in this import need no probe at all
+        known = self._known_card_ids
+        if known:
+            real_cards = {gid: d for gid, d in real_cards.items() if gid not in known}
+            special_objects = {gid: d for gid, d in special_objects.items() if gid not in known}
+
+        all_ids = real_cards.keys() | special_objects.keys()
         if not all_ids:
             return
 
-        placeholders = ",".join("?" * len(all_ids))
+        # The ids travel as one JSON array parameter, so the statement text is
+        # the same for every match (and is prepared once) however many cards
+        # it references, and never runs into SQLite's bound-variable limit.
+        # grpIds are ints, so the array is joined straight from the set.
         cursor = self.db.execute(
-            f"SELECT grp_id, name FROM cards WHERE grp_id IN ({placeholders})", tuple(all_ids)
+            _SQL_EXISTING_CARDS,
+            (f"[{','.join(map(str, all_ids))}]",),
         )
         rows = cursor.fetchall()
         existing_ids = {row["grp_id"] for row in rows}
@@ -429,6 +690,8 @@ class DataImportService:
         unknown_placeholder_ids = {
             row["grp_id"] for row in rows if row["name"].startswith("Unknown Card (")
         }
+        # Ids that will still be bare "Unknown Card (N)" rows after this call
+        bare_placeholder_ids = set(unknown_placeholder_ids)
 
         missing_real = {gid: real_cards[gid] for gid in (set(real_cards) - existing_ids)}
         missing_special = {gid: d for gid, d in special_objects.items() if gid not in existing_ids}
@@ -443,56 +706,23 @@ class DataImportService:
                 f"processing {len(missing_special)} special objects..."
             )
 
-        # ── Real cards: look up Scryfall, fall back to descriptive placeholder ──
-        for grp_id, inst_data in missing_real.items():
-            card_data = self.scryfall.get_card_by_arena_id(grp_id)
-            if card_data:
-                self.db.execute(
-                    """
-                    INSERT OR REPLACE INTO cards (
-                        grp_id, name, mana_cost, cmc, type_line,
-                        colors, color_identity, set_code, rarity,
-                        oracle_text, power, toughness, scryfall_id, image_uri
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        grp_id,
-                        card_data.get("name"),
-                        card_data.get("mana_cost"),
-                        card_data.get("cmc"),
-                        card_data.get("type_line"),
-                        json.dumps(card_data.get("colors", [])),
-                        json.dumps(card_data.get("color_identity", [])),
-                        card_data.get("set_code"),
-                        card_data.get("rarity"),
-                        card_data.get("oracle_text"),
-                        card_data.get("power"),
-                        card_data.get("toughness"),
-                        card_data.get("scryfall_id"),
-                        card_data.get("image_uri"),
-                    ),
-                )
-            else:
-                logger.debug(f"Card grp_id={grp_id} not found in Scryfall, building placeholder")
-                mana_cost_json = cast_mana_costs.get(grp_id)
-                name = generate_unknown_card_description(grp_id, inst_data, mana_cost_json)
-                type_line = build_type_line(inst_data) or None
-                colors = inst_data.get("colors") or []
-                color_json = json.dumps([_COLOR_LABELS.get(c, c) for c in colors] if colors else [])
-                power = inst_data.get("power")
-                toughness = inst_data.get("toughness")
-                mana_cost_str = format_mana_cost(mana_cost_json) if mana_cost_json else None
-                self.db.execute(
-                    """
-                    INSERT OR IGNORE INTO cards (
-                        grp_id, name, type_line, colors, power, toughness, mana_cost
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (grp_id, name, type_line, color_json, power, toughness, mana_cost_str),
-                )
+        # One batch lookup covers real cards, special objects and Omen front faces
+        omen_ids = [
+            gid for gid, d in missing_special.items() if d.get("type") == "GameObjectType_Omen"
+        ]
+        lookup_ids = set(missing_real) | set(missing_special)
+        lookup_ids.update(gid - 1 for gid in omen_ids)
+        card_lookup = self.scryfall.lookup_cards_batch(lookup_ids) if lookup_ids else {}
+
+        # Omen back-face names come from their front face's "Front // Back" name
+        omen_back_names = {}
+        for gid in omen_ids:
+            front_name = (card_lookup.get(gid - 1) or {}).get("name") or ""
+            if " // " in front_name:
+                omen_back_names[gid] = front_name.split(" // ")[1]
 
-        # ── Special objects: tokens/emblems get generated names; others try Scryfall ──
         # ── Upgrade existing "Unknown Card" placeholders with better game-state data ──
+        upgrade_rows = []
         for grp_id, inst_data in upgradeable_real.items():
             mana_cost_json = cast_mana_costs.get(grp_id)
             name = generate_unknown_card_description(grp_id, inst_data, mana_cost_json)
@@ -501,17 +731,13 @@ class DataImportService:
                 continue
             type_line = build_type_line(inst_data) or None
             colors = inst_data.get("colors") or []
-            color_json = json.dumps([_COLOR_LABELS.get(c, c) for c in colors] if colors else [])
+            color_json = _colors_json([_COLOR_LABELS.get(c, c) for c in colors])
             power = inst_data.get("power")
             toughness = inst_data.get("toughness")
             mana_cost_str = format_mana_cost(mana_cost_json) if mana_cost_json else None
             logger.debug(f"Upgrading placeholder grp_id={grp_id} to '{name}'")
-            self.db.execute(
-                """
-                UPDATE cards
-                SET name = ?, type_line = ?, colors = ?, power = ?, toughness = ?, mana_cost = ?
-                WHERE grp_id = ? AND name = ?
-            """,
+            bare_placeholder_ids.discard(grp_id)
+            upgrade_rows.append(
                 (
                     name,
                     type_line,
@@ -521,147 +747,116 @@ class DataImportService:
                     mana_cost_str,
                     grp_id,
                     f"Unknown Card ({grp_id})",
-                ),
+                )
+            )
+
+        if upgrade_rows:
+            self.db.executemany(_SQL_UPGRADE_UNKNOWN_CARD, upgrade_rows)
+
+        # ── New cards: real cards and special objects share one upsert ──
+        card_rows = []
+        append = card_rows.append
+        for grp_id, inst_data in missing_real.items():
+            card_data = card_lookup.get(grp_id)
+            if card_data:
+                append(_scryfall_card_row(grp_id, card_data))
+                continue
+
+            # Not in Scryfall: descriptive placeholder from game-state data
+            logger.debug(f"Card grp_id={grp_id} not found in Scryfall, building placeholder")
+            mana_cost_json = cast_mana_costs.get(grp_id)
+            name = generate_unknown_card_description(grp_id, inst_data, mana_cost_json)
+            colors = inst_data.get("colors") or []
+            if name == f"Unknown Card ({grp_id})":
+                bare_placeholder_ids.add(grp_id)
+            append(
+                (
+                    grp_id,
+                    name,
+                    format_mana_cost(mana_cost_json) if mana_cost_json else None,
+                    None,
+                    build_type_line(inst_data) or None,
+                    _colors_json([_COLOR_LABELS.get(c, c) for c in colors]),
+                    None,
+                    None,
+                    None,
+                    None,
+                    inst_data.get("power"),
+                    inst_data.get("toughness"),
+                    None,
+                    None,
+                    0,
+                    None,
+                    None,
+                )
             )
 
-        # ── Special objects: tokens/emblems get generated names; others try Scryfall ──
         for grp_id, inst_data in missing_special.items():
             obj_type = inst_data.get("type", "")
             source_grp_id = inst_data.get("source_grp_id")
 
+            # Tokens/emblems get a name generated from game-state data
             if obj_type in _TOKEN_OBJECT_TYPES:
-                name = self._generate_token_name(inst_data)
+                name = generate_token_name(inst_data)
                 logger.debug(f"Inserting token grp_id={grp_id} as '{name}'")
-                self.db.execute(
-                    """
-                    INSERT OR IGNORE INTO cards (
-                        grp_id, name, is_token, object_type, source_grp_id
-                    ) VALUES (?, ?, 1, ?, ?)
-                """,
-                    (grp_id, name, obj_type, source_grp_id),
-                )
+                append(_special_object_row(grp_id, name, 1, obj_type, source_grp_id))
+                continue
+
+            # Adventure face, MDFC back, Room half, Omen, etc.
+            # Try Scryfall first (some face types have Arena IDs in bulk data).
+            card_data = card_lookup.get(grp_id)
+            if card_data:
+                append(_scryfall_card_row(grp_id, card_data, obj_type))
+                continue
+
+            # Friendly placeholder showing the object type.
+            # For Omen back faces, try the front face (grpId - 1) for the real name.
+            name = omen_back_names.get(grp_id)
+            effective_source = source_grp_id
+            if name is not None:
+                effective_source = grp_id - 1
             else:
-                # Adventure face, MDFC back, Room half, Omen, etc.
-                # Try Scryfall first (some face types have Arena IDs in bulk data).
-                card_data = self.scryfall.get_card_by_arena_id(grp_id)
-                if card_data:
-                    self.db.execute(
-                        """
-                        INSERT OR REPLACE INTO cards (
-                            grp_id, name, mana_cost, cmc, type_line,
-                            colors, color_identity, set_code, rarity,
-                            oracle_text, power, toughness, scryfall_id, image_uri,
-                            object_type
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            grp_id,
-                            card_data.get("name"),
-                            card_data.get("mana_cost"),
-                            card_data.get("cmc"),
-                            card_data.get("type_line"),
-                            json.dumps(card_data.get("colors", [])),
-                            json.dumps(card_data.get("color_identity", [])),
-                            card_data.get("set_code"),
-                            card_data.get("rarity"),
-                            card_data.get("oracle_text"),
-                            card_data.get("power"),
-                            card_data.get("toughness"),
-                            card_data.get("scryfall_id"),
-                            card_data.get("image_uri"),
-                            obj_type,
-                        ),
-                    )
-                else:
-                    # Friendly placeholder showing the object type.
-                    # For Omen back faces, try the front face (grpId - 1) for the real name.
-                    name = None
-                    effective_source = source_grp_id
-                    if obj_type == "GameObjectType_Omen":
-                        front_data = self.scryfall.get_card_by_arena_id(grp_id - 1)
-                        if front_data and " // " in (front_data.get("name") or ""):
-                            name = front_data["name"].split(" // ")[1]
-                            effective_source = grp_id - 1
-                    if name is None:
-                        label = obj_type.replace("GameObjectType_", "") if obj_type else "Unknown"
-                        name = f"[{label}] ({grp_id})"
-                    logger.debug(f"Inserting special object grp_id={grp_id} as '{name}'")
-                    self.db.execute(
-                        """
-                        INSERT OR IGNORE INTO cards (
-                            grp_id, name, object_type, source_grp_id
-                        ) VALUES (?, ?, ?, ?)
-                    """,
-                        (grp_id, name, obj_type, effective_source),
-                    )
+                label = obj_type.replace("GameObjectType_", "") if obj_type else "Unknown"
+                name = f"[{label}] ({grp_id})"
+            logger.debug(f"Inserting special object grp_id={grp_id} as '{name}'")
+            append(_special_object_row(grp_id, name, 0, obj_type, effective_source))
+
+        if card_rows:
+            self.db.executemany(_SQL_UPSERT_CARD, card_rows)
+
+        # Bare placeholders stay out: a later match may have data to upgrade them
+        self._settled_card_ids.update(all_ids - bare_placeholder_ids)
 
     def _import_actions(self, match_db_id: int, match: MatchData):
         """Import game actions for a match."""
-        # Filter to significant actions only
-        significant_types = {
-            "ActionType_Cast",
-            "ActionType_Play",
-            "ActionType_Attack",
-            "ActionType_Block",
-            "ActionType_Activate",
-            "ActionType_Activate_Mana",
-            "ActionType_Resolution",
-        }
-
-        # Deduplicate actions by (game_state_id, action_type, instance_id)
-        seen = set()
+        # Repeats of (game_state_id, action_type, instance_id) are dropped by
+        # the ux_game_actions_event unique index; the first occurrence wins.
+        rows = []
+        append = rows.append
+        significant = _SIGNIFICANT_ACTION_TYPES
         for action in match.actions:
-            key = (
-                action.get("game_state_id"),
-                action.get("action_type"),
-                action.get("instance_id"),
-            )
-
-            action_type = action.get("action_type", "")
-            if key in seen or action_type not in significant_types:
+            # Filter to significant actions only
+            if action["action_type"] not in significant:
                 continue
-            seen.add(key)
-
-            mana_cost_json = None
-            if action.get("mana_cost"):
-                mana_cost_json = json.dumps(action["mana_cost"])
-
-            self.db.execute(
-                """
-                INSERT INTO game_actions (
-                    match_id, game_state_id, turn_number, phase, step,
-                    active_player_seat, seat_id, action_type,
-                    instance_id, card_grp_id, ability_grp_id, mana_cost, timestamp_ms
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+
+            mana_cost = action["mana_cost"]
+            append(
                 (
                     match_db_id,
-                    action.get("game_state_id"),
-                    action.get("turn_number"),
-                    action.get("phase"),
-                    action.get("step"),
-                    action.get("active_player"),
-                    action.get("seat_id"),
-                    action.get("action_type"),
-                    action.get("instance_id"),
-                    action.get("card_grp_id"),
-                    action.get("ability_grp_id"),
-                    mana_cost_json,
-                    action.get("timestamp"),
-                ),
+                    *_ACTION_ROW_FIELDS(action),
+                    json.dumps(mana_cost) if mana_cost else None,
+                    action["timestamp"],
+                )
             )
 
+        self.db.executemany(_SQL_INSERT_ACTION, rows)
+
     def _import_life_changes(self, match_db_id: int, match: MatchData):
         """Import life total changes for a match."""
         prev_life = {}
+        rows = []
 
-        for lc in match.life_changes:
-            seat_id = lc.get("seat_id")
-            life_total = lc.get("life_total")
-
-            if seat_id is None or life_total is None:
-                continue
-
+        for game_state_id, turn_number, seat_id, life_total in match.life_changes.rows():
             # Calculate change
             change = None
             if seat_id in prev_life:
@@ -672,52 +867,17 @@ class DataImportService:
 
             prev_life[seat_id] = life_total
 
-            self.db.execute(
-                """
-                INSERT INTO life_changes (
-                    match_id, game_state_id, turn_number, seat_id, life_total, change_amount
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    match_db_id,
-                    lc.get("game_state_id"),
-                    lc.get("turn_number"),
-                    seat_id,
-                    life_total,
-                    change,
-                ),
-            )
+            rows.append((match_db_id, game_state_id, turn_number, seat_id, life_total, change))
+
+        self.db.executemany(_SQL_INSERT_LIFE_CHANGE, rows)
 
     def _import_zone_transfers(self, match_db_id: int, match: MatchData):
         """Import zone transfers for a match."""
-        # Deduplicate by (game_state_id, instance_id, category)
-        seen = set()
+        # Repeats of (game_state_id, instance_id, category) are dropped by the
+        # ux_zone_transfers_event unique index; the first occurrence wins.
+        rows = [(match_db_id, *_ZONE_TRANSFER_ROW_FIELDS(zt)) for zt in match.zone_transfers]
 
-        for zt in match.zone_transfers:
-            key = (zt.get("game_state_id"), zt.get("instance_id"), zt.get("category"))
-
-            if key in seen:
-                continue
-            seen.add(key)
-
-            self.db.execute(
-                """
-                INSERT INTO zone_transfers (
-                    match_id, game_state_id, turn_number,
-                    instance_id, card_grp_id, from_zone, to_zone, category
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    match_db_id,
-                    zt.get("game_state_id"),
-                    zt.get("turn_number"),
-                    zt.get("instance_id"),
-                    zt.get("card_grp_id"),
-                    zt.get("from_zone"),
-                    zt.get("to_zone"),
-                    zt.get("category"),
-                ),
-            )
+        self.db.executemany(_SQL_INSERT_ZONE_TRANSFER, rows)
 
 
 def import_log(log_path: str, db_path: Optional[str] = None) -> int:
@@ -728,9 +888,23 @@ def import_log(log_path: str, db_path: Optional[str] = None) -> int:
         log_path: Path to Player.log file
         db_path: Optional path to database file
 
+    Returns:
+        Number of matches imported
+    """
+    return import_logs([log_path], db_path)
+
+
+def import_logs(log_paths: List[str], db_path: Optional[str] = None) -> int:
+    """
+    Convenience function to import several log files.
+
+    Args:
+        log_paths: Paths to Player.log files
+        db_path: Optional path to database file
+
     Returns:
         Number of matches imported
     """
     db = init_db(db_path)
     service = DataImportService(db)
-    return service.import_log_file(log_path)
+    return service.import_log_files(log_paths)
@@ -8,15 +8,207 @@ Token card data is fetched on-demand via Scrython with built-in rate limiting.
 
 import json
 import logging
+import mmap
+import os
+import pickle
+import sys
+import threading
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import requests
 import scrython
 from scrython.base import ScryfallError
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+    # orjson parses any buffer, so files can be mapped instead of read
+    _JSON_PARSES_BUFFERS = True
+except ImportError:  # orjson is an optional speedup (pip install mtgas[speedups])
+    _json_loads = json.loads
+    _JSON_PARSES_BUFFERS = False
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+try:
+    import ijson
+except ImportError:  # only needed for low-memory index builds (pip install mtgas[lowmem])
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
+# The derived index is a private cache only this module reads, so it is
+# pickled: int keys survive as-is and loading skips all text parsing.
+INDEX_PICKLE_PROTOCOL = 5
+
+# Set to stream the bulk file card by card instead of loading it whole.
+# Slower overall, but peak memory stays at one card rather than ~350MB of
+# parsed JSON; meant for small containers.
+STREAM_BULK_DATA_ENV = "MTGAS_STREAM_BULK_DATA"
+
+
+# Bytes per read while downloading the bulk file, and between progress lines
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+DOWNLOAD_LOG_INTERVAL = 10 << 20
+
+# Concurrent connections used when downloading a batch of card images
+IMAGE_DOWNLOAD_WORKERS = 16
+
+
+def _iter_arena_cards(stream) -> Iterator[Dict[str, Any]]:
+    """Yield only the cards with an Arena ID from a streamed bulk JSON array.
+
+    Most bulk cards have no Arena ID; each is dropped as soon as it is
+    parsed, so at most one of them is alive at a time.
+    """
+    # use_float keeps cmc a float instead of ijson's default Decimal
+    for card in ijson.items(stream, "item", use_float=True):
+        if card.get("arena_id"):
+            yield card
+
+
+def _drop_cached_pages(f):
+    """Tell the kernel an open file will not be read again, freeing its page cache.
+
+    A no-op where ``os.posix_fadvise`` is unavailable (Windows, macOS).
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass  # Only a hint; the file was read successfully either way
+
+
+def _iter_streamed_cards(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as f:
+        yield from _iter_arena_cards(f)
+        _drop_cached_pages(f)
+
+
+def _read_bulk_cards(path: Path) -> Iterable[Dict[str, Any]]:
+    """Return the card dicts from a Scryfall bulk data file.
+
+    A list when the file is loaded whole, an iterator when it is streamed.
+    The file is only read once, so its pages are dropped from the page cache
+    once it has been parsed.
+    """
+    if os.environ.get(STREAM_BULK_DATA_ENV) and ijson is not None:
+        return _iter_streamed_cards(path)
+    with open(path, "rb") as f:
+        if _JSON_PARSES_BUFFERS and os.fstat(f.fileno()).st_size:
+            # Parse the page-cache mapping in place rather than a ~350MB copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    cards = _json_loads(view)
+        else:
+            cards = _json_loads(f.read())
+        _drop_cached_pages(f)
+    return cards
+
+
+# Decoded cards kept by _decode_card; a large import touches a few thousand
+CARD_CACHE_SIZE = 2048
+
+# Fields drawn from a small shared vocabulary (a few hundred sets, five rarities)
+_INTERNED_FIELDS = ("set_code", "rarity")
+
+
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+def _decode_card(record: bytes) -> Dict[str, Any]:
+    card = _json_loads(record)
+    # Cached cards share one string per set and rarity instead of a copy each
+    for field in _INTERNED_FIELDS:
+        value = card.get(field)
+        if value:
+            card[field] = sys.intern(value)
+    return card
+
+
+# Arena IDs below this are looked up in a flat table indexed by the ID itself
+# (4 bytes per slot); any larger ID falls back to a dict.
+_DENSE_ARENA_ID_LIMIT = 1 << 22
+
+
+class CardIndex(Mapping):
+    """Arena ID → simplified card data, decoded on first access.
+
+    The index holds every Arena card (~30k) but a process usually looks up
+    only a handful, so each card is kept as its encoded JSON record and only
+    decoded when asked for. Decoded cards are cached and shared between
+    callers; treat them as read-only.
+
+    Arena IDs are small, dense integers, so records are found through a flat
+    ``array`` of row numbers indexed by the ID rather than a dict.
+    """
+
+    __slots__ = ("_rows", "_sparse_rows", "_ids", "_records")
+
+    def __init__(self, cards: Iterable[Tuple[int, Dict[str, Any]]] = ()):
+        self._rows = array("i")  # Arena ID -> row in _records, -1 when absent
+        self._sparse_rows: Dict[int, int] = {}  # rows of IDs past the table
+        self._ids = array("q")  # Arena ID of each row, in insertion order
+        self._records: List[bytes] = []
+        for arena_id, card in cards:
+            self.add(arena_id, card)
+
+    def add(self, arena_id: int, card: Dict[str, Any]):
+        """Store ``card`` under ``arena_id``, replacing any earlier entry."""
+        self._set(arena_id, _json_dumps(card))
+
+    def _row(self, arena_id: int) -> int:
+        rows = self._rows
+        if 0 <= arena_id < len(rows):
+            return rows[arena_id]
+        return self._sparse_rows.get(arena_id, -1)
+
+    def _set(self, arena_id: int, record: bytes):
+        row = self._row(arena_id)
+        if row >= 0:
+            self._records[row] = record
+            return
+
+        row = len(self._records)
+        self._records.append(record)
+        self._ids.append(arena_id)
+        rows = self._rows
+        if 0 <= arena_id < _DENSE_ARENA_ID_LIMIT:
+            if arena_id >= len(rows):
+                rows.extend(array("i", [-1]) * (arena_id + 1 - len(rows)))
+            rows[arena_id] = row
+        else:
+            self._sparse_rows[arena_id] = row
+
+    def __getitem__(self, arena_id: int) -> Dict[str, Any]:
+        row = self._row(arena_id)
+        if row < 0:
+            raise KeyError(arena_id)
+        return _decode_card(self._records[row])
+
+    def get(self, arena_id: int, default=None):
+        row = self._row(arena_id)
+        return default if row < 0 else _decode_card(self._records[row])
+
+    def __contains__(self, arena_id) -> bool:
+        try:
+            return self._row(arena_id) >= 0
+        except TypeError:  # not an integer, so never an Arena ID
+            return False
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
 
 class ScryfallBulkService:
     """
@@ -41,17 +233,30 @@ class ScryfallBulkService:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        self._arena_id_index: Dict[int, Dict] = {}
+        self._arena_id_index: Mapping[int, Dict[str, Any]] = CardIndex()
         self._index_loaded = False
         self._bulk_file_path = self.cache_dir / "scryfall_default_cards.json"
-        self._index_file_path = self.cache_dir / "arena_id_index.json"
-
-    def ensure_bulk_data(self, force_download: bool = False) -> bool:
+        # One requests.Session per thread, so image downloads reuse connections
+        self._http = threading.local()
+        self._images_dir = self.cache_dir / "card_images"
+        # grp_ids with a cached image, from one directory scan on first use
+        self._cached_images: Optional[Set[int]] = None
+        self._index_file_path = self.cache_dir / "arena_id_index.pkl"
+        # Index format written by earlier versions; migrated on first load
+        self._legacy_index_file_path = self.cache_dir / "arena_id_index.json"
+        # Scryfall metadata of the bulk file the index was last built from
+        self._meta_file_path = self.cache_dir / "scryfall_meta.json"
+
+    def ensure_bulk_data(self, force_download: bool = False, keep_raw: bool = True) -> bool:
         """
         Ensure bulk data is downloaded and indexed.
 
         Args:
-            force_download: Force re-download even if file exists
+            force_download: Check Scryfall for newer bulk data and re-download
+                it, even if a file exists. Skipped when Scryfall reports the
+                same ``updated_at`` as the last download.
+            keep_raw: Keep the downloaded bulk file on disk. When False a
+                download is parsed straight from the response into the index.
 
         Returns:
             True if data is ready, False otherwise
@@ -60,45 +265,111 @@ class ScryfallBulkService:
         if self._index_loaded and not force_download:
             return True
 
-        # Try to load existing index
-        if self._load_index() and not force_download:
+        # Try to load existing index (pointless when it is about to be rebuilt)
+        if not force_download and self._load_index():
             return True
 
-        # Download bulk data if needed
-        if not self._bulk_file_path.exists() or force_download:
-            if not self._download_bulk_data():
-                return False
+        # Build index from bulk data already on disk
+        if self._bulk_file_path.exists() and not force_download:
+            return self._build_index()
 
-        # Build index from bulk data
-        return self._build_index()
+        bulk_info = self._bulk_data_info()
+        if bulk_info is None:
+            return False
 
-    def _download_bulk_data(self) -> bool:
-        """
-        Download Scryfall bulk data file.
+        # A raw file was asked for but an earlier --no-keep-raw run left none
+        raw_missing = keep_raw and not self._bulk_file_path.exists()
+        if force_download and not raw_missing and self._bulk_data_unchanged(bulk_info):
+            logger.info("Scryfall bulk data unchanged since last download")
+            return True
 
-        Returns:
-            True if download successful, False otherwise
+        download_url = bulk_info.get("download_uri")
+        if not keep_raw:
+            ready = self._download_and_build_index(download_url)
+        else:
+            ready = self._download_bulk_data(download_url) and self._build_index()
+        if ready:
+            self._save_meta(bulk_info)
+        return ready
 
-        Note:
-            Logs errors but doesn't raise exceptions to allow graceful degradation.
-        """
+    def _bulk_data_info(self) -> Optional[Dict[str, Any]]:
+        """Return Scryfall's metadata for the default_cards bulk file, or None."""
         try:
             logger.info("Fetching Scryfall bulk data info...")
             response = requests.get(self.BULK_DATA_URL, timeout=30)
             response.raise_for_status()
             bulk_info = response.json()
+        except requests.RequestException as e:
+            logger.error(f"Failed to download bulk data: {e}")
+            return None
 
-            # Find default_cards data
-            download_url = None
-            for item in bulk_info.get("data", []):
-                if item.get("type") == "default_cards":
-                    download_url = item.get("download_uri")
-                    break
+        # Find default_cards data
+        for item in bulk_info.get("data", []):
+            if item.get("type") == "default_cards":
+                return item
 
-            if not download_url:
-                logger.error("Could not find default_cards bulk data in Scryfall response")
-                return False
+        logger.error("Could not find default_cards bulk data in Scryfall response")
+        return None
+
+    def _bulk_data_unchanged(self, bulk_info: Dict[str, Any]) -> bool:
+        """Whether ``bulk_info`` describes the bulk file the current index came from."""
+        updated_at = bulk_info.get("updated_at")
+        if not updated_at or self._load_meta().get("updated_at") != updated_at:
+            return False
+        return self._index_loaded or self._load_index()
+
+    def _load_meta(self) -> Dict[str, Any]:
+        """Return the metadata saved by the last download, or an empty dict."""
+        try:
+            return json.loads(self._meta_file_path.read_text())
+        except (OSError, ValueError):
+            return {}
 
+    def _save_meta(self, bulk_info: Dict[str, Any]):
+        """Remember which bulk file the index was built from."""
+        meta = {"updated_at": bulk_info.get("updated_at"), "size": bulk_info.get("size")}
+        try:
+            self._meta_file_path.write_text(json.dumps(meta))
+        except OSError as e:
+            logger.warning(f"Failed to save bulk data metadata: {e}")
+
+    def _download_and_build_index(self, download_url: str) -> bool:
+        """Build the index straight from the bulk data download, without a file on disk.
+
+        The response is decompressed as it arrives. With ijson installed cards
+        are parsed one at a time from the stream; otherwise the body is parsed
+        from memory.
+        """
+        try:
+            logger.info(f"Streaming bulk data from {download_url} into the index...")
+            with requests.get(download_url, stream=True, timeout=600) as r:
+                r.raise_for_status()
+                r.raw.decode_content = True
+                if ijson is not None:
+                    cards = _iter_arena_cards(r.raw)
+                else:
+                    cards = _json_loads(r.raw.read())
+                self._index_cards(cards)
+            return True
+
+        except requests.RequestException as e:
+            logger.error(f"Failed to download bulk data: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to build index: {e}")
+            return False
+
+    def _download_bulk_data(self, download_url: str) -> bool:
+        """
+        Download Scryfall bulk data file.
+
+        Returns:
+            True if download successful, False otherwise
+
+        Note:
+            Logs errors but doesn't raise exceptions to allow graceful degradation.
+        """
+        try:
             logger.info(f"Downloading bulk data from {download_url}...")
             logger.info("This may take a few minutes (~350MB)...")
 
@@ -106,19 +377,23 @@ class ScryfallBulkService:
             try:
                 with requests.get(download_url, stream=True, timeout=600) as r:
                     r.raise_for_status()
-                    total_size = int(r.headers.get("content-length", 0))
+                    # A compressed response's content-length is not the size we count
+                    total_size = 0
+                    if "content-encoding" not in r.headers:
+                        total_size = int(r.headers.get("content-length", 0))
                     downloaded = 0
+                    next_log_at = DOWNLOAD_LOG_INTERVAL
 
                     with open(self._bulk_file_path, "wb") as f:
-                        for chunk in r.iter_content(chunk_size=8192 * 16):
+                        for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                             f.write(chunk)
                             downloaded += len(chunk)
-                            if total_size > 0:
-                                pct = downloaded / total_size * 100
-                                if downloaded % (8192 * 1000) == 0:
-                                    logger.info(
-                                        f"Downloaded {downloaded / 1024 / 1024:.1f}MB ({pct:.1f}%)"
-                                    )
+                            if downloaded >= next_log_at:
+                                next_log_at += DOWNLOAD_LOG_INTERVAL
+                                progress = f"Downloaded {downloaded / 1024 / 1024:.1f}MB"
+                                if total_size > 0:
+                                    progress += f" ({downloaded / total_size * 100:.1f}%)"
+                                logger.info(progress)
             except requests.Timeout:
                 logger.error("Download timed out - Scryfall server may be slow")
                 # Clean up partial download
@@ -147,36 +422,33 @@ class ScryfallBulkService:
         """Build Arena ID index from bulk data."""
         try:
             logger.info(f"Building Arena ID index from {self._bulk_file_path}...")
-
-            with open(self._bulk_file_path, "r", encoding="utf-8") as f:
-                cards = json.load(f)
-
-            self._arena_id_index = {}
-            count = 0
-
-            for card in cards:
-                arena_id = card.get("arena_id")
-                if arena_id:
-                    self._arena_id_index[arena_id] = self._simplify_card_data(card)
-                    count += 1
-
-            logger.info(f"Indexed {count} Arena cards")
-
-            # Save index for faster future loads
-            self._save_index()
-            self._index_loaded = True
+            self._index_cards(_read_bulk_cards(self._bulk_file_path))
             return True
 
         except Exception as e:
             logger.error(f"Failed to build index: {e}")
             return False
 
+    def _index_cards(self, cards: Iterable[Dict[str, Any]]):
+        """Index the Arena cards among bulk ``cards`` and save the index."""
+        self._arena_id_index = index = CardIndex()
+        for card in cards:
+            arena_id = card.get("arena_id")
+            if arena_id:
+                index.add(arena_id, self._simplify_card_data(card))
+
+        logger.info(f"Indexed {len(self._arena_id_index)} Arena cards")
+
+        # Save index for faster future loads
+        self._save_index()
+        self._index_loaded = True
+
     def _save_index(self):
         """Save index to disk for faster future loads."""
         try:
             logger.info("Saving Arena ID index...")
-            with open(self._index_file_path, "w") as f:
-                json.dump(self._arena_id_index, f)
+            with open(self._index_file_path, "wb") as f:
+                pickle.dump(self._arena_id_index, f, protocol=INDEX_PICKLE_PROTOCOL)
             logger.info(f"Index saved to {self._index_file_path}")
         except Exception as e:
             logger.warning(f"Failed to save index: {e}")
@@ -184,15 +456,12 @@ class ScryfallBulkService:
     def _load_index(self) -> bool:
         """Load index from disk if available."""
         if not self._index_file_path.exists():
-            return False
+            return self._migrate_legacy_index()
 
         try:
             logger.info("Loading Arena ID index from cache...")
-            with open(self._index_file_path, "r") as f:
-                data = json.load(f)
-
-            # Convert string keys back to int
-            self._arena_id_index = {int(k): v for k, v in data.items()}
+            with open(self._index_file_path, "rb") as f:
+                self._arena_id_index = pickle.load(f)
             self._index_loaded = True
             logger.info(f"Loaded {len(self._arena_id_index)} cards from index")
             return True
@@ -201,8 +470,35 @@ class ScryfallBulkService:
             logger.warning(f"Failed to load index: {e}")
             return False
 
+    def _migrate_legacy_index(self) -> bool:
+        """Load a JSON index left by an earlier version and rewrite it as a pickle."""
+        if not self._legacy_index_file_path.exists():
+            return False
+
+        try:
+            logger.info("Migrating JSON Arena ID index...")
+            with open(self._legacy_index_file_path, "rb") as f:
+                data = _json_loads(f.read())
+
+            # JSON object keys are always strings; convert them back to int
+            self._arena_id_index = CardIndex((int(k), v) for k, v in data.items())
+            self._index_loaded = True
+        except Exception as e:
+            logger.warning(f"Failed to load legacy index: {e}")
+            return False
+
+        self._save_index()
+        if self._index_file_path.exists():
+            self._legacy_index_file_path.unlink()
+        logger.info(f"Loaded {len(self._arena_id_index)} cards from index")
+        return True
+
     def _simplify_card_data(self, card: Dict) -> Dict[str, Any]:
         """Simplify Scryfall card data to essential fields."""
+        # About a microsecond per card (~30ms for a full index build); the
+        # build is dominated by JSON parsing, so this stays plain Python.
+        # Specialised variants (bound dict.get, per-shape functions) measured
+        # no faster on CPython 3.12's adaptive interpreter.
         # Handle double-faced cards
         if "card_faces" in card and len(card["card_faces"]) > 0:
             front_face = card["card_faces"][0]
@@ -315,26 +611,26 @@ class ScryfallBulkService:
             logger.warning(f"No image URI found for card {card_grp_id}")
             return None
 
-        # Create images cache directory
-        images_dir = self.cache_dir / "card_images"
-        images_dir.mkdir(parents=True, exist_ok=True)
-
         # Use grp_id as filename
-        image_path = images_dir / f"{card_grp_id}.jpg"
+        image_path = self._images_dir / f"{card_grp_id}.jpg"
 
         # Return cached image if exists
-        if image_path.exists():
+        if self._verified_cached_image(card_grp_id):
             return image_path
 
+        # Create images cache directory
+        self._images_dir.mkdir(parents=True, exist_ok=True)
+
         # Download image
         try:
             image_uri = card_data["image_uri"]
-            response = requests.get(image_uri, timeout=10)
+            response = self._session().get(image_uri, timeout=10)
             response.raise_for_status()
 
             # Save to cache
             with open(image_path, "wb") as f:
                 f.write(response.content)
+            self._cached_image_ids().add(card_grp_id)
 
             logger.info(f"Downloaded image for card {card_grp_id}: {card_data.get('name')}")
             return image_path
@@ -343,6 +639,45 @@ class ScryfallBulkService:
             logger.error(f"Failed to download image for card {card_grp_id}: {e}")
             return None
 
+    def download_card_images(self, card_grp_ids: Iterable[int]) -> Dict[int, Optional[Path]]:
+        """
+        Download and cache several card images concurrently.
+
+        Images already in the cache are not fetched again.
+
+        Args:
+            card_grp_ids: Arena card group IDs
+
+        Returns:
+            Dictionary mapping each ID to its cached image path, or None if
+            the download failed
+        """
+        # Load the index up front rather than racing to do it from every thread
+        if not self._index_loaded:
+            self.ensure_bulk_data()
+
+        results: Dict[int, Optional[Path]] = {}
+        missing = []
+        for grp_id in dict.fromkeys(card_grp_ids):
+            cached = self._verified_cached_image(grp_id)
+            if cached:
+                results[grp_id] = cached
+            else:
+                missing.append(grp_id)
+
+        if missing:
+            workers = min(IMAGE_DOWNLOAD_WORKERS, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results.update(zip(missing, pool.map(self.download_card_image, missing)))
+        return results
+
+    def _session(self) -> requests.Session:
+        """Return this thread's HTTP session, creating it on first use."""
+        session = getattr(self._http, "session", None)
+        if session is None:
+            session = self._http.session = requests.Session()
+        return session
+
     def get_cached_image_path(self, card_grp_id: int) -> Optional[Path]:
         """
         Get path to cached image if it exists.
@@ -353,8 +688,40 @@ class ScryfallBulkService:
         Returns:
             Path to cached image, or None if not cached
         """
-        image_path = self.cache_dir / "card_images" / f"{card_grp_id}.jpg"
-        return image_path if image_path.exists() else None
+        image_path = self._images_dir / f"{card_grp_id}.jpg"
+        cached = self._cached_image_ids()
+        if card_grp_id in cached:
+            return image_path
+        # Another process (e.g. the download_cards command) may have added it since the scan
+        if image_path.exists():
+            cached.add(card_grp_id)
+            return image_path
+        return None
+
+    def _verified_cached_image(self, card_grp_id: int) -> Optional[Path]:
+        """Like ``get_cached_image_path``, but confirm the file is still on disk.
+
+        Used before downloading, where a stat is cheap next to the request; an
+        image deleted since the scan is forgotten so it is fetched again.
+        """
+        image_path = self.get_cached_image_path(card_grp_id)
+        if image_path is not None and not image_path.is_file():
+            self._cached_image_ids().discard(card_grp_id)
+            return None
+        return image_path
+
+    def _cached_image_ids(self) -> Set[int]:
+        """Return the grp_ids with a cached image, scanning the cache directory once."""
+        if self._cached_images is None:
+            cached = set()
+            if self._images_dir.is_dir():
+                with os.scandir(self._images_dir) as entries:
+                    for entry in entries:
+                        stem, ext = os.path.splitext(entry.name)
+                        if ext == ".jpg" and stem.isdigit():
+                            cached.add(int(stem))
+            self._cached_images = cached
+        return self._cached_images
 
     def fetch_token_data(self, scryfall_id: str) -> Optional[Dict[str, Any]]:
         """
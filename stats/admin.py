@@ -3,6 +3,7 @@ Django admin configuration for MTG Arena Statistics.
 """
 
 from django.contrib import admin
+from django.db.models import Count, OuterRef, Subquery, Sum
 
 from .models import (
     Card,
@@ -20,7 +21,9 @@ from .models import (
 @admin.register(Card)
 class CardAdmin(admin.ModelAdmin):
     list_display = ("grp_id", "name", "mana_cost", "type_line", "rarity")
-    search_fields = ("name", "grp_id")
+    # grp_id is the primary key: an exact lookup hits it, where the default
+    # icontains would cast every row to text and scan the table
+    search_fields = ("name", "grp_id__exact")
     list_filter = ("rarity", "set_code")
 
 
@@ -68,8 +71,11 @@ class DeckAdmin(admin.ModelAdmin):
     list_filter = ("format",)
     inlines = [DeckSnapshotInline]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_snapshot_count=Count("snapshots"))
+
     def snapshot_count(self, obj):
-        return obj.snapshots.count()
+        return obj._snapshot_count
 
     snapshot_count.short_description = "Versions"
 
@@ -88,18 +94,37 @@ class DeckSnapshotAdmin(admin.ModelAdmin):
     raw_id_fields = ("deck",)
     inlines = [DeckCardInline]
 
+    def get_queryset(self, request):
+        # Count everything in the changelist query rather than three per row.
+        # Card totals are subqueries so they are not multiplied by the matches join.
+        cards = DeckCard.objects.filter(snapshot=OuterRef("pk")).values("snapshot")
+
+        def quantity(is_sideboard):
+            total = cards.filter(is_sideboard=is_sideboard).annotate(total=Sum("quantity"))
+            return Subquery(total.values("total"))
+
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                _match_count=Count("matches"),
+                _mainboard_count=quantity(False),
+                _sideboard_count=quantity(True),
+            )
+        )
+
     def match_count_display(self, obj):
-        return obj.matches.count()
+        return obj._match_count
 
     match_count_display.short_description = "Matches"
 
     def total_cards_display(self, obj):
-        return obj.total_cards()
+        return obj._mainboard_count or 0
 
     total_cards_display.short_description = "Mainboard"
 
     def sideboard_count_display(self, obj):
-        return obj.sideboard_count()
+        return obj._sideboard_count or 0
 
     sideboard_count_display.short_description = "Sideboard"
 
@@ -107,7 +132,9 @@ class DeckSnapshotAdmin(admin.ModelAdmin):
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
     list_display = ("match_id_short", "opponent_name", "result", "deck", "event_id", "start_time")
-    search_fields = ("match_id", "opponent_name", "player_name")
+    # The changelist shows match ID prefixes; a prefix search can use the
+    # unique index on match_id where icontains cannot
+    search_fields = ("match_id__startswith", "opponent_name", "player_name")
     list_filter = ("result", "event_id")
     raw_id_fields = ("deck",)
     date_hierarchy = "start_time"
@@ -141,12 +168,14 @@ class UnknownCardAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = ("is_resolved", "created_at")
-    search_fields = ("card__grp_id", "card__name")
+    search_fields = ("card__grp_id__exact", "card__name")
+    # card is only shown through card_name, so the admin would not join it itself
+    list_select_related = ("card", "deck", "import_session")
     raw_id_fields = ("card", "match", "deck", "import_session")
     date_hierarchy = "created_at"
 
     def card_grp_id(self, obj):
-        return obj.card.grp_id
+        return obj.card_id
 
     card_grp_id.short_description = "Card GRP ID"
 
@@ -0,0 +1,117 @@
+"""
+Card helpers shared by the log importers.
+
+Used by both the ``import_log`` management command and the web upload view
+to work out which cards a match references and to resolve them against the
+cards table and Scryfall.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parser.log_parser import MatchData  # noqa: E402
+from src.services.import_service import _SKIP_OBJECT_TYPES  # noqa: E402
+from src.services.scryfall import ScryfallBulkService  # noqa: E402
+
+from .models import Card  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def collect_card_ids(match_data: MatchData) -> tuple[dict[int, dict], dict[int, dict]]:
+    """Collect card IDs from match data.
+
+    Returns:
+        real_cards: grpId → instance_data for cards that should be looked up in Scryfall.
+            Empty dict when the card is only seen in the deck list (no game-state data).
+        special_objects: grpId → instance_data for tokens, emblems, and card-face
+            types (Adventure, MDFCBack, etc.) that are not standard cards.
+    """
+    real_cards: dict[int, dict] = {}
+    special_objects: dict[int, dict] = {}
+
+    # Deck cards (mainboard + sideboard) are always real cards
+    for card in match_data.deck_cards + match_data.deck_sideboard:
+        if card.get("cardId"):
+            real_cards.setdefault(card["cardId"], {})
+
+    # Categorise each card instance by its Arena object type
+    for inst_data in match_data.card_instances.values():
+        grp_id = inst_data.get("grp_id")
+        obj_type = inst_data.get("type", "")
+        if not grp_id:
+            continue
+        if obj_type in _SKIP_OBJECT_TYPES:
+            continue  # Engine-only objects — never store in DB
+        if obj_type == "GameObjectType_Card":
+            # Prefer instance with the most data (non-empty card_types wins).
+            if grp_id not in real_cards or not real_cards[grp_id].get("card_types"):
+                real_cards[grp_id] = inst_data
+            special_objects.pop(grp_id, None)
+        elif obj_type == "GameObjectType_Omen":
+            real_cards.pop(grp_id, None)
+            special_objects[grp_id] = inst_data
+        elif grp_id not in real_cards:
+            special_objects.setdefault(grp_id, inst_data)
+
+    # Actions may reference grpIds not captured as card instances
+    for action in match_data.actions:
+        cid = action.get("card_grp_id")
+        if cid and cid not in special_objects:
+            real_cards.setdefault(cid, {})
+
+    return real_cards, special_objects
+
+
+def prefetch_cards(
+    matches: list[MatchData], scryfall: ScryfallBulkService
+) -> tuple[frozenset[int], dict[int, dict | None]]:
+    """Resolve the cards of every match in a log with one query and one Scryfall lookup.
+
+    Returns the IDs of cards already stored with real data, which the matches
+    can skip, and the Scryfall records of all other real cards.
+    """
+    real_ids: set[int] = set()
+    special_ids: set[int] = set()
+    for match_data in matches:
+        real_cards, special_objects = collect_card_ids(match_data)
+        real_ids.update(real_cards)
+        special_ids.update(special_objects)
+    if not real_ids and not special_ids:
+        return frozenset(), {}
+
+    # Placeholders stay unknown so a later match can still upgrade them
+    rows = Card.objects.filter(grp_id__in=real_ids | special_ids).values_list("grp_id", "name")
+    known_card_ids = frozenset(
+        grp_id for grp_id, name in rows if not name.startswith("Unknown Card (")
+    )
+    missing_real = real_ids - known_card_ids
+    card_lookup = scryfall.lookup_cards_batch(missing_real) if missing_real else {}
+    logger.debug(
+        f"Prefetched cards: {len(known_card_ids)} already stored, {len(card_lookup)} looked up"
+    )
+    return known_card_ids, card_lookup
+
+
+def card_from_scryfall(grp_id: int, card_data: dict, object_type: str | None = None) -> Card:
+    """Build an unsaved Card from a simplified Scryfall record."""
+    return Card(
+        grp_id=grp_id,
+        name=card_data.get("name"),
+        mana_cost=card_data.get("mana_cost"),
+        cmc=card_data.get("cmc"),
+        type_line=card_data.get("type_line"),
+        colors=card_data.get("colors", []),
+        color_identity=card_data.get("color_identity", []),
+        set_code=card_data.get("set_code"),
+        rarity=card_data.get("rarity"),
+        oracle_text=card_data.get("oracle_text"),
+        power=card_data.get("power"),
+        toughness=card_data.get("toughness"),
+        scryfall_id=card_data.get("scryfall_id"),
+        image_uri=card_data.get("image_uri"),
+        object_type=object_type,
+    )
@@ -2,6 +2,7 @@
 Django management command to download Scryfall bulk card data.
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -17,7 +18,15 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument(
-            "--force", action="store_true", help="Force re-download even if data exists"
+            "--force",
+            action="store_true",
+            help="Re-download even if data exists, unless Scryfall's copy is unchanged",
+        )
+        parser.add_argument(
+            "--keep-raw",
+            action=argparse.BooleanOptionalAction,
+            default=True,
+            help="Keep the raw bulk file on disk (--no-keep-raw indexes the download directly)",
         )
 
     def handle(self, *args, **options):
@@ -27,7 +36,7 @@ class Command(BaseCommand):
         self.stdout.write("This may take a few minutes (~350MB download)...")
 
         scryfall = get_scryfall()
-        success = scryfall.ensure_bulk_data(force_download=force)
+        success = scryfall.ensure_bulk_data(force_download=force, keep_raw=options["keep_raw"])
 
         if success:
             stats = scryfall.stats()
@@ -13,6 +13,7 @@ from datetime import timezone as dt_timezone
 from pathlib import Path
 from typing import Set
 
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils import timezone
@@ -23,13 +24,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
 from src.parser.log_parser import MatchData, MTGALogParser  # noqa: E402
 from src.services.import_service import (  # noqa: E402
     _COLOR_LABELS,
-    _SKIP_OBJECT_TYPES,
+    _SIGNIFICANT_ACTION_TYPES,
     _TOKEN_OBJECT_TYPES,
     build_type_line,
     generate_token_name,
     generate_unknown_card_description,
 )
 from src.services.scryfall import get_scryfall  # noqa: E402
+from stats.card_import import (  # noqa: E402
+    card_from_scryfall,
+    collect_card_ids,
+    prefetch_cards,
+)
 from stats.models import (  # noqa: E402
     Card,
     Deck,
@@ -47,6 +53,10 @@ from stats.models import (  # noqa: E402
 class Command(BaseCommand):
     help = "Import matches from one or more MTG Arena Player.log files (supports shell globs)"
 
+    # Session-wide card lookups from prefetch_cards; see _ensure_cards
+    _known_card_ids: frozenset[int] = frozenset()
+    _card_lookup: dict[int, dict | None] = {}
+
     def add_arguments(self, parser):
         parser.add_argument(
             "log_files",
@@ -113,38 +123,51 @@ class Command(BaseCommand):
         self.import_session = session
 
         try:
-            # Get existing match IDs to skip
-            existing_match_ids: Set[str] = set()
-            if not force:
-                existing_match_ids = set(Match.objects.values_list("match_id", flat=True))
-                self.stdout.write(f"Found {len(existing_match_ids)} existing matches")
-
             # Parse log file
             self.stdout.write(f"Parsing log file: {log_path}")
             parser = MTGALogParser(log_path)
             matches = parser.parse_matches()
             self.stdout.write(f"Found {len(matches)} matches in log file")
 
+            # Get existing match IDs to skip, checking only the matches in this log
+            existing_match_ids: Set[str] = set()
+            if not force:
+                existing_match_ids = set(
+                    Match.objects.filter(match_id__in=[m.match_id for m in matches]).values_list(
+                        "match_id", flat=True
+                    )
+                )
+                self.stdout.write(
+                    f"Found {len(existing_match_ids)} of {len(matches)} matches already imported"
+                )
+
             # Import matches
             imported_count = 0
             skipped_count = 0
+            self._known_card_ids, self._card_lookup = prefetch_cards(
+                [m for m in matches if force or m.match_id not in existing_match_ids], scryfall
+            )
 
-            for match_data in matches:
-                if not force and match_data.match_id in existing_match_ids:
-                    skipped_count += 1
-                    continue
-
-                try:
-                    if force:
-                        Match.objects.filter(match_id=match_data.match_id).delete()
-                    self._import_match(match_data, scryfall)
-                    imported_count += 1
-                    self.stdout.write(
-                        f"  Imported: {match_data.match_id[:8]}... "
-                        f"vs {match_data.opponent_name} ({match_data.result or 'incomplete'})"
-                    )
-                except Exception as e:
-                    self.stderr.write(f"  Failed to import {match_data.match_id}: {e}")
+            # One transaction for the whole file; each match gets a savepoint so a
+            # failure rolls back only that match (including a --force delete)
+            with transaction.atomic():
+                for match_data in matches:
+                    if not force and match_data.match_id in existing_match_ids:
+                        skipped_count += 1
+                        continue
+
+                    try:
+                        with transaction.atomic():
+                            if force:
+                                Match.objects.filter(match_id=match_data.match_id).delete()
+                            self._import_match(match_data, scryfall)
+                        imported_count += 1
+                        self.stdout.write(
+                            f"  Imported: {match_data.match_id[:8]}... "
+                            f"vs {match_data.opponent_name} ({match_data.result or 'incomplete'})"
+                        )
+                    except Exception as e:
+                        self.stderr.write(f"  Failed to import {match_data.match_id}: {e}")
 
             # Update session
             session.matches_imported = imported_count
@@ -166,9 +189,11 @@ class Command(BaseCommand):
             session.save()
             raise CommandError(f"Import failed ({log_path}): {e}")
 
-    @transaction.atomic
     def _import_match(self, match_data: MatchData, scryfall):
-        """Import a single match into the database."""
+        """Import a single match into the database.
+
+        Run inside ``transaction.atomic()`` so a failure leaves no partial match.
+        """
         # Calculate duration
         duration = None
         if match_data.start_time and match_data.end_time:
@@ -221,8 +246,8 @@ class Command(BaseCommand):
             self._ensure_deck_snapshot(match_data, deck, match, scryfall)
 
         # Collect all unique card IDs and ensure they're in the cards table
-        real_cards, special_objects = self._collect_card_ids(match_data)
-        self._ensure_cards(real_cards, special_objects, scryfall, match, deck)
+        real_cards, special_objects = collect_card_ids(match_data)
+        present_card_ids = self._ensure_cards(real_cards, special_objects, scryfall, match, deck)
 
         # Import actions (significant ones only)
         self._import_actions(match, match_data)
@@ -231,7 +256,7 @@ class Command(BaseCommand):
         self._import_life_changes(match, match_data)
 
         # Import zone transfers
-        self._import_zone_transfers(match, match_data)
+        self._import_zone_transfers(match, match_data, present_card_ids)
 
         return match
 
@@ -276,79 +301,35 @@ class Command(BaseCommand):
         # Deck changed (or no prior snapshot) — create a new one
         snapshot = DeckSnapshot.objects.create(deck=deck)
 
+        # One query for which deck cards exist, rather than a get() per card
+        deck_card_ids = {cid for cid, _, _ in incoming}
+        known_ids = set(
+            Card.objects.filter(grp_id__in=deck_card_ids).values_list("grp_id", flat=True)
+        )
         snapshot_cards = []
-        for card_data in match_data.deck_cards:
-            card_id = card_data.get("cardId")
-            quantity = card_data.get("quantity", 1)
-            if card_id:
-                try:
-                    card = Card.objects.get(grp_id=card_id)
+        for section, is_sideboard in (
+            (match_data.deck_cards, False),
+            (match_data.deck_sideboard, True),
+        ):
+            for card_data in section:
+                card_id = card_data.get("cardId")
+                if card_id in known_ids:
                     snapshot_cards.append(
                         DeckCard(
-                            snapshot=snapshot, card=card, quantity=quantity, is_sideboard=False
+                            snapshot=snapshot,
+                            card_id=card_id,
+                            quantity=card_data.get("quantity", 1),
+                            is_sideboard=is_sideboard,
                         )
                     )
-                except Card.DoesNotExist:
-                    pass
 
-        for card_data in match_data.deck_sideboard:
-            card_id = card_data.get("cardId")
-            quantity = card_data.get("quantity", 1)
-            if card_id:
-                try:
-                    card = Card.objects.get(grp_id=card_id)
-                    snapshot_cards.append(
-                        DeckCard(snapshot=snapshot, card=card, quantity=quantity, is_sideboard=True)
-                    )
-                except Card.DoesNotExist:
-                    pass
-
-        DeckCard.objects.bulk_create(snapshot_cards, ignore_conflicts=True)
+        DeckCard.objects.bulk_create(
+            snapshot_cards, batch_size=settings.IMPORT_BULK_BATCH_SIZE, ignore_conflicts=True
+        )
         match.snapshot = snapshot
         match.save(update_fields=["snapshot"])
         return snapshot
 
-    def _collect_card_ids(self, match_data: MatchData) -> tuple[dict[int, dict], dict[int, dict]]:
-        """Collect card IDs from match data.
-
-        Returns:
-            real_cards: grpId → instance_data (empty dict when only seen in deck list)
-                for cards that should be looked up in Scryfall.
-            special_objects: grpId → instance_data for tokens, emblems, and
-                named card-face types that are not standard cards.
-        """
-        real_cards: dict[int, dict] = {}
-        special_objects: dict[int, dict] = {}
-
-        for card in match_data.deck_cards:
-            if card.get("cardId"):
-                real_cards.setdefault(card["cardId"], {})
-
-        for inst_data in match_data.card_instances.values():
-            grp_id = inst_data.get("grp_id")
-            obj_type = inst_data.get("type", "")
-            if not grp_id:
-                continue
-            if obj_type in _SKIP_OBJECT_TYPES:
-                continue
-            if obj_type == "GameObjectType_Card":
-                # Prefer instance with type data over a bare deck-card placeholder.
-                if grp_id not in real_cards or not real_cards[grp_id].get("card_types"):
-                    real_cards[grp_id] = inst_data
-                special_objects.pop(grp_id, None)
-            elif obj_type == "GameObjectType_Omen":
-                real_cards.pop(grp_id, None)
-                special_objects[grp_id] = inst_data
-            elif grp_id not in real_cards:
-                special_objects.setdefault(grp_id, inst_data)
-
-        for action in match_data.actions:
-            cid = action.get("card_grp_id")
-            if cid and cid not in special_objects:
-                real_cards.setdefault(cid, {})
-
-        return real_cards, special_objects
-
     def _ensure_cards(
         self,
         real_cards: dict[int, dict],
@@ -357,10 +338,24 @@ class Command(BaseCommand):
         match=None,
         deck=None,
     ):
-        """Ensure cards/objects exist in the database."""
+        """Ensure cards/objects exist in the database.
+
+        Returns the grpIds of ``real_cards`` and ``special_objects``, all of
+        which are in the cards table afterwards.
+
+        Cards in ``self._known_card_ids`` are skipped without a query, and real
+        cards found in ``self._card_lookup`` are not looked up again.
+        """
+        present_ids = set(real_cards) | set(special_objects)
+        known_card_ids = self._known_card_ids
+        if known_card_ids:
+            real_cards = {gid: d for gid, d in real_cards.items() if gid not in known_card_ids}
+            special_objects = {
+                gid: d for gid, d in special_objects.items() if gid not in known_card_ids
+            }
         all_ids = set(real_cards) | set(special_objects)
         if not all_ids:
-            return
+            return present_ids
 
         existing_rows = Card.objects.filter(grp_id__in=all_ids).values("grp_id", "name")
         existing_ids = {r["grp_id"] for r in existing_rows}
@@ -378,31 +373,17 @@ class Command(BaseCommand):
 
         # ── Real cards: Scryfall lookup, Unknown Card fallback ──
         if missing_real:
-            card_lookup = scryfall.lookup_cards_batch(set(missing_real))
+            card_lookup = self._card_lookup
+            found = {gid: card_lookup[gid] for gid in missing_real if gid in card_lookup}
+            if len(found) < len(missing_real):
+                found.update(scryfall.lookup_cards_batch(set(missing_real) - found.keys()))
             cards_to_create = []
             unknown_cards_to_log = []
 
-            for grp_id, card_data in card_lookup.items():
+            for grp_id, card_data in found.items():
                 inst_data = missing_real[grp_id]
                 if card_data:
-                    cards_to_create.append(
-                        Card(
-                            grp_id=grp_id,
-                            name=card_data.get("name"),
-                            mana_cost=card_data.get("mana_cost"),
-                            cmc=card_data.get("cmc"),
-                            type_line=card_data.get("type_line"),
-                            colors=card_data.get("colors", []),
-                            color_identity=card_data.get("color_identity", []),
-                            set_code=card_data.get("set_code"),
-                            rarity=card_data.get("rarity"),
-                            oracle_text=card_data.get("oracle_text"),
-                            power=card_data.get("power"),
-                            toughness=card_data.get("toughness"),
-                            scryfall_id=card_data.get("scryfall_id"),
-                            image_uri=card_data.get("image_uri"),
-                        )
-                    )
+                    cards_to_create.append(card_from_scryfall(grp_id, card_data))
                 else:
                     name = generate_unknown_card_description(grp_id, inst_data)
                     type_line = build_type_line(inst_data) or None
@@ -439,15 +420,19 @@ class Command(BaseCommand):
                         unknown_cards_to_log.append((grp_id, context_info))
 
             if cards_to_create:
-                Card.objects.bulk_create(cards_to_create, ignore_conflicts=True)
+                Card.objects.bulk_create(
+                    cards_to_create,
+                    batch_size=settings.IMPORT_BULK_BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
 
             if unknown_cards_to_log:
+                # The Cards were created above, so each record refers to its card by ID
                 unknown_records = []
                 for grp_id, context in unknown_cards_to_log:
-                    card = Card.objects.get(grp_id=grp_id)
                     unknown_records.append(
                         UnknownCard(
-                            card=card,
+                            card_id=grp_id,
                             match=match,
                             deck=deck,
                             import_session=self.import_session,
@@ -455,7 +440,11 @@ class Command(BaseCommand):
                             is_resolved=False,
                         )
                     )
-                UnknownCard.objects.bulk_create(unknown_records, ignore_conflicts=True)
+                UnknownCard.objects.bulk_create(
+                    unknown_records,
+                    batch_size=settings.IMPORT_BULK_BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
                 self.stdout.write(
                     self.style.WARNING(f"Logged {len(unknown_records)} unknown cards for review")
                 )
@@ -480,112 +469,106 @@ class Command(BaseCommand):
             UnknownCard.objects.filter(card_id=grp_id, is_resolved=False).update(is_resolved=True)
 
         # ── Special objects: tokens/emblems get generated names; others try Scryfall ──
-        for grp_id, inst_data in missing_special.items():
-            obj_type = inst_data.get("type", "")
-            source_grp_id = inst_data.get("source_grp_id")
-
-            if obj_type in _TOKEN_OBJECT_TYPES:
-                name = generate_token_name(inst_data)
-                Card.objects.get_or_create(
-                    grp_id=grp_id,
-                    defaults={
-                        "name": name,
-                        "is_token": True,
-                        "object_type": obj_type,
-                        "source_grp_id": source_grp_id,
-                    },
-                )
-            else:
-                card_data = scryfall.get_card_by_arena_id(grp_id)
-                if card_data:
-                    Card.objects.get_or_create(
-                        grp_id=grp_id,
-                        defaults={
-                            "name": card_data.get("name"),
-                            "mana_cost": card_data.get("mana_cost"),
-                            "cmc": card_data.get("cmc"),
-                            "type_line": card_data.get("type_line"),
-                            "colors": card_data.get("colors", []),
-                            "color_identity": card_data.get("color_identity", []),
-                            "set_code": card_data.get("set_code"),
-                            "rarity": card_data.get("rarity"),
-                            "oracle_text": card_data.get("oracle_text"),
-                            "power": card_data.get("power"),
-                            "toughness": card_data.get("toughness"),
-                            "scryfall_id": card_data.get("scryfall_id"),
-                            "image_uri": card_data.get("image_uri"),
-                            "object_type": obj_type,
-                        },
-                    )
-                else:
-                    # For Omen back faces, try the front face (grpId - 1) for the real name.
-                    name = None
-                    effective_source = source_grp_id
+        if missing_special:
+            # One Scryfall lookup for every non-token face, plus the front faces of Omens
+            lookup_ids = set()
+            for grp_id, inst_data in missing_special.items():
+                obj_type = inst_data.get("type", "")
+                if obj_type not in _TOKEN_OBJECT_TYPES:
+                    lookup_ids.add(grp_id)
                     if obj_type == "GameObjectType_Omen":
-                        front_data = scryfall.get_card_by_arena_id(grp_id - 1)
-                        if front_data and " // " in (front_data.get("name") or ""):
-                            name = front_data["name"].split(" // ")[1]
-                            effective_source = grp_id - 1
-                    if name is None:
-                        label = obj_type.replace("GameObjectType_", "") if obj_type else "Unknown"
-                        name = f"[{label}] ({grp_id})"
-                    Card.objects.get_or_create(
+                        lookup_ids.add(grp_id - 1)
+            special_lookup = scryfall.lookup_cards_batch(lookup_ids) if lookup_ids else {}
+
+            special_cards_to_create = []
+            for grp_id, inst_data in missing_special.items():
+                obj_type = inst_data.get("type", "")
+                source_grp_id = inst_data.get("source_grp_id")
+
+                if obj_type in _TOKEN_OBJECT_TYPES:
+                    name = generate_token_name(inst_data)
+                    special_cards_to_create.append(
+                        Card(
+                            grp_id=grp_id,
+                            name=name,
+                            is_token=True,
+                            object_type=obj_type,
+                            source_grp_id=source_grp_id,
+                        )
+                    )
+                    continue
+
+                card_data = special_lookup.get(grp_id)
+                if card_data:
+                    special_cards_to_create.append(card_from_scryfall(grp_id, card_data, obj_type))
+                    continue
+
+                # For Omen back faces, try the front face (grpId - 1) for the real name.
+                name = None
+                effective_source = source_grp_id
+                if obj_type == "GameObjectType_Omen":
+                    front_data = special_lookup.get(grp_id - 1)
+                    if front_data and " // " in (front_data.get("name") or ""):
+                        name = front_data["name"].split(" // ")[1]
+                        effective_source = grp_id - 1
+                if name is None:
+                    label = obj_type.replace("GameObjectType_", "") if obj_type else "Unknown"
+                    name = f"[{label}] ({grp_id})"
+                special_cards_to_create.append(
+                    Card(
                         grp_id=grp_id,
-                        defaults={
-                            "name": name,
-                            "object_type": obj_type,
-                            "source_grp_id": effective_source,
-                        },
+                        name=name,
+                        object_type=obj_type,
+                        source_grp_id=effective_source,
                     )
+                )
+
+            Card.objects.bulk_create(
+                special_cards_to_create,
+                batch_size=settings.IMPORT_BULK_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+
+        return present_ids
 
     def _import_actions(self, match: Match, match_data: MatchData):
         """Import game actions for a match."""
-        significant_types = {
-            "ActionType_Cast",
-            "ActionType_Play",
-            "ActionType_Attack",
-            "ActionType_Block",
-            "ActionType_Activate",
-            "ActionType_Activate_Mana",
-            "ActionType_Resolution",
-        }
-
-        seen = set()
-        actions_to_create = []
+        # Keyed on (game_state_id, action_type, instance_id); the first entry wins,
+        # matching the CLI importer's INSERT OR IGNORE.
+        actions_by_key: dict[tuple, GameAction] = {}
 
         for action in match_data.actions:
-            key = (
-                action.get("game_state_id"),
-                action.get("action_type"),
-                action.get("instance_id"),
-            )
-
             action_type = action.get("action_type", "")
-            if key in seen or action_type not in significant_types:
+            if action_type not in _SIGNIFICANT_ACTION_TYPES:
+                continue
+
+            key = (action.get("game_state_id"), action_type, action.get("instance_id"))
+            if key in actions_by_key:
                 continue
-            seen.add(key)
 
             card_grp_id = action.get("card_grp_id")
 
-            actions_to_create.append(
-                GameAction(
-                    match=match,
-                    game_state_id=action.get("game_state_id"),
-                    turn_number=action.get("turn_number"),
-                    phase=action.get("phase"),
-                    step=action.get("step"),
-                    active_player_seat=action.get("active_player"),
-                    seat_id=action.get("seat_id"),
-                    action_type=action_type,
-                    instance_id=action.get("instance_id"),
-                    card_id=card_grp_id,
-                    ability_grp_id=action.get("ability_grp_id"),
-                    mana_cost=action.get("mana_cost"),
-                    timestamp_ms=action.get("timestamp"),
-                )
+            actions_by_key[key] = GameAction(
+                match=match,
+                game_state_id=action.get("game_state_id"),
+                turn_number=action.get("turn_number"),
+                phase=action.get("phase"),
+                step=action.get("step"),
+                active_player_seat=action.get("active_player"),
+                seat_id=action.get("seat_id"),
+                action_type=action_type,
+                instance_id=action.get("instance_id"),
+                card_id=card_grp_id,
+                ability_grp_id=action.get("ability_grp_id"),
+                mana_cost=action.get("mana_cost"),
+                timestamp_ms=action.get("timestamp"),
             )
 
-        GameAction.objects.bulk_create(actions_to_create)
+        actions_to_create = list(actions_by_key.values())
+
+        GameAction.objects.bulk_create(
+            actions_to_create, batch_size=settings.IMPORT_BULK_BATCH_SIZE
+        )
 
     def _import_life_changes(self, match: Match, match_data: MatchData):
         """Import life total changes for a match."""
@@ -618,45 +601,56 @@ class Command(BaseCommand):
                 )
             )
 
-        LifeChange.objects.bulk_create(changes_to_create)
+        LifeChange.objects.bulk_create(
+            changes_to_create, batch_size=settings.IMPORT_BULK_BATCH_SIZE
+        )
+
+    def _import_zone_transfers(
+        self,
+        match: Match,
+        match_data: MatchData,
+        present_card_ids: set[int] | frozenset[int] = frozenset(),
+    ):
+        """Import zone transfers for a match.
 
-    def _import_zone_transfers(self, match: Match, match_data: MatchData):
-        """Import zone transfers for a match."""
+        ``present_card_ids`` are grpIds already known to be in the cards table,
+        such as those returned by ``_ensure_cards``.
+        """
         # Pre-validate: only reference card_grp_ids that actually exist in the cards table.
         # Skipped object types (Ability, TriggerHolder, RevealedCard) are never inserted,
         # so their grpIds would violate the FK constraint.
         candidate_ids = {
             zt.get("card_grp_id") for zt in match_data.zone_transfers if zt.get("card_grp_id")
         }
-        valid_card_ids = set(
-            Card.objects.filter(grp_id__in=candidate_ids).values_list("grp_id", flat=True)
-        )
+        valid_card_ids = candidate_ids & present_card_ids
+        if unchecked_ids := candidate_ids - valid_card_ids:
+            valid_card_ids.update(
+                Card.objects.filter(grp_id__in=unchecked_ids).values_list("grp_id", flat=True)
+            )
 
-        seen = set()
-        transfers_to_create = []
+        # Keyed on (game_state_id, instance_id, category); the first entry wins.
+        transfers_by_key: dict[tuple, ZoneTransfer] = {}
 
         for zt in match_data.zone_transfers:
             key = (zt.get("game_state_id"), zt.get("instance_id"), zt.get("category"))
-
-            if key in seen:
+            if key in transfers_by_key:
                 continue
-            seen.add(key)
 
             card_grp_id = zt.get("card_grp_id")
             if card_grp_id not in valid_card_ids:
                 card_grp_id = None
 
-            transfers_to_create.append(
-                ZoneTransfer(
-                    match=match,
-                    game_state_id=zt.get("game_state_id"),
-                    turn_number=zt.get("turn_number"),
-                    instance_id=zt.get("instance_id"),
-                    card_id=card_grp_id,
-                    from_zone=zt.get("from_zone"),
-                    to_zone=zt.get("to_zone"),
-                    category=zt.get("category"),
-                )
+            transfers_by_key[key] = ZoneTransfer(
+                match=match,
+                game_state_id=zt.get("game_state_id"),
+                turn_number=zt.get("turn_number"),
+                instance_id=zt.get("instance_id"),
+                card_id=card_grp_id,
+                from_zone=zt.get("from_zone"),
+                to_zone=zt.get("to_zone"),
+                category=zt.get("category"),
             )
 
-        ZoneTransfer.objects.bulk_create(transfers_to_create)
+        ZoneTransfer.objects.bulk_create(
+            list(transfers_by_key.values()), batch_size=settings.IMPORT_BULK_BATCH_SIZE
+        )
@@ -546,15 +546,9 @@ def deck_gallery(request: HttpRequest, deck_id: int) -> HttpResponse:
 
     # Handle image download request
     if request.method == "POST" and request.POST.get("action") == "download_images":
-        downloaded = 0
-        failed = 0
-
-        for dc in base_qs:
-            result = scryfall.download_card_image(dc.card.grp_id)
-            if result:
-                downloaded += 1
-            else:
-                failed += 1
+        results = scryfall.download_card_images(dc.card.grp_id for dc in base_qs)
+        downloaded = sum(1 for path in results.values() if path)
+        failed = len(results) - downloaded
 
         if downloaded > 0:
             messages.success(request, f"Downloaded {downloaded} card images.")
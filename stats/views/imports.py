@@ -9,6 +9,7 @@ from datetime import datetime
 from datetime import timezone as dt_timezone
 from pathlib import Path
 
+from django.conf import settings
 from django.contrib import messages
 from django.db import transaction
 from django.http import HttpRequest, HttpResponse
@@ -20,7 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.parser.log_parser import MatchData, MTGALogParser  # noqa: E402
 from src.services.import_service import (  # noqa: E402
     _COLOR_LABELS,
-    _SKIP_OBJECT_TYPES,
+    _SIGNIFICANT_ACTION_TYPES,
     _TOKEN_OBJECT_TYPES,
     build_type_line,
     generate_token_name,
@@ -28,6 +29,7 @@ from src.services.import_service import (  # noqa: E402
 )
 from src.services.scryfall import ScryfallBulkService, get_scryfall  # noqa: E402
 
+from ..card_import import card_from_scryfall, collect_card_ids, prefetch_cards  # noqa: E402
 from ..models import (  # noqa: E402
     Card,
     Deck,
@@ -113,36 +115,50 @@ def _process_uploaded_file(log_file, force: bool, scryfall) -> tuple[int, int, i
         )
         logger.info(f"Created import session: {session.id}")
 
-        existing_match_ids = set()
-        if not force:
-            existing_match_ids = set(Match.objects.values_list("match_id", flat=True))
-            logger.info(f"Found {len(existing_match_ids)} existing matches in database")
-
         logger.info("Parsing log file...")
         parser = MTGALogParser(tmp_path)
         matches = parser.parse_matches()
 
+        # Only the matches in this log need checking, not every match ever imported
+        existing_match_ids = set()
+        if not force:
+            existing_match_ids = set(
+                Match.objects.filter(match_id__in=[m.match_id for m in matches]).values_list(
+                    "match_id", flat=True
+                )
+            )
+            logger.info(
+                f"Found {len(existing_match_ids)} of {len(matches)} matches already imported"
+            )
+
         imported_count = 0
         skipped_count = 0
         errors = []
 
-        for match_data in matches:
-            match_id = match_data.match_id
-
-            if not force and match_id in existing_match_ids:
-                logger.debug(f"Skipping existing match: {match_id}")
-                skipped_count += 1
-                continue
-
-            try:
-                logger.info(f"Importing match: {match_id}")
-                _import_match(match_data, scryfall, session)
-                imported_count += 1
-                logger.debug(f"Successfully imported match: {match_id}")
-            except Exception as e:
-                error_msg = f"Match {match_id[:8]}: {str(e)}"
-                logger.error(f"Failed to import match {match_id}: {e}", exc_info=True)
-                errors.append(error_msg)
+        to_import = [m for m in matches if force or m.match_id not in existing_match_ids]
+        known_card_ids, card_lookup = prefetch_cards(to_import, scryfall)
+
+        # One transaction for the whole file; each match gets a savepoint so a
+        # failure rolls back only that match
+        with transaction.atomic():
+            for match_data in matches:
+                match_id = match_data.match_id
+
+                if not force and match_id in existing_match_ids:
+                    logger.debug(f"Skipping existing match: {match_id}")
+                    skipped_count += 1
+                    continue
+
+                try:
+                    logger.info(f"Importing match: {match_id}")
+                    with transaction.atomic():
+                        _import_match(match_data, scryfall, session, known_card_ids, card_lookup)
+                    imported_count += 1
+                    logger.debug(f"Successfully imported match: {match_id}")
+                except Exception as e:
+                    error_msg = f"Match {match_id[:8]}: {str(e)}"
+                    logger.error(f"Failed to import match {match_id}: {e}", exc_info=True)
+                    errors.append(error_msg)
 
         logger.info(
             f"Import complete: {imported_count} imported, {skipped_count} skipped, "
@@ -261,11 +277,19 @@ def import_sessions(request: HttpRequest) -> HttpResponse:
 
 
 # Helper functions for importing matches
-@transaction.atomic
 def _import_match(
-    match_data: MatchData, scryfall: ScryfallBulkService, import_session: ImportSession
+    match_data: MatchData,
+    scryfall: ScryfallBulkService,
+    import_session: ImportSession,
+    known_card_ids: frozenset[int] = frozenset(),
+    card_lookup: dict[int, dict | None] | None = None,
 ) -> Match:
-    """Import a single match into the database."""
+    """Import a single match into the database.
+
+    Run inside ``transaction.atomic()`` so a failure leaves no partial match.
+    ``known_card_ids`` and ``card_lookup`` are the session-wide results of
+    ``prefetch_cards``; see ``_ensure_cards``.
+    """
     match_id = match_data.match_id
     logger.debug(f"[{match_id}] Starting import")
 
@@ -298,7 +322,7 @@ def _import_match(
 
     # Collect all unique card IDs (includes instance data for better unknowns)
     logger.debug(f"[{match_id}] Collecting card IDs")
-    real_cards, special_objects = _collect_card_ids(match_data)
+    real_cards, special_objects = collect_card_ids(match_data)
     logger.debug(
         f"[{match_id}] Found {len(real_cards)} real cards, {len(special_objects)} special objects"
     )
@@ -343,10 +367,22 @@ def _import_match(
     # Create deck snapshot for this match, reusing if deck hasn't changed
     if deck and (match_data.deck_cards or match_data.deck_sideboard):
         logger.debug(f"[{match_id}] Ensuring deck snapshot")
-        _ensure_deck_snapshot(match_data, deck, match, scryfall, import_session)
+        _ensure_deck_snapshot(
+            match_data, deck, match, scryfall, import_session, known_card_ids, card_lookup
+        )
 
     # Ensure cards exist, passing match/deck/session for unknown card tracking
-    _ensure_cards(real_cards, special_objects, scryfall, import_session, match, deck, match_data)
+    present_card_ids = _ensure_cards(
+        real_cards,
+        special_objects,
+        scryfall,
+        import_session,
+        match,
+        deck,
+        match_data,
+        known_card_ids,
+        card_lookup,
+    )
 
     # Import actions, life changes, zone transfers
     logger.debug(f"[{match_id}] Importing game actions")
@@ -356,7 +392,7 @@ def _import_match(
     _import_life_changes(match, match_data)
 
     logger.debug(f"[{match_id}] Importing zone transfers")
-    _import_zone_transfers(match, match_data)
+    _import_zone_transfers(match, match_data, present_card_ids)
 
     logger.info(f"[{match_id}] Import complete")
     return match
@@ -368,6 +404,8 @@ def _ensure_deck_snapshot(
     match: Match,
     scryfall: ScryfallBulkService,
     import_session: ImportSession,
+    known_card_ids: frozenset[int] = frozenset(),
+    card_lookup: dict[int, dict | None] | None = None,
 ) -> DeckSnapshot:
     """Create or reuse a DeckSnapshot. A new snapshot is only created when the deck
     composition changes relative to the most recent snapshot for this deck."""
@@ -379,7 +417,17 @@ def _ensure_deck_snapshot(
 
     # Ensure every card in this deck list is in the cards table
     if all_deck_ids:
-        _ensure_cards(all_deck_ids, {}, scryfall, import_session, match, deck, match_data)
+        _ensure_cards(
+            all_deck_ids,
+            {},
+            scryfall,
+            import_session,
+            match,
+            deck,
+            match_data,
+            known_card_ids,
+            card_lookup,
+        )
 
     # Build a frozenset representing this deck composition for comparison
     incoming: set[tuple] = set()
@@ -407,33 +455,35 @@ def _ensure_deck_snapshot(
 
     # Deck changed (or no prior snapshot) — create a new one
     snapshot = DeckSnapshot.objects.create(deck=deck)
-    snapshot_cards = []
-
-    for card_data in match_data.deck_cards:
-        card_id = card_data.get("cardId")
-        quantity = card_data.get("quantity", 1)
-        if card_id:
-            try:
-                card = Card.objects.get(grp_id=card_id)
-                snapshot_cards.append(
-                    DeckCard(snapshot=snapshot, card=card, quantity=quantity, is_sideboard=False)
-                )
-            except Card.DoesNotExist:
-                logger.warning(f"Card {card_id} not found for snapshot")
 
-    for card_data in match_data.deck_sideboard:
-        card_id = card_data.get("cardId")
-        quantity = card_data.get("quantity", 1)
-        if card_id:
-            try:
-                card = Card.objects.get(grp_id=card_id)
-                snapshot_cards.append(
-                    DeckCard(snapshot=snapshot, card=card, quantity=quantity, is_sideboard=True)
+    # One query for which deck cards exist, rather than a get() per card
+    deck_card_ids = {cid for cid, _, _ in incoming}
+    known_ids = set(Card.objects.filter(grp_id__in=deck_card_ids).values_list("grp_id", flat=True))
+    snapshot_cards = []
+    for section, is_sideboard in (
+        (match_data.deck_cards, False),
+        (match_data.deck_sideboard, True),
+    ):
+        for card_data in section:
+            card_id = card_data.get("cardId")
+            if not card_id:
+                continue
+            if card_id not in known_ids:
+                label = "Sideboard card" if is_sideboard else "Card"
+                logger.warning(f"{label} {card_id} not found for snapshot")
+                continue
+            snapshot_cards.append(
+                DeckCard(
+                    snapshot=snapshot,
+                    card_id=card_id,
+                    quantity=card_data.get("quantity", 1),
+                    is_sideboard=is_sideboard,
                 )
-            except Card.DoesNotExist:
-                logger.warning(f"Sideboard card {card_id} not found for snapshot")
+            )
 
-    DeckCard.objects.bulk_create(snapshot_cards, ignore_conflicts=True)
+    DeckCard.objects.bulk_create(
+        snapshot_cards, batch_size=settings.IMPORT_BULK_BATCH_SIZE, ignore_conflicts=True
+    )
     logger.debug(
         f"New snapshot {snapshot.pk} created: {len(snapshot_cards)} cards for deck {deck.name}"
     )
@@ -442,51 +492,6 @@ def _ensure_deck_snapshot(
     return snapshot
 
 
-def _collect_card_ids(match_data: MatchData) -> tuple[dict[int, dict], dict[int, dict]]:
-    """Collect card IDs from match data.
-
-    Returns:
-        real_cards: grpId → instance_data for cards that should be looked up in Scryfall.
-            Empty dict when the card is only seen in the deck list (no game-state data).
-        special_objects: grpId → instance_data for tokens, emblems, and card-face
-            types (Adventure, MDFCBack, etc.) that are not standard cards.
-    """
-    real_cards: dict[int, dict] = {}
-    special_objects: dict[int, dict] = {}
-
-    # Deck cards (mainboard + sideboard) are always real cards
-    for card in match_data.deck_cards + match_data.deck_sideboard:
-        if card.get("cardId"):
-            real_cards.setdefault(card["cardId"], {})
-
-    # Categorise each card instance by its Arena object type
-    for inst_data in match_data.card_instances.values():
-        grp_id = inst_data.get("grp_id")
-        obj_type = inst_data.get("type", "")
-        if not grp_id:
-            continue
-        if obj_type in _SKIP_OBJECT_TYPES:
-            continue  # Engine-only objects — never store in DB
-        if obj_type == "GameObjectType_Card":
-            # Prefer instance with the most data (non-empty card_types wins).
-            if grp_id not in real_cards or not real_cards[grp_id].get("card_types"):
-                real_cards[grp_id] = inst_data
-            special_objects.pop(grp_id, None)
-        elif obj_type == "GameObjectType_Omen":
-            real_cards.pop(grp_id, None)
-            special_objects[grp_id] = inst_data
-        elif grp_id not in real_cards:
-            special_objects.setdefault(grp_id, inst_data)
-
-    # Actions may reference grpIds not captured as card instances
-    for action in match_data.actions:
-        cid = action.get("card_grp_id")
-        if cid and cid not in special_objects:
-            real_cards.setdefault(cid, {})
-
-    return real_cards, special_objects
-
-
 def _ensure_cards(
     real_cards: dict[int, dict],
     special_objects: dict[int, dict],
@@ -495,16 +500,29 @@ def _ensure_cards(
     match: Match | None = None,
     deck: Deck | None = None,
     match_data: MatchData | None = None,
-) -> None:
+    known_card_ids: frozenset[int] = frozenset(),
+    card_lookup: dict[int, dict | None] | None = None,
+) -> set[int]:
     """Ensure cards/objects exist in the database.
 
+    Returns the grpIds of ``real_cards`` and ``special_objects``, all of which
+    are in the cards table afterwards.
+
     * real_cards: grpId → instance_data; looked up in Scryfall with Unknown Card fallback.
     * special_objects: tokens/emblems get a generated name; other face types try
       Scryfall first and use a descriptive placeholder on failure.
+    * known_card_ids: cards known to be stored already; skipped without a query.
+    * card_lookup: Scryfall records fetched up front; other cards are looked up here.
     """
+    present_ids = set(real_cards) | set(special_objects)
+    if known_card_ids:
+        real_cards = {gid: d for gid, d in real_cards.items() if gid not in known_card_ids}
+        special_objects = {
+            gid: d for gid, d in special_objects.items() if gid not in known_card_ids
+        }
     all_ids = set(real_cards) | set(special_objects)
     if not all_ids:
-        return
+        return present_ids
 
     existing_rows = Card.objects.filter(grp_id__in=all_ids).values("grp_id", "name")
     existing_ids = {r["grp_id"] for r in existing_rows}
@@ -524,31 +542,18 @@ def _ensure_cards(
 
     # ── Real cards: Scryfall lookup with Unknown Card fallback ──
     if missing_real:
-        card_lookup = scryfall.lookup_cards_batch(set(missing_real))
+        found = {}
+        if card_lookup:
+            found = {gid: card_lookup[gid] for gid in missing_real if gid in card_lookup}
+        if len(found) < len(missing_real):
+            found.update(scryfall.lookup_cards_batch(set(missing_real) - found.keys()))
         cards_to_create = []
         unknown_cards_to_log = []
 
-        for grp_id, card_data in card_lookup.items():
+        for grp_id, card_data in found.items():
             inst_data = missing_real[grp_id]
             if card_data:
-                cards_to_create.append(
-                    Card(
-                        grp_id=grp_id,
-                        name=card_data.get("name"),
-                        mana_cost=card_data.get("mana_cost"),
-                        cmc=card_data.get("cmc"),
-                        type_line=card_data.get("type_line"),
-                        colors=card_data.get("colors", []),
-                        color_identity=card_data.get("color_identity", []),
-                        set_code=card_data.get("set_code"),
-                        rarity=card_data.get("rarity"),
-                        oracle_text=card_data.get("oracle_text"),
-                        power=card_data.get("power"),
-                        toughness=card_data.get("toughness"),
-                        scryfall_id=card_data.get("scryfall_id"),
-                        image_uri=card_data.get("image_uri"),
-                    )
-                )
+                cards_to_create.append(card_from_scryfall(grp_id, card_data))
             else:
                 name = generate_unknown_card_description(grp_id, inst_data)
                 type_line = build_type_line(inst_data) or None
@@ -594,16 +599,18 @@ def _ensure_cards(
                     unknown_cards_to_log.append((grp_id, context_info, card_deck))
 
         if cards_to_create:
-            Card.objects.bulk_create(cards_to_create, ignore_conflicts=True)
+            Card.objects.bulk_create(
+                cards_to_create, batch_size=settings.IMPORT_BULK_BATCH_SIZE, ignore_conflicts=True
+            )
             logger.debug(f"Created {len(cards_to_create)} new card records")
 
         if unknown_cards_to_log:
+            # The Cards were created above, so each record refers to its card by ID
             unknown_records = []
             for grp_id, context, card_deck in unknown_cards_to_log:
-                card = Card.objects.get(grp_id=grp_id)
                 unknown_records.append(
                     UnknownCard(
-                        card=card,
+                        card_id=grp_id,
                         match=match,
                         deck=card_deck,
                         import_session=import_session,
@@ -611,7 +618,9 @@ def _ensure_cards(
                         is_resolved=False,
                     )
                 )
-            UnknownCard.objects.bulk_create(unknown_records, ignore_conflicts=True)
+            UnknownCard.objects.bulk_create(
+                unknown_records, batch_size=settings.IMPORT_BULK_BATCH_SIZE, ignore_conflicts=True
+            )
             logger.info(f"Logged {len(unknown_records)} unknown cards for manual review")
 
     # ── Upgrade existing bare "Unknown Card (N)" placeholders with better data ──
@@ -633,117 +642,111 @@ def _ensure_cards(
         UnknownCard.objects.filter(card_id=grp_id, is_resolved=False).update(is_resolved=True)
 
     # ── Special objects: tokens/emblems get generated names; others try Scryfall ──
-    for grp_id, inst_data in missing_special.items():
-        obj_type = inst_data.get("type", "")
-        source_grp_id = inst_data.get("source_grp_id")
-
-        if obj_type in _TOKEN_OBJECT_TYPES:
-            name = generate_token_name(inst_data)
-            logger.debug(f"Inserting token grp_id={grp_id} as '{name}'")
-            Card.objects.get_or_create(
-                grp_id=grp_id,
-                defaults={
-                    "name": name,
-                    "is_token": True,
-                    "object_type": obj_type,
-                    "source_grp_id": source_grp_id,
-                },
-            )
-        else:
+    if missing_special:
+        # One Scryfall lookup for every non-token face, plus the front faces of Omens
+        lookup_ids = set()
+        for grp_id, inst_data in missing_special.items():
+            obj_type = inst_data.get("type", "")
+            if obj_type not in _TOKEN_OBJECT_TYPES:
+                lookup_ids.add(grp_id)
+                if obj_type == "GameObjectType_Omen":
+                    lookup_ids.add(grp_id - 1)
+        special_lookup = scryfall.lookup_cards_batch(lookup_ids) if lookup_ids else {}
+
+        special_cards_to_create = []
+        for grp_id, inst_data in missing_special.items():
+            obj_type = inst_data.get("type", "")
+            source_grp_id = inst_data.get("source_grp_id")
+
+            if obj_type in _TOKEN_OBJECT_TYPES:
+                name = generate_token_name(inst_data)
+                logger.debug(f"Inserting token grp_id={grp_id} as '{name}'")
+                special_cards_to_create.append(
+                    Card(
+                        grp_id=grp_id,
+                        name=name,
+                        is_token=True,
+                        object_type=obj_type,
+                        source_grp_id=source_grp_id,
+                    )
+                )
+                continue
+
             # Adventure face, MDFC back, Room half, Omen, etc. — try Scryfall first
-            card_data = scryfall.get_card_by_arena_id(grp_id)
+            card_data = special_lookup.get(grp_id)
             if card_data:
-                Card.objects.get_or_create(
-                    grp_id=grp_id,
-                    defaults={
-                        "name": card_data.get("name"),
-                        "mana_cost": card_data.get("mana_cost"),
-                        "cmc": card_data.get("cmc"),
-                        "type_line": card_data.get("type_line"),
-                        "colors": card_data.get("colors", []),
-                        "color_identity": card_data.get("color_identity", []),
-                        "set_code": card_data.get("set_code"),
-                        "rarity": card_data.get("rarity"),
-                        "oracle_text": card_data.get("oracle_text"),
-                        "power": card_data.get("power"),
-                        "toughness": card_data.get("toughness"),
-                        "scryfall_id": card_data.get("scryfall_id"),
-                        "image_uri": card_data.get("image_uri"),
-                        "object_type": obj_type,
-                    },
-                )
-            else:
-                # For Omen back faces, try the front face (grpId - 1) for the real name.
-                name = None
-                effective_source = source_grp_id
-                if obj_type == "GameObjectType_Omen":
-                    front_data = scryfall.get_card_by_arena_id(grp_id - 1)
-                    if front_data and " // " in (front_data.get("name") or ""):
-                        name = front_data["name"].split(" // ")[1]
-                        effective_source = grp_id - 1
-                if name is None:
-                    label = obj_type.replace("GameObjectType_", "") if obj_type else "Unknown"
-                    name = f"[{label}] ({grp_id})"
-                logger.debug(f"Inserting special object grp_id={grp_id} as '{name}'")
-                Card.objects.get_or_create(
+                special_cards_to_create.append(card_from_scryfall(grp_id, card_data, obj_type))
+                continue
+
+            # For Omen back faces, try the front face (grpId - 1) for the real name.
+            name = None
+            effective_source = source_grp_id
+            if obj_type == "GameObjectType_Omen":
+                front_data = special_lookup.get(grp_id - 1)
+                if front_data and " // " in (front_data.get("name") or ""):
+                    name = front_data["name"].split(" // ")[1]
+                    effective_source = grp_id - 1
+            if name is None:
+                label = obj_type.replace("GameObjectType_", "") if obj_type else "Unknown"
+                name = f"[{label}] ({grp_id})"
+            logger.debug(f"Inserting special object grp_id={grp_id} as '{name}'")
+            special_cards_to_create.append(
+                Card(
                     grp_id=grp_id,
-                    defaults={
-                        "name": name,
-                        "object_type": obj_type,
-                        "source_grp_id": effective_source,
-                    },
+                    name=name,
+                    object_type=obj_type,
+                    source_grp_id=effective_source,
                 )
+            )
+
+        Card.objects.bulk_create(
+            special_cards_to_create,
+            batch_size=settings.IMPORT_BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    return present_ids
 
 
 def _import_actions(match: Match, match_data: MatchData) -> None:
     """Import game actions for a match."""
-    significant_types = {
-        "ActionType_Cast",
-        "ActionType_Play",
-        "ActionType_Attack",
-        "ActionType_Block",
-        "ActionType_Activate",
-        "ActionType_Activate_Mana",
-        "ActionType_Resolution",
-    }
-
-    seen = set()
-    actions_to_create = []
+    # Keyed on (game_state_id, action_type, instance_id); the first entry wins,
+    # matching the CLI importer's INSERT OR IGNORE.
+    actions_by_key: dict[tuple, GameAction] = {}
 
     for action in match_data.actions:
-        key = (
-            action.get("game_state_id"),
-            action.get("action_type"),
-            action.get("instance_id"),
-        )
-
         action_type = action.get("action_type", "")
-        if key in seen or action_type not in significant_types:
+        if action_type not in _SIGNIFICANT_ACTION_TYPES:
+            continue
+
+        key = (action.get("game_state_id"), action_type, action.get("instance_id"))
+        if key in actions_by_key:
             continue
-        seen.add(key)
 
         card_grp_id = action.get("card_grp_id")
 
-        actions_to_create.append(
-            GameAction(
-                match=match,
-                game_state_id=action.get("game_state_id"),
-                turn_number=action.get("turn_number"),
-                phase=action.get("phase"),
-                step=action.get("step"),
-                active_player_seat=action.get("active_player"),
-                seat_id=action.get("seat_id"),
-                action_type=action_type,
-                instance_id=action.get("instance_id"),
-                card_id=card_grp_id,
-                ability_grp_id=action.get("ability_grp_id"),
-                mana_cost=action.get("mana_cost"),
-                timestamp_ms=action.get("timestamp"),
-            )
+        actions_by_key[key] = GameAction(
+            match=match,
+            game_state_id=action.get("game_state_id"),
+            turn_number=action.get("turn_number"),
+            phase=action.get("phase"),
+            step=action.get("step"),
+            active_player_seat=action.get("active_player"),
+            seat_id=action.get("seat_id"),
+            action_type=action_type,
+            instance_id=action.get("instance_id"),
+            card_id=card_grp_id,
+            ability_grp_id=action.get("ability_grp_id"),
+            mana_cost=action.get("mana_cost"),
+            timestamp_ms=action.get("timestamp"),
         )
 
+    actions_to_create = list(actions_by_key.values())
+
     if actions_to_create:
-        GameAction.objects.bulk_create(actions_to_create)
+        GameAction.objects.bulk_create(
+            actions_to_create, batch_size=settings.IMPORT_BULK_BATCH_SIZE
+        )
         logger.debug(f"Created {len(actions_to_create)} game actions")
 
 
@@ -788,24 +791,34 @@ def _import_life_changes(match: Match, match_data: MatchData) -> None:
 
     if changes_to_create:
         try:
-            LifeChange.objects.bulk_create(changes_to_create)
+            LifeChange.objects.bulk_create(
+                changes_to_create, batch_size=settings.IMPORT_BULK_BATCH_SIZE
+            )
             logger.debug(f"Created {len(changes_to_create)} life changes")
         except Exception as e:
             logger.error(f"Error bulk creating life changes: {e}", exc_info=True)
             raise
 
 
-def _import_zone_transfers(match: Match, match_data: MatchData) -> None:
-    """Import zone transfers (card movements) for a match."""
+def _import_zone_transfers(
+    match: Match, match_data: MatchData, present_card_ids: set[int] | frozenset[int] = frozenset()
+) -> None:
+    """Import zone transfers (card movements) for a match.
+
+    ``present_card_ids`` are grpIds already known to be in the cards table,
+    such as those returned by ``_ensure_cards``.
+    """
     # Pre-validate: only reference card_grp_ids that actually exist in the cards table.
     # Skipped object types (Ability, TriggerHolder, RevealedCard) are never inserted,
     # so their grpIds would violate the FK constraint.
     candidate_ids = {
         zt.get("card_grp_id") for zt in match_data.zone_transfers if zt.get("card_grp_id")
     }
-    valid_card_ids = set(
-        Card.objects.filter(grp_id__in=candidate_ids).values_list("grp_id", flat=True)
-    )
+    valid_card_ids = candidate_ids & present_card_ids
+    if unchecked_ids := candidate_ids - valid_card_ids:
+        valid_card_ids.update(
+            Card.objects.filter(grp_id__in=unchecked_ids).values_list("grp_id", flat=True)
+        )
 
     transfers_to_create = []
 
@@ -843,7 +856,9 @@ def _import_zone_transfers(match: Match, match_data: MatchData) -> None:
 
     if transfers_to_create:
         try:
-            ZoneTransfer.objects.bulk_create(transfers_to_create)
+            ZoneTransfer.objects.bulk_create(
+                transfers_to_create, batch_size=settings.IMPORT_BULK_BATCH_SIZE
+            )
             logger.debug(f"Created {len(transfers_to_create)} zone transfers")
         except Exception as e:
             logger.error(f"Error bulk creating zone transfers: {e}", exc_info=True)
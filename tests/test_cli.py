@@ -0,0 +1,37 @@
+"""
+Tests for the standalone command-line interface.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import cli  # noqa: E402
+
+
+class TestHelp:
+    """Tests for building only the subparsers a command line needs."""
+
+    @pytest.mark.parametrize(
+        "argv", [["--help"], ["--help", "stats"], ["-d", "x.db", "-h", "deck"]]
+    )
+    def test_top_level_help_lists_every_command(self, argv, monkeypatch, capsys):
+        """Test that help given before a command still lists all subcommands."""
+        monkeypatch.setattr(sys, "argv", ["mtgas", *argv])
+
+        with pytest.raises(SystemExit):
+            cli.main()
+
+        assert "{" + ",".join(cli._COMMANDS) + "}" in capsys.readouterr().out
+
+    def test_help_after_command_shows_command_help(self, monkeypatch, capsys):
+        """Test that help given after a command is that command's own help."""
+        monkeypatch.setattr(sys, "argv", ["mtgas", "stats", "--help"])
+
+        with pytest.raises(SystemExit):
+            cli.main()
+
+        assert "usage: mtgas stats" in capsys.readouterr().out
@@ -0,0 +1,300 @@
+"""
+Tests for the standalone SQLite database manager used by the CLI.
+"""
+
+import sqlite3
+import sys
+import weakref
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.db.database import SCHEMA_VERSION, DatabaseManager, init_db  # noqa: E402
+
+
+class TestConnectionSettings:
+    """Tests for connection-level PRAGMAs."""
+
+    def test_connection_uses_wal(self, tmp_path):
+        """Test that connections are opened in WAL mode."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+
+        mode = db.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == "wal"
+        db.close()
+
+    def test_connection_pragmas(self, tmp_path):
+        """Test that performance and integrity PRAGMAs are applied."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+
+        assert db.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert db.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert db.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert db.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        assert db.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+        db.close()
+
+
+class TestDatabasePaths:
+    """Tests for database path resolution."""
+
+    def test_creates_missing_parent_directory(self, tmp_path):
+        """Test that the database directory is created when absent."""
+        db_path = tmp_path / "nested" / "dir" / "stats.db"
+
+        db = DatabaseManager(str(db_path))
+
+        assert db.db_path == db_path
+        assert db_path.parent.is_dir()
+
+    def test_default_path(self):
+        """Test that the default path points into the project data directory."""
+        db = DatabaseManager()
+
+        assert db.db_path.name == "mtga_stats.db"
+        assert db.db_path.parent.name == "data"
+
+    def test_discarded_manager_is_not_kept_alive(self, tmp_path):
+        """Test that nothing holds on to a manager once its user drops it."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.execute("SELECT 1")
+        ref = weakref.ref(db)
+
+        del db
+
+        assert ref() is None
+
+
+class TestSchemaInitialization:
+    """Tests for schema creation and versioning."""
+
+    def test_initialize_schema_records_version(self, tmp_path):
+        """Test that schema initialization stamps the schema version."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+
+        db.initialize_schema()
+
+        assert db.schema_version() == SCHEMA_VERSION
+        db.close()
+
+    def test_initialize_schema_skipped_when_current(self, tmp_path, capsys):
+        """Test that an up-to-date database is not re-initialized."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+        capsys.readouterr()
+
+        db.initialize_schema()
+
+        assert capsys.readouterr().out == ""
+        db.close()
+
+    def test_init_db_creates_schema_for_new_file(self, tmp_path):
+        """Test that init_db initializes a database that does not exist yet."""
+        db = init_db(str(tmp_path / "new.db"))
+
+        count = db.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+        assert count == 0
+        db.close()
+
+    def test_init_db_upgrades_outdated_schema(self, tmp_path):
+        """Test that init_db brings an older database up to date."""
+        db_path = tmp_path / "old.db"
+        db = DatabaseManager(str(db_path))
+        db.initialize_schema()
+        db.executemany(
+            "INSERT INTO matches (match_id, result) VALUES (?, ?)",
+            [("m-1", "win"), ("m-2", "loss")],
+        )
+        # Roll back to a version 3 database, which had no match_summary
+        db.get_connection().executescript("""
+            DROP TABLE match_summary;
+            PRAGMA user_version = 3;
+        """)
+        db.close()
+
+        db = init_db(str(db_path))
+
+        assert db.schema_version() == SCHEMA_VERSION
+        assert tuple(db.execute("SELECT total, wins, losses FROM match_summary").fetchone()) == (
+            2,
+            1,
+            1,
+        )
+        db.close()
+
+    def test_match_summary_tracks_matches(self, tmp_path):
+        """Test that match_summary follows inserts, result updates and deletes."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+
+        def summary():
+            return tuple(db.execute("SELECT total, wins, losses FROM match_summary").fetchone())
+
+        db.executemany(
+            "INSERT INTO matches (match_id, result) VALUES (?, ?)",
+            [("m-1", "win"), ("m-2", "loss"), ("m-3", "incomplete"), ("m-4", None)],
+        )
+        assert summary() == (4, 1, 1)
+
+        db.execute("UPDATE matches SET result = 'win' WHERE match_id = 'm-3'")
+        assert summary() == (4, 2, 1)
+
+        db.execute("DELETE FROM matches WHERE match_id = 'm-1'")
+        assert summary() == (3, 1, 1)
+
+        db.execute("UPDATE matches SET result = 'loss' WHERE match_id = 'm-4'")
+        assert summary() == (3, 1, 2)
+        db.close()
+
+    def test_repeated_game_events_are_ignored(self, tmp_path):
+        """Test that the event unique indexes treat NULL key columns as equal."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+        db.execute("INSERT INTO matches (match_id) VALUES ('m-1')")
+
+        db.executemany(
+            "INSERT OR IGNORE INTO zone_transfers (match_id, game_state_id, instance_id, category)"
+            " VALUES (1, ?, ?, ?)",
+            [(5, 10, None), (5, 10, None), (5, 10, "Draw"), (6, 10, None)],
+        )
+
+        assert db.execute("SELECT COUNT(*) FROM zone_transfers").fetchone()[0] == 3
+        db.close()
+
+
+class TestBatchTransactions:
+    """Tests for explicit batch transactions."""
+
+    def _make_db(self, tmp_path):
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+        return db
+
+    def test_batch_commits_on_success(self, tmp_path):
+        """Test that writes inside a batch are committed together."""
+        db = self._make_db(tmp_path)
+
+        with db.batch():
+            db.executemany(
+                "INSERT INTO decks (deck_id, name) VALUES (?, ?)",
+                [("d-1", "Deck 1"), ("d-2", "Deck 2")],
+            )
+
+        assert not db.get_connection().in_transaction
+        assert db.execute("SELECT COUNT(*) FROM decks").fetchone()[0] == 2
+        db.close()
+
+    def test_batch_rolls_back_on_error(self, tmp_path):
+        """Test that a failing batch leaves no partial writes behind."""
+        db = self._make_db(tmp_path)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            with db.batch():
+                db.executemany(
+                    "INSERT INTO decks (deck_id, name) VALUES (?, ?)",
+                    [("d-1", "Deck 1"), ("d-1", "Duplicate")],
+                )
+
+        assert db.execute("SELECT COUNT(*) FROM decks").fetchone()[0] == 0
+        db.close()
+
+    def test_nested_batch_raises_and_outer_rolls_back(self, tmp_path):
+        """Test that a batch inside an open transaction is refused, not committed early."""
+        db = self._make_db(tmp_path)
+
+        with pytest.raises(RuntimeError):
+            with db.batch():
+                db.execute("INSERT INTO decks (deck_id, name) VALUES ('a', 'Deck A')")
+                with db.batch():
+                    pass
+
+        assert db.execute("SELECT COUNT(*) FROM decks").fetchone()[0] == 0
+        db.close()
+
+    def test_batch_refuses_pending_implicit_transaction(self, tmp_path):
+        """Test that uncommitted writes are not silently committed by a batch."""
+        db = self._make_db(tmp_path)
+        db.execute("INSERT INTO decks (deck_id, name) VALUES ('a', 'Deck A')")
+
+        with pytest.raises(RuntimeError):
+            with db.batch():
+                pass
+
+        db.get_connection().rollback()
+        assert db.execute("SELECT COUNT(*) FROM decks").fetchone()[0] == 0
+        db.close()
+
+    def test_savepoint_rolls_back_only_its_block(self, tmp_path):
+        """Test that a failing savepoint keeps earlier writes in the batch."""
+        db = self._make_db(tmp_path)
+
+        with db.batch():
+            db.execute("INSERT INTO decks (deck_id, name) VALUES ('d-1', 'Deck 1')")
+            with pytest.raises(sqlite3.IntegrityError):
+                with db.savepoint():
+                    db.execute("INSERT INTO decks (deck_id, name) VALUES ('d-2', 'Deck 2')")
+                    db.execute("INSERT INTO decks (deck_id, name) VALUES ('d-2', 'Again')")
+
+        rows = db.execute("SELECT deck_id FROM decks").fetchall()
+        assert [row["deck_id"] for row in rows] == ["d-1"]
+        db.close()
+
+    def test_deck_names_indexed_for_search(self, tmp_path):
+        """Test that decks_fts stays in sync with the decks table."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+
+        db.execute("INSERT INTO decks (deck_id, name) VALUES ('d-1', 'Mono Red Aggro')")
+        db.execute("UPDATE decks SET name = 'Boros Aggro' WHERE deck_id = 'd-1'")
+
+        def search(query):
+            return db.execute(
+                "SELECT rowid FROM decks_fts WHERE decks_fts MATCH ?", (query,)
+            ).fetchall()
+
+        assert len(search('"boro"*')) == 1
+        assert search('"mono"*') == []
+        db.close()
+
+    def test_context_manager_keeps_connection_open(self, tmp_path):
+        """Test that leaving a with block commits without closing the connection."""
+        db = self._make_db(tmp_path)
+
+        with db:
+            conn = db.get_connection()
+            db.execute("INSERT INTO decks (deck_id, name) VALUES ('d-1', 'Deck 1')")
+
+        assert db.get_connection() is conn
+        assert not conn.in_transaction
+        db.close()
+
+    def test_context_manager_rolls_back_on_error(self, tmp_path):
+        """Test that an exception inside a with block discards its writes."""
+        db = self._make_db(tmp_path)
+
+        with pytest.raises(RuntimeError):
+            with db:
+                db.execute("INSERT INTO decks (deck_id, name) VALUES ('d-1', 'Deck 1')")
+                raise RuntimeError("boom")
+
+        assert db.execute("SELECT COUNT(*) FROM decks").fetchone()[0] == 0
+        db.close()
+
+
+class TestQueryHelpers:
+    """Tests for query helper methods."""
+
+    def test_execute_tuples_returns_plain_tuples(self, tmp_path):
+        """Test that execute_tuples bypasses the Row factory."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+
+        row = db.execute_tuples("SELECT 1, 'a'").fetchone()
+
+        assert type(row) is tuple
+        assert row == (1, "a")
+        assert isinstance(db.execute("SELECT 1").fetchone(), sqlite3.Row)
+        db.close()
@@ -0,0 +1,249 @@
+"""
+Tests for the CLI data import service.
+
+Tests storing parsed log matches in the standalone SQLite database.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.db.database import DatabaseManager  # noqa: E402
+from src.parser.log_parser import MatchData  # noqa: E402
+from src.services import import_service  # noqa: E402
+from src.services.import_service import DataImportService  # noqa: E402
+from src.services.scryfall import ScryfallBulkService  # noqa: E402
+
+TWO_MATCH_LOG = """[UnityCrossThreadLogger]MTGA client
+{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"match-1","reservedPlayers":[{"playerName":"P1","systemSeatId":2,"eventId":"Ladder"},{"playerName":"O1","systemSeatId":1,"eventId":"Ladder"}]}}}}
+{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_MatchCompleted","gameRoomConfig":{"matchId":"match-1"},"finalMatchResult":{"resultList":[{"scope":"MatchScope_Match","winningTeamId":2,"reason":"ResultReason_Game"}]}}}}
+{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"match-2","reservedPlayers":[{"playerName":"P1","systemSeatId":2,"eventId":"Ladder"},{"playerName":"O2","systemSeatId":1,"eventId":"Ladder"}]}}}}
+{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_MatchCompleted","gameRoomConfig":{"matchId":"match-2"},"finalMatchResult":{"resultList":[{"scope":"MatchScope_Match","winningTeamId":1,"reason":"ResultReason_Game"}]}}}}
+"""
+
+
+class TestImportLogFile:
+    """Tests for importing a whole log file."""
+
+    def _make_service(self, tmp_path):
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+        return DataImportService(db, ScryfallBulkService(str(tmp_path / "cache")))
+
+    def _write_log(self, tmp_path):
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(TWO_MATCH_LOG)
+        return str(log_file)
+
+    def test_imports_all_matches(self, tmp_path):
+        """Test that every match in the log is stored with its result."""
+        service = self._make_service(tmp_path)
+
+        count = service.import_log_file(self._write_log(tmp_path))
+
+        rows = service.db.execute("SELECT match_id, result FROM matches ORDER BY match_id")
+        assert count == 2
+        assert [tuple(row) for row in rows] == [("match-1", "win"), ("match-2", "loss")]
+        service.db.close()
+
+    def test_skips_existing_matches(self, tmp_path):
+        """Test that re-importing the same log adds nothing."""
+        service = self._make_service(tmp_path)
+        log_path = self._write_log(tmp_path)
+        service.import_log_file(log_path)
+
+        count = service.import_log_file(log_path)
+
+        assert count == 0
+        assert service.db.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 2
+        service.db.close()
+
+    def test_failed_match_is_rolled_back_alone(self, tmp_path, monkeypatch):
+        """Test that a match failing mid-import leaves no rows while others commit."""
+        service = self._make_service(tmp_path)
+        real_import_actions = service._import_actions
+
+        def failing_import_actions(match_db_id, match):
+            if match.match_id == "match-1":
+                raise RuntimeError("boom")
+            real_import_actions(match_db_id, match)
+
+        monkeypatch.setattr(service, "_import_actions", failing_import_actions)
+
+        count = service.import_log_file(self._write_log(tmp_path))
+
+        rows = service.db.execute("SELECT match_id FROM matches").fetchall()
+        assert count == 1
+        assert [row["match_id"] for row in rows] == ["match-2"]
+        assert not service.db.get_connection().in_transaction
+        service.db.close()
+
+    def test_deferred_indexes_rebuilt_after_import(self, tmp_path, monkeypatch):
+        """Test that indexes dropped for a bulk import exist again afterwards."""
+        monkeypatch.setattr(import_service, "_DEFER_INDEXES_AFTER", 1)
+        service = self._make_service(tmp_path)
+
+        def index_names():
+            rows = service.db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'game_actions'"
+            )
+            return sorted(row["name"] for row in rows)
+
+        before = index_names()
+
+        count = service.import_log_file(self._write_log(tmp_path))
+
+        assert count == 2
+        assert index_names() == before
+        service.db.close()
+
+    def test_indexes_kept_for_import_smaller_than_history(self, tmp_path, monkeypatch):
+        """Test that a small import into a larger database never drops the indexes."""
+        monkeypatch.setattr(import_service, "_DEFER_INDEXES_AFTER", 1)
+        service = self._make_service(tmp_path)
+        service.db.executemany(
+            "INSERT INTO matches (match_id) VALUES (?)", [(f"old-{i}",) for i in range(5)]
+        )
+        service.db.commit()
+        dropped = []
+        monkeypatch.setattr(service, "_drop_secondary_indexes", lambda: dropped.append(True) or [])
+
+        count = service.import_log_file(self._write_log(tmp_path))
+
+        assert count == 2
+        assert dropped == []
+
+    def test_imports_several_logs(self, tmp_path):
+        """Test that matches from every log file are stored, in log order."""
+        service = self._make_service(tmp_path)
+        first = self._write_log(tmp_path)
+        second = tmp_path / "Player-prev.log"
+        second.write_text(TWO_MATCH_LOG.replace("match-", "prev-"))
+
+        count = service.import_log_files([first, str(second)])
+
+        rows = service.db.execute("SELECT match_id FROM matches ORDER BY id")
+        assert count == 4
+        assert [row["match_id"] for row in rows] == ["match-1", "match-2", "prev-1", "prev-2"]
+        service.db.close()
+
+
+class _RecordingScryfall:
+    """Scryfall stand-in that records batch lookups."""
+
+    def __init__(self, cards):
+        self.cards = cards
+        self.batches = []
+
+    def lookup_cards_batch(self, arena_ids):
+        self.batches.append(set(arena_ids))
+        return {aid: self.cards.get(aid) for aid in arena_ids}
+
+
+class TestEnsureCards:
+    """Tests for resolving referenced cards against Scryfall."""
+
+    def test_cards_resolved_with_one_batch_lookup(self, tmp_path):
+        """Test that real cards, special objects and Omen fronts share one lookup."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+        scryfall = _RecordingScryfall(
+            {
+                100: {"name": "Real Card", "colors": [], "color_identity": []},
+                199: {"name": "Front // Omen Back"},
+            }
+        )
+        service = DataImportService(db, scryfall)
+
+        service._ensure_cards(
+            {100: {}, 101: {}},
+            {200: {"type": "GameObjectType_Omen"}},
+        )
+
+        names = dict(db.execute("SELECT grp_id, name FROM cards").fetchall())
+        assert scryfall.batches == [{100, 101, 200, 199}]
+        assert names[100] == "Real Card"
+        assert names[101] == "Unknown Card (101)"
+        assert names[200] == "Omen Back"
+        db.close()
+
+    def test_special_objects_keep_their_object_metadata(self, tmp_path):
+        """Test that tokens, faces and placeholders get their type-specific columns."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+        scryfall = _RecordingScryfall(
+            {
+                100: {"name": "Real Card", "colors": [], "color_identity": []},
+                300: {"name": "Adventure Face", "colors": [], "color_identity": []},
+            }
+        )
+        service = DataImportService(db, scryfall)
+
+        service._ensure_cards(
+            {100: {}},
+            {
+                200: {"type": "GameObjectType_Emblem", "source_grp_id": 100},
+                300: {"type": "GameObjectType_Adventure"},
+                400: {"type": "GameObjectType_MDFCBack", "source_grp_id": 100},
+            },
+        )
+
+        rows = {
+            row["grp_id"]: tuple(row)[1:]
+            for row in db.execute(
+                "SELECT grp_id, name, is_token, object_type, source_grp_id FROM cards"
+            )
+        }
+        assert rows == {
+            100: ("Real Card", 0, None, None),
+            200: ("Emblem", 1, "GameObjectType_Emblem", 100),
+            300: ("Adventure Face", 0, "GameObjectType_Adventure", None),
+            400: ("[MDFCBack] (400)", 0, "GameObjectType_MDFCBack", 100),
+        }
+        db.close()
+
+    def test_probe_handles_more_ids_than_bound_variables(self, tmp_path):
+        """Test that the existing-card probe is not limited by SQLite's variable count."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+        scryfall = _RecordingScryfall({})
+        service = DataImportService(db, scryfall)
+        real_cards = {grp_id: {} for grp_id in range(1, 40001)}
+
+        service._ensure_cards(real_cards, {})
+        service._ensure_cards(real_cards, {})
+
+        assert db.execute("SELECT COUNT(*) FROM cards").fetchone()[0] == 40000
+        assert len(scryfall.batches) == 1
+        db.close()
+
+    def test_cards_from_rolled_back_match_are_written_again(self, tmp_path, monkeypatch):
+        """Test that a failed match's cards are not treated as known by later matches."""
+        db = DatabaseManager(str(tmp_path / "stats.db"))
+        db.initialize_schema()
+        scryfall = _RecordingScryfall({500: {"name": "Shock", "colors": [], "color_identity": []}})
+        service = DataImportService(db, scryfall)
+        deck_cards = [{"cardId": 500, "quantity": 4}]
+        matches = [
+            MatchData(match_id="m-1", deck_cards=deck_cards),
+            MatchData(match_id="m-2", deck_cards=deck_cards),
+            MatchData(match_id="m-3", deck_cards=deck_cards),
+        ]
+        real_import_actions = service._import_actions
+
+        def failing_import_actions(match_db_id, match):
+            if match.match_id == "m-1":
+                raise RuntimeError("boom")
+            real_import_actions(match_db_id, match)
+
+        monkeypatch.setattr(service, "_import_actions", failing_import_actions)
+
+        count = service._store_matches(iter(matches), skip_existing=True)
+
+        assert count == 2
+        assert db.execute("SELECT name FROM cards WHERE grp_id = 500").fetchone()[0] == "Shock"
+        # m-1's lookup was rolled back and repeated by m-2; m-3 found the card known
+        assert len(scryfall.batches) == 2
+        assert service._known_card_ids == set()
+        db.close()
@@ -0,0 +1,306 @@
+"""
+Tests for the Django import path.
+
+Tests storing cards referenced by parsed matches through the web import view.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class _RecordingScryfall:
+    """Scryfall stand-in that records batch lookups."""
+
+    def __init__(self, cards):
+        self.cards = cards
+        self.batches = []
+
+    def lookup_cards_batch(self, arena_ids):
+        self.batches.append(set(arena_ids))
+        return {aid: self.cards.get(aid) for aid in arena_ids}
+
+
+@pytest.fixture
+def import_session(db):
+    from stats.models import ImportSession
+
+    return ImportSession.objects.create(log_file="Player.log", status="running")
+
+
+@pytest.mark.django_db
+class TestEnsureCards:
+    """Tests for creating Card rows for a match's cards and game objects."""
+
+    def test_special_objects_created_with_one_lookup(self, import_session):
+        """Test that tokens, faces and Omen backs are resolved from one batch lookup."""
+        from stats.models import Card
+        from stats.views.imports import _ensure_cards
+
+        scryfall = _RecordingScryfall(
+            {
+                300: {"name": "Adventure Face", "colors": [], "color_identity": []},
+                499: {"name": "Front // Omen Back"},
+            }
+        )
+
+        _ensure_cards(
+            {},
+            {
+                200: {"type": "GameObjectType_Emblem", "source_grp_id": 100},
+                300: {"type": "GameObjectType_Adventure"},
+                400: {"type": "GameObjectType_MDFCBack", "source_grp_id": 100},
+                500: {"type": "GameObjectType_Omen"},
+            },
+            scryfall,
+            import_session,
+        )
+
+        rows = {
+            row[0]: row[1:]
+            for row in Card.objects.values_list(
+                "grp_id", "name", "is_token", "object_type", "source_grp_id"
+            )
+        }
+        assert scryfall.batches == [{300, 400, 500, 499}]
+        assert rows == {
+            200: ("Emblem", True, "GameObjectType_Emblem", 100),
+            300: ("Adventure Face", False, "GameObjectType_Adventure", None),
+            400: ("[MDFCBack] (400)", False, "GameObjectType_MDFCBack", 100),
+            500: ("Omen Back", False, "GameObjectType_Omen", 499),
+        }
+
+    def test_existing_special_objects_left_alone(self, import_session):
+        """Test that an already stored object is neither looked up nor overwritten."""
+        from stats.models import Card
+        from stats.views.imports import _ensure_cards
+
+        Card.objects.create(grp_id=300, name="Known Face")
+        scryfall = _RecordingScryfall({})
+
+        _ensure_cards({}, {300: {"type": "GameObjectType_Adventure"}}, scryfall, import_session)
+
+        assert scryfall.batches == []
+        assert Card.objects.get(grp_id=300).name == "Known Face"
+
+    def test_unknown_cards_logged_without_refetching_cards(self, import_session):
+        """Test that unknown cards are recorded without a query per card."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from stats.models import UnknownCard
+        from stats.views.imports import _ensure_cards
+
+        scryfall = _RecordingScryfall({})
+
+        with CaptureQueriesContext(connection) as ctx:
+            _ensure_cards({700: {}, 701: {}}, {}, scryfall, import_session)
+
+        card_selects = [
+            q["sql"] for q in ctx.captured_queries if q["sql"].startswith('SELECT "cards"')
+        ]
+        assert len(card_selects) == 1  # the existing-card probe
+        assert sorted(UnknownCard.objects.values_list("card__name", flat=True)) == [
+            "Unknown Card (700)",
+            "Unknown Card (701)",
+        ]
+
+    def test_prefetched_cards_skip_per_match_work(self, import_session):
+        """Test that a session prefetch leaves matches nothing to query or look up."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from src.parser.log_parser import MatchData
+        from stats.card_import import prefetch_cards
+        from stats.models import Card
+        from stats.views.imports import _ensure_cards
+
+        Card.objects.create(grp_id=100, name="Opt")
+        Card.objects.create(grp_id=101, name="Unknown Card (101)")
+        scryfall = _RecordingScryfall({102: {"name": "Shock"}})
+        matches = [
+            MatchData(match_id="m-1", deck_cards=[{"cardId": 100}, {"cardId": 101}]),
+            MatchData(match_id="m-2", deck_cards=[{"cardId": 100}, {"cardId": 102}]),
+        ]
+
+        known_card_ids, card_lookup = prefetch_cards(matches, scryfall)
+
+        assert known_card_ids == {100}
+        assert scryfall.batches == [{101, 102}]
+        with CaptureQueriesContext(connection) as ctx:
+            _ensure_cards({100: {}}, {}, scryfall, import_session, known_card_ids=known_card_ids)
+        assert ctx.captured_queries == []
+
+        _ensure_cards(
+            {100: {}, 102: {}},
+            {},
+            scryfall,
+            import_session,
+            known_card_ids=known_card_ids,
+            card_lookup=card_lookup,
+        )
+        assert len(scryfall.batches) == 1
+        assert Card.objects.get(grp_id=102).name == "Shock"
+
+
+class TestCollectCardIds:
+    """Tests for the card IDs both importers gather from a match."""
+
+    def test_sideboard_cards_are_real_cards(self):
+        """Test that sideboard-only cards are collected alongside the mainboard."""
+        from src.parser.log_parser import MatchData
+        from stats.card_import import collect_card_ids
+
+        match_data = MatchData(
+            match_id="m-1",
+            deck_cards=[{"cardId": 100, "quantity": 4}],
+            deck_sideboard=[{"cardId": 101, "quantity": 2}],
+        )
+
+        real_cards, special_objects = collect_card_ids(match_data)
+
+        assert real_cards == {100: {}, 101: {}}
+        assert special_objects == {}
+
+
+@pytest.mark.django_db
+class TestEnsureDeckSnapshot:
+    """Tests for recording a match's deck list."""
+
+    def test_new_snapshot_holds_mainboard_and_sideboard(self, import_session):
+        """Test that a new deck list is stored with its quantities and sections."""
+        from src.parser.log_parser import MatchData
+        from stats.models import Deck, Match
+        from stats.views.imports import _ensure_deck_snapshot
+
+        deck = Deck.objects.create(deck_id="d-1", name="Izzet")
+        match = Match.objects.create(match_id="m-1", deck=deck)
+        match_data = MatchData(
+            match_id="m-1",
+            deck_cards=[{"cardId": 100, "quantity": 4}, {"cardId": 101, "quantity": 2}],
+            deck_sideboard=[{"cardId": 100, "quantity": 1}],
+        )
+        scryfall = _RecordingScryfall({100: {"name": "Opt"}, 101: {"name": "Shock"}})
+
+        snapshot = _ensure_deck_snapshot(match_data, deck, match, scryfall, import_session)
+
+        assert set(snapshot.cards.values_list("card_id", "quantity", "is_sideboard")) == {
+            (100, 4, False),
+            (101, 2, False),
+            (100, 1, True),
+        }
+        assert Match.objects.get(pk=match.pk).snapshot == snapshot
+
+
+@pytest.mark.django_db
+class TestProcessUploadedFile:
+    """Tests for importing an uploaded log file."""
+
+    def test_already_imported_matches_are_skipped(self):
+        """Test that only matches missing from the database are imported."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from stats.models import Match
+        from stats.views.imports import _process_uploaded_file
+        from tests.test_import_service import TWO_MATCH_LOG
+
+        Match.objects.create(match_id="match-1")
+        Match.objects.create(match_id="older-match")
+        upload = SimpleUploadedFile("Player.log", TWO_MATCH_LOG.encode())
+
+        result = _process_uploaded_file(upload, False, _RecordingScryfall({}))
+
+        assert result == (1, 1, 0)
+        assert Match.objects.filter(match_id="match-2").exists()
+
+    def test_failed_match_is_rolled_back_alone(self, monkeypatch):
+        """Test that a match failing mid-import leaves no rows while others commit."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from stats.models import ImportSession, Match
+        from stats.views import imports
+        from tests.test_import_service import TWO_MATCH_LOG
+
+        real_import_actions = imports._import_actions
+
+        def failing_import_actions(match, match_data):
+            if match_data.match_id == "match-1":
+                raise RuntimeError("boom")
+            real_import_actions(match, match_data)
+
+        monkeypatch.setattr(imports, "_import_actions", failing_import_actions)
+        upload = SimpleUploadedFile("Player.log", TWO_MATCH_LOG.encode())
+
+        result = imports._process_uploaded_file(upload, False, _RecordingScryfall({}))
+
+        assert result == (1, 0, 1)
+        assert list(Match.objects.values_list("match_id", flat=True)) == ["match-2"]
+        assert ImportSession.objects.get().status == "completed_with_errors"
+
+
+@pytest.mark.django_db
+class TestImportZoneTransfers:
+    """Tests for storing card movements."""
+
+    def test_ensured_cards_are_not_checked_again(self):
+        """Test that only grpIds not just ensured are checked against the cards table."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from src.parser.log_parser import MatchData
+        from stats.models import Card, Match, ZoneTransfer
+        from stats.views.imports import _import_zone_transfers
+
+        Card.objects.create(grp_id=100, name="Opt")
+        match = Match.objects.create(match_id="m-1")
+        transfer = {"game_state_id": 5, "from_zone": 31, "to_zone": 35}
+        match_data = MatchData(
+            match_id="m-1",
+            zone_transfers=[
+                {**transfer, "instance_id": 1, "card_grp_id": 100},
+                {**transfer, "instance_id": 2, "card_grp_id": 9999},
+            ],
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            _import_zone_transfers(match, match_data, {100})
+
+        card_queries = [q["sql"] for q in ctx.captured_queries if 'FROM "cards"' in q["sql"]]
+        assert len(card_queries) == 1
+        assert "9999" in card_queries[0] and "100" not in card_queries[0]
+        assert dict(ZoneTransfer.objects.values_list("instance_id", "card_id")) == {
+            1: 100,
+            2: None,
+        }
+
+
+@pytest.mark.django_db
+class TestImportActions:
+    """Tests for storing game actions."""
+
+    def test_duplicate_actions_keep_first_entry(self):
+        """Test that repeated actions are stored once, from their first occurrence."""
+        from src.parser.log_parser import MatchData
+        from stats.models import GameAction, Match
+        from stats.views.imports import _import_actions
+
+        match = Match.objects.create(match_id="m-1")
+        cast = {"game_state_id": 5, "action_type": "ActionType_Cast", "instance_id": 1}
+        match_data = MatchData(
+            match_id="m-1",
+            actions=[
+                {**cast, "timestamp": 100},
+                {**cast, "timestamp": 200},
+                {**cast, "action_type": "ActionType_Pass"},
+                {**cast, "instance_id": 2, "timestamp": 300},
+            ],
+        )
+
+        _import_actions(match, match_data)
+
+        assert list(
+            GameAction.objects.order_by("id").values_list("instance_id", "timestamp_ms")
+        ) == [(1, 100), (2, 300)]
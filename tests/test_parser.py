@@ -6,14 +6,27 @@ and proper parsing of match data, deck info, and game actions.
 """
 
 import json
+import logging
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.parser.log_parser import MatchData, MTGALogParser  # noqa: E402
+from src.parser import log_parser  # noqa: E402
+from src.parser.log_parser import (  # noqa: E402
+    EVENT_BATCH_SIZE,
+    LOGGED_PARSE_ERRORS,
+    LifeChangeLog,
+    MatchData,
+    MTGALogParser,
+    _parse_log_timestamp,
+    _scan_json_depth,
+)
+from src.services.import_service import generate_token_name  # noqa: E402
 
 
 class TestMatchDataClass:
@@ -46,6 +59,29 @@ class TestMatchDataClass:
         assert match.event_id == "Ladder"
 
 
+class TestLifeChangeLog:
+    """Tests for the column-wise life change store."""
+
+    def test_iterates_as_dicts(self):
+        """Test that stored rows come back as the dicts importers expect."""
+        log = LifeChangeLog()
+        log.append(5, 2, 1, 18)
+        log.extend([(6, 2, 2, 17)])
+
+        assert len(log) == 2
+        assert list(log) == [
+            {"game_state_id": 5, "turn_number": 2, "seat_id": 1, "life_total": 18},
+            {"game_state_id": 6, "turn_number": 2, "seat_id": 2, "life_total": 17},
+        ]
+
+    def test_new_match_has_no_life_changes(self):
+        """Test that a new MatchData starts with an empty life change log."""
+        match = MatchData(match_id="test-123")
+
+        assert len(match.life_changes) == 0
+        assert match.life_changes == LifeChangeLog()
+
+
 class TestLogParserInitialization:
     """Tests for parser initialization and file handling."""
 
@@ -97,6 +133,33 @@ class TestLogParserEventExtraction:
         gre_events = [e for e in events if e.event_type == "gre_event"]
         assert len(gre_events) == 1
 
+    def test_parse_json_after_log_prefix(self, tmp_path):
+        """Test that JSON trailing a log prefix is extracted from the first brace."""
+        log_content = """[UnityCrossThreadLogger]==> Event {"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"gameRoomConfig":{"matchId":"m-1"}}}}
+"""
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(log_content)
+
+        parser = MTGALogParser(str(log_file))
+        events = list(parser.parse_events())
+
+        assert len(events) == 1
+        assert events[0].event_type == "match_state"
+
+    def test_deck_request_events_classified_from_request_field(self, tmp_path):
+        """Test that deck requests are recognised from their request payload."""
+        log_content = """{"id":"1","request":"{\\"Method\\":\\"DeckUpsertDeckV2\\"}"}
+{"id":"2","request":"{\\"Method\\":\\"EventSetDeckV2\\"}"}
+{"id":"3","request":"{\\"Method\\":\\"Other\\"}"}
+"""
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(log_content)
+
+        parser = MTGALogParser(str(log_file))
+        events = list(parser.parse_events())
+
+        assert [e.event_type for e in events] == ["deck_upsert", "deck_set"]
+
     def test_parse_empty_file(self, tmp_path):
         """Test parsing empty log file raises exception."""
         from src.exceptions import InvalidLogFormatError
@@ -125,6 +188,97 @@ More text here
         assert len(events) == 1
 
 
+class TestJsonDepthScan:
+    """Tests for tracking brace depth across multi-line JSON."""
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            (b'{"a": {', (2, False)),
+            (b'{"braces": "{{}", "b": 1}', (0, False)),
+            (b'{"quote": "say \\"hi\\" {", "c": {', (2, False)),
+            (b'{"open": "no end {', (1, True)),
+        ],
+    )
+    def test_scan_from_start(self, text, expected):
+        """Test that braces inside string literals are not counted."""
+        assert _scan_json_depth(text, 0, False) == expected
+
+    def test_scan_continues_open_string(self):
+        """Test that a string left open on the previous line is closed first."""
+        assert _scan_json_depth(b'still text } " }', 1, True) == (0, False)
+
+
+class TestTimestampParsing:
+    """Tests for log timestamp parsing."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "1/15/2026 10:30:00 AM",
+            "12/31/2025 12:05:09 AM",
+            "2/3/2026 12:00:00 PM",
+            "7/4/2026 11:59:59 PM",
+        ],
+    )
+    def test_matches_strptime(self, text):
+        """Test that hand parsing agrees with strptime, including 12 AM/PM."""
+        expected = datetime.strptime(text, "%m/%d/%Y %I:%M:%S %p").replace(tzinfo=timezone.utc)
+
+        assert _parse_log_timestamp(text) == expected
+
+    @pytest.mark.parametrize("text", ["13/01/2026 10:30:00 AM", "1/15/2026 13:30:00 PM"])
+    def test_rejects_invalid_timestamps(self, text):
+        """Test that out-of-range fields raise ValueError like strptime."""
+        with pytest.raises(ValueError):
+            _parse_log_timestamp(text)
+
+    def test_events_carry_preceding_log_timestamp(self, tmp_path):
+        """Test that each event records the timestamp line read before it."""
+        event = '{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{}}}'
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(
+            f"{event}\n"
+            "[UnityCrossThreadLogger]1/15/2026 10:30:00 PM\n"
+            f"{event}\n"
+            "[UnityCrossThreadLogger]1/15/2026 10:45:00 PM\n"
+            f"{event}\n"
+        )
+
+        parser = MTGALogParser(str(log_file))
+        stamps = [e.log_timestamp for e in parser.parse_events()]
+
+        assert stamps == [
+            None,
+            datetime(2026, 1, 15, 22, 30, tzinfo=timezone.utc),
+            datetime(2026, 1, 15, 22, 45, tzinfo=timezone.utc),
+        ]
+
+    def test_match_start_uses_its_own_log_timestamp(self, tmp_path):
+        """Test that a match without an event timestamp starts at its log line's time."""
+        start = (
+            '{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":'
+            '"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"%s"}}}}\n'
+        )
+        # Enough later events that the reader thread runs well past the first match
+        filler = '{"greToClientEvent":{"greToClientMessages":[]}}\n' * (EVENT_BATCH_SIZE * 8)
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(
+            "[UnityCrossThreadLogger]1/15/2026 10:30:00 PM\n"
+            + start % "match-1"
+            + "[UnityCrossThreadLogger]1/15/2026 11:30:00 PM\n"
+            + filler
+            + start % "match-2"
+        )
+
+        matches = MTGALogParser(str(log_file)).parse_matches()
+
+        assert [m.start_time for m in matches] == [
+            datetime(2026, 1, 15, 22, 30, tzinfo=timezone.utc),
+            datetime(2026, 1, 15, 23, 30, tzinfo=timezone.utc),
+        ]
+
+
 class TestMatchParsing:
     """Tests for full match parsing."""
 
@@ -167,6 +321,35 @@ class TestMatchParsing:
         assert matches[0].match_id == "match-1"
         assert matches[1].match_id == "match-2"
 
+    def test_iter_matches_yields_each_match_once_complete(self, tmp_path):
+        """Test that a match is yielded before the rest of the log is parsed."""
+        log_content = """{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"match-1","reservedPlayers":[{"playerName":"P1","systemSeatId":2},{"playerName":"O1","systemSeatId":1}]}}}}
+{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"match-2","reservedPlayers":[{"playerName":"P1","systemSeatId":2},{"playerName":"O2","systemSeatId":1}]}}}}
+"""
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(log_content)
+
+        parser = MTGALogParser(str(log_file))
+        matches = parser.iter_matches()
+
+        assert next(matches).match_id == "match-1"
+        assert parser.current_match.match_id == "match-2"
+        assert next(matches).match_id == "match-2"
+        assert [m.match_id for m in parser.completed_matches] == ["match-1", "match-2"]
+
+    def test_iter_matches_closed_early_stops_reader(self, tmp_path):
+        """Test that abandoning iter_matches shuts down the event reader thread."""
+        line = '{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"gameRoomConfig":{"matchId":"m-%d"}}}}\n'
+        log_file = tmp_path / "Player.log"
+        log_file.write_text("".join(line % i for i in range(EVENT_BATCH_SIZE * 10)))
+
+        parser = MTGALogParser(str(log_file))
+        matches = parser.iter_matches()
+        assert next(matches).match_id == "m-0"
+        matches.close()
+
+        assert not any(t.name == "mtga-log-reader" for t in threading.enumerate())
+
     def test_parse_incomplete_match(self, tmp_path):
         """Test parsing match that doesn't have completion event."""
         log_content = """{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"incomplete-match","reservedPlayers":[{"playerName":"Player","systemSeatId":2}]}}}}
@@ -221,6 +404,77 @@ class TestGameActionParsing:
 
         assert matches[0].total_turns == 10
 
+    def test_non_int_life_total_keeps_game_state(self, tmp_path):
+        """Test that a float or malformed life total does not drop the rest of the message."""
+        players = (
+            '[{"systemSeatNumber":1,"lifeTotal":20.0},' '{"systemSeatNumber":2,"lifeTotal":"n/a"}]'
+        )
+        log_content = (
+            '{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":'
+            '"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"m-1"}}}}\n'
+            '{"greToClientEvent":{"greToClientMessages":[{"type":'
+            '"GREMessageType_GameStateMessage","gameStateMessage":{"gameStateId":1,'
+            '"turnInfo":{"turnNumber":2},"players":' + players + ","
+            '"gameObjects":[{"instanceId":10,"grpId":1000,"type":"GameObjectType_Card"}]}}]}}\n'
+        )
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(log_content)
+
+        parser = MTGALogParser(str(log_file))
+        match = parser.parse_matches()[0]
+
+        assert parser.get_parse_errors() == []
+        assert list(match.life_changes.rows()) == [(1, 2, 1, 20)]
+        assert 10 in match.card_instances
+
+
+class TestDetailLevels:
+    """Tests for limiting how much game state is extracted."""
+
+    LOG = """{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"m-1","reservedPlayers":[{"playerName":"P1","systemSeatId":2},{"playerName":"O1","systemSeatId":1}]}}}}
+{"greToClientEvent":{"greToClientMessages":[{"type":"GREMessageType_GameStateMessage","gameStateMessage":{"gameStateId":1,"turnInfo":{"turnNumber":3},"gameInfo":{"superFormat":"SuperFormat_Standard"},"players":[{"systemSeatNumber":1,"lifeTotal":20}],"gameObjects":[{"instanceId":10,"grpId":1000,"type":"GameObjectType_Card"}],"actions":[{"seatId":1,"action":{"actionType":"ActionType_Cast","instanceId":10}}]}}]}}
+"""
+
+    def _parse(self, tmp_path, detail_level):
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(self.LOG)
+        return MTGALogParser(str(log_file), detail_level=detail_level).parse_matches()[0]
+
+    def test_full_extracts_everything(self, tmp_path):
+        """Test that the default level keeps cards, actions and life totals."""
+        match = self._parse(tmp_path, "full")
+
+        assert len(match.life_changes) == 1
+        assert 10 in match.card_instances
+        assert len(match.actions) == 1
+
+    def test_life_only_skips_cards_and_actions(self, tmp_path):
+        """Test that life_only keeps turns, format and life totals only."""
+        match = self._parse(tmp_path, "life_only")
+
+        assert match.total_turns == 3
+        assert match.format == "SuperFormat_Standard"
+        assert len(match.life_changes) == 1
+        assert match.card_instances == {}
+        assert match.actions == []
+
+    def test_match_only_skips_life_totals(self, tmp_path):
+        """Test that match_only keeps match-level fields only."""
+        match = self._parse(tmp_path, "match_only")
+
+        assert match.total_turns == 3
+        assert match.format == "SuperFormat_Standard"
+        assert len(match.life_changes) == 0
+        assert match.actions == []
+
+    def test_unknown_detail_level(self, tmp_path):
+        """Test that an unknown detail level is rejected."""
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(self.LOG)
+
+        with pytest.raises(ValueError):
+            MTGALogParser(str(log_file), detail_level="everything")
+
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
@@ -247,6 +501,89 @@ Another non-JSON line {broken
         assert "gre_event" in event_types
         assert "match_state" in event_types
 
+    def test_raw_line_kept_only_for_debug_logging(self, tmp_path, caplog):
+        """Test that events carry their source line only when debug logging is on."""
+        line = '{"greToClientEvent":{"greToClientMessages":[]}}'
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(line + "\n")
+        parser = MTGALogParser(str(log_file))
+
+        with caplog.at_level(logging.INFO, logger="src.parser.log_parser"):
+            assert next(parser.parse_events()).raw_line == ""
+        with caplog.at_level(logging.DEBUG, logger="src.parser.log_parser"):
+            assert next(parser.parse_events()).raw_line == line
+
+    def test_multi_line_json(self, tmp_path):
+        """Test that a JSON object spread over several lines is parsed once complete."""
+        log_content = """{
+  "greToClientEvent": {
+    "note": "braces {inside} strings and \\"quotes\\" are ignored",
+    "greToClientMessages": []
+  }
+}
+{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"gameRoomConfig":{"matchId":"m-1"}}}}
+"""
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(log_content)
+
+        parser = MTGALogParser(str(log_file))
+        events = list(parser.parse_events())
+
+        assert [e.event_type for e in events] == ["gre_event", "match_state"]
+        assert events[0].line_number == 6
+
+    def test_malformed_json_line_does_not_swallow_rest_of_log(self, tmp_path):
+        """Test that a broken single-line object is skipped without starting a block."""
+        log_content = """{"greToClientEvent": {broken}}
+{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"gameRoomConfig":{"matchId":"m-1"}}}}
+"""
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(log_content)
+
+        parser = MTGALogParser(str(log_file))
+        events = list(parser.parse_events())
+
+        assert [e.event_type for e in events] == ["match_state"]
+
+    def test_event_errors_reported_once(self, tmp_path, caplog):
+        """Test that event errors are collected and only the first few logged."""
+        line = '{"greToClientEvent":{"greToClientMessages":[]}}\n'
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(line * (LOGGED_PARSE_ERRORS + 3))
+
+        parser = MTGALogParser(str(log_file))
+
+        def fail(event):
+            raise KeyError("boom")
+
+        parser._process_event = fail
+        with caplog.at_level(logging.INFO, logger="src.parser.log_parser"):
+            parser.parse_matches()
+
+        assert len(parser.get_parse_errors()) == LOGGED_PARSE_ERRORS + 3
+        warnings = [r for r in caplog.records if r.getMessage().startswith("Error processing")]
+        assert len(warnings) == LOGGED_PARSE_ERRORS
+
+    def test_non_event_json_is_not_decoded(self, tmp_path, monkeypatch):
+        """Test that JSON lines naming no known event skip the decoder."""
+        log_content = """[UnityCrossThreadLogger]<== GetPlayerInventory {"gems": 100, "gold": 2500}
+{"unrelated": {"payload": [1, 2, 3]}}
+{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"gameRoomConfig":{"matchId":"m-1"}}}}
+"""
+        log_file = tmp_path / "Player.log"
+        log_file.write_text(log_content)
+        decoded = []
+        real_loads = log_parser._json_loads
+        monkeypatch.setattr(
+            log_parser, "_json_loads", lambda data: decoded.append(data) or real_loads(data)
+        )
+
+        parser = MTGALogParser(str(log_file))
+        events = list(parser.parse_events())
+
+        assert [e.event_type for e in events] == ["match_state"]
+        assert len(decoded) == 1
+
     def test_unicode_characters(self, tmp_path):
         """Test handling of unicode characters in player names."""
         log_content = """{"matchGameRoomStateChangedEvent":{"gameRoomInfo":{"stateType":"MatchGameRoomStateType_Playing","gameRoomConfig":{"matchId":"unicode-test","reservedPlayers":[{"playerName":"Plàyér™","systemSeatId":2},{"playerName":"対戦相手","systemSeatId":1}]}}}}
@@ -314,20 +651,9 @@ Another non-JSON line {broken
 
 
 class TestTokenNameGeneration:
-    """Tests for the _generate_token_name helper in DataImportService."""
-
-    def _make_service(self):
-        from unittest.mock import MagicMock
-
-        from src.services.import_service import DataImportService
-
-        svc = DataImportService.__new__(DataImportService)
-        svc.db = MagicMock()
-        svc.scryfall = MagicMock()
-        return svc
+    """Tests for the generate_token_name helper in the import service."""
 
     def test_creature_token_with_pt_color_subtype(self):
-        svc = self._make_service()
         inst = {
             "type": "GameObjectType_Token",
             "power": 1,
@@ -336,10 +662,9 @@ class TestTokenNameGeneration:
             "subtypes": ["SubType_Goblin"],
             "card_types": ["CardType_Creature"],
         }
-        assert svc._generate_token_name(inst) == "1/1 Red Goblin Creature Token"
+        assert generate_token_name(inst) == "1/1 Red Goblin Creature Token"
 
     def test_artifact_token_no_pt(self):
-        svc = self._make_service()
         inst = {
             "type": "GameObjectType_Token",
             "power": None,
@@ -348,15 +673,13 @@ class TestTokenNameGeneration:
             "subtypes": ["SubType_Treasure"],
             "card_types": ["CardType_Artifact"],
         }
-        assert svc._generate_token_name(inst) == "Treasure Artifact Token"
+        assert generate_token_name(inst) == "Treasure Artifact Token"
 
     def test_emblem_token(self):
-        svc = self._make_service()
         inst = {"type": "GameObjectType_Emblem"}
-        assert svc._generate_token_name(inst) == "Emblem"
+        assert generate_token_name(inst) == "Emblem"
 
     def test_colorless_token(self):
-        svc = self._make_service()
         inst = {
             "type": "GameObjectType_Token",
             "power": 2,
@@ -365,7 +688,7 @@ class TestTokenNameGeneration:
             "subtypes": ["SubType_Lander"],
             "card_types": ["CardType_Artifact"],
         }
-        assert svc._generate_token_name(inst) == "2/2 Lander Artifact Token"
+        assert generate_token_name(inst) == "2/2 Lander Artifact Token"
 
 
 class TestCollectCardIds:
@@ -4,13 +4,22 @@ Tests for the Scryfall bulk data service.
 Tests downloading, indexing, and querying card data.
 """
 
+import io
 import json
+import pickle
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.services.scryfall import ScryfallBulkService  # noqa: E402
+from src.services import scryfall  # noqa: E402
+from src.services.scryfall import (  # noqa: E402
+    STREAM_BULK_DATA_ENV,
+    CardIndex,
+    ScryfallBulkService,
+)
 
 
 class TestScryfallServiceInitialization:
@@ -30,7 +39,7 @@ class TestScryfallServiceInitialization:
         service = ScryfallBulkService(str(tmp_path))
 
         assert service._bulk_file_path == tmp_path / "scryfall_default_cards.json"
-        assert service._index_file_path == tmp_path / "arena_id_index.json"
+        assert service._index_file_path == tmp_path / "arena_id_index.pkl"
 
 
 class TestCardDataSimplification:
@@ -145,6 +154,51 @@ class TestIndexOperations:
         assert 1001 in service._arena_id_index
         assert 1002 in service._arena_id_index
 
+    def test_build_index_streaming(self, tmp_path, monkeypatch):
+        """Test that the streaming build yields the same index as the full load."""
+        monkeypatch.setenv(STREAM_BULK_DATA_ENV, "1")
+        service = ScryfallBulkService(str(tmp_path))
+        bulk_file = tmp_path / "scryfall_default_cards.json"
+        bulk_file.write_text(
+            json.dumps([{"name": "Card 1", "arena_id": 1001, "cmc": 1.5}, {"name": "No ID"}])
+        )
+
+        assert service._build_index() is True
+
+        assert list(service._arena_id_index) == [1001]
+        assert service._arena_id_index[1001]["cmc"] == 1.5
+        assert type(service._arena_id_index[1001]["cmc"]) is float
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_build_index_drops_bulk_file_from_page_cache(self, tmp_path, monkeypatch, stream):
+        """Test that the bulk file's cached pages are released once it is parsed."""
+        if stream:
+            monkeypatch.setenv(STREAM_BULK_DATA_ENV, "1")
+        advice = []
+        monkeypatch.setattr(
+            scryfall.os, "posix_fadvise", lambda *args: advice.append(args), raising=False
+        )
+        monkeypatch.setattr(scryfall.os, "POSIX_FADV_DONTNEED", 4, raising=False)
+        (tmp_path / "scryfall_default_cards.json").write_text(
+            json.dumps([{"name": "Card 1", "arena_id": 1001}])
+        )
+
+        assert ScryfallBulkService(str(tmp_path))._build_index() is True
+
+        assert [call[1:] for call in advice] == [(0, 0, 4)]
+
+    def test_build_index_keeps_last_card_for_repeated_arena_id(self, tmp_path):
+        """Test that a repeated Arena ID is indexed with its last card."""
+        bulk_data = [{"name": f"Card {i}", "arena_id": 1000 + i % 7, "cmc": i} for i in range(20)]
+        bulk_data.append({"name": "No Arena ID"})
+        (tmp_path / "scryfall_default_cards.json").write_text(json.dumps(bulk_data))
+        service = ScryfallBulkService(str(tmp_path))
+
+        assert service._build_index() is True
+
+        assert len(service._arena_id_index) == 7
+        assert service._arena_id_index[1000]["name"] == "Card 14"
+
     def test_save_and_load_index(self, tmp_path):
         """Test saving and loading index from disk."""
         service = ScryfallBulkService(str(tmp_path))
@@ -167,6 +221,24 @@ class TestIndexOperations:
         assert len(service2._arena_id_index) == 2
         assert service2._arena_id_index[1001]["name"] == "Test Card 1"
 
+    def test_load_index_migrates_legacy_json(self, tmp_path):
+        """Test that a JSON index from an earlier version is loaded and rewritten."""
+        legacy_file = tmp_path / "arena_id_index.json"
+        legacy_file.write_text(json.dumps({"1001": {"name": "Test Card 1"}}))
+        service = ScryfallBulkService(str(tmp_path))
+
+        result = service._load_index()
+
+        assert result is True
+        assert service._arena_id_index[1001]["name"] == "Test Card 1"
+        assert not legacy_file.exists()
+        assert service._index_file_path.exists()
+
+        service2 = ScryfallBulkService(str(tmp_path))
+        assert service2._load_index() is True
+        assert list(service2._arena_id_index) == [1001]
+        assert service2._arena_id_index[1001]["name"] == "Test Card 1"
+
     def test_load_index_missing_file(self, tmp_path):
         """Test loading index when file doesn't exist."""
         service = ScryfallBulkService(str(tmp_path))
@@ -177,6 +249,69 @@ class TestIndexOperations:
         assert service._index_loaded is False
 
 
+class TestCardIndex:
+    """Tests for the lazily decoded card index."""
+
+    def test_cards_round_trip(self):
+        """Test that stored cards come back as the dicts that were added."""
+        service = ScryfallBulkService.__new__(ScryfallBulkService)
+        card = service._simplify_card_data({"name": "Opt", "arena_id": 1001, "colors": ["U"]})
+        index = CardIndex([(1001, card)])
+
+        assert index[1001] == card
+        assert index.get(1001) == card
+        assert index.get(9999) is None
+        assert 1001 in index
+        assert len(index) == 1
+
+    def test_repeated_lookups_reuse_decoded_card(self):
+        """Test that a card is decoded once and then served from the cache."""
+        index = CardIndex([(1001, {"name": "Opt"})])
+
+        assert index.get(1001) is index[1001]
+
+    def test_decoded_cards_share_set_and_rarity_strings(self):
+        """Test that cards from the same set hold the same set code object."""
+        index = CardIndex(
+            [
+                (1001, {"name": "Opt", "set_code": "xln", "rarity": "common"}),
+                (1002, {"name": "Shock", "set_code": "xln", "rarity": "common"}),
+            ]
+        )
+
+        assert index[1001]["set_code"] is index[1002]["set_code"]
+        assert index[1001]["rarity"] is index[1002]["rarity"]
+
+    def test_add_replaces_existing_card(self):
+        """Test that a later card with the same Arena ID wins."""
+        index = CardIndex([(1001, {"name": "Old"}), (1002, {"name": "Other"})])
+
+        index.add(1001, {"name": "New"})
+
+        assert len(index) == 2
+        assert index[1001]["name"] == "New"
+        assert index[1002]["name"] == "Other"
+
+    def test_ids_outside_the_table(self):
+        """Test that very large and negative Arena IDs still round-trip."""
+        index = CardIndex([(1 << 40, {"name": "Huge"}), (-5, {"name": "Negative"})])
+
+        assert index[1 << 40]["name"] == "Huge"
+        assert index.get(-5)["name"] == "Negative"
+        assert list(index) == [1 << 40, -5]
+        assert 7 not in index
+        assert "7" not in index
+
+    def test_index_survives_pickling(self):
+        """Test that the index can be written to and read from the pickle cache."""
+        index = CardIndex([(1001, {"name": "Opt", "cmc": 1.0})])
+
+        restored = pickle.loads(pickle.dumps(index, protocol=5))
+
+        assert restored == index
+        assert restored[1001]["cmc"] == 1.0
+
+
 class TestCardLookup:
     """Tests for card lookup functionality."""
 
@@ -237,3 +372,172 @@ class TestServiceStats:
         assert stats["total_cards"] == 100
         assert stats["index_loaded"] is True
         assert stats["bulk_file_exists"] is True
+
+
+class _FakeResponse:
+    """Minimal stand-in for a streamed requests response."""
+
+    def __init__(self, payload):
+        self._payload = payload
+        self.raw = io.BytesIO(json.dumps(payload).encode("utf-8"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class TestDownload:
+    """Tests for downloading bulk data."""
+
+    def test_download_without_keeping_raw_file(self, tmp_path, monkeypatch):
+        """Test that the index can be built straight from the download stream."""
+        responses = {
+            ScryfallBulkService.BULK_DATA_URL: {
+                "data": [{"type": "default_cards", "download_uri": "https://example.com/bulk"}]
+            },
+            "https://example.com/bulk": [{"name": "Card 1", "arena_id": 1001}, {"name": "No ID"}],
+        }
+        monkeypatch.setattr(
+            scryfall.requests, "get", lambda url, **kwargs: _FakeResponse(responses[url])
+        )
+        service = ScryfallBulkService(str(tmp_path))
+
+        assert service.ensure_bulk_data(force_download=True, keep_raw=False) is True
+
+        assert list(service._arena_id_index) == [1001]
+        assert service._index_file_path.exists()
+        assert not service._bulk_file_path.exists()
+
+    def _fake_scryfall(self, monkeypatch, updated_at):
+        """Serve one bulk file from a fake Scryfall and record the URLs fetched."""
+        fetched = []
+        responses = {
+            ScryfallBulkService.BULK_DATA_URL: {
+                "data": [
+                    {
+                        "type": "default_cards",
+                        "download_uri": "https://example.com/bulk",
+                        "updated_at": updated_at,
+                    }
+                ]
+            },
+            "https://example.com/bulk": [{"name": "Card 1", "arena_id": 1001}],
+        }
+
+        def fake_get(url, **kwargs):
+            fetched.append(url)
+            return _FakeResponse(responses[url])
+
+        monkeypatch.setattr(scryfall.requests, "get", fake_get)
+        return fetched
+
+    def test_forced_download_skipped_when_bulk_data_unchanged(self, tmp_path, monkeypatch):
+        """Test that only the metadata is fetched when Scryfall has nothing new."""
+        self._fake_scryfall(monkeypatch, "2026-01-01T09:00:00.000+00:00")
+        assert ScryfallBulkService(str(tmp_path)).ensure_bulk_data(keep_raw=False) is True
+
+        fetched = self._fake_scryfall(monkeypatch, "2026-01-01T09:00:00.000+00:00")
+        service = ScryfallBulkService(str(tmp_path))
+
+        assert service.ensure_bulk_data(force_download=True, keep_raw=False) is True
+
+        assert fetched == [ScryfallBulkService.BULK_DATA_URL]
+        assert list(service._arena_id_index) == [1001]
+
+    def test_forced_download_fetches_updated_bulk_data(self, tmp_path, monkeypatch):
+        """Test that a newer bulk file is downloaded and remembered."""
+        self._fake_scryfall(monkeypatch, "2026-01-01T09:00:00.000+00:00")
+        assert ScryfallBulkService(str(tmp_path)).ensure_bulk_data(keep_raw=False) is True
+
+        fetched = self._fake_scryfall(monkeypatch, "2026-01-02T09:00:00.000+00:00")
+        service = ScryfallBulkService(str(tmp_path))
+
+        assert service.ensure_bulk_data(force_download=True, keep_raw=False) is True
+
+        assert fetched == [ScryfallBulkService.BULK_DATA_URL, "https://example.com/bulk"]
+        assert service._load_meta()["updated_at"] == "2026-01-02T09:00:00.000+00:00"
+
+    def test_download_card_images_skips_cached(self, tmp_path, monkeypatch):
+        """Test that a batch download fetches only uncached images."""
+        fetched = []
+
+        class FakeSession:
+            def get(self, url, **kwargs):
+                fetched.append(url)
+                response = _FakeResponse(None)
+                response.content = b"jpeg"
+                return response
+
+        monkeypatch.setattr(scryfall.requests, "Session", FakeSession)
+        service = ScryfallBulkService(str(tmp_path))
+        service._arena_id_index = {
+            grp_id: {"name": f"Card {grp_id}", "image_uri": f"https://example.com/{grp_id}.jpg"}
+            for grp_id in (1, 2, 3)
+        }
+        service._index_loaded = True
+        images_dir = tmp_path / "card_images"
+        images_dir.mkdir()
+        (images_dir / "1.jpg").write_bytes(b"cached")
+
+        results = service.download_card_images([1, 2, 3, 2, 4])
+
+        assert sorted(fetched) == ["https://example.com/2.jpg", "https://example.com/3.jpg"]
+        assert results[1] == images_dir / "1.jpg"
+        assert results[2].read_bytes() == b"jpeg"
+        assert results[4] is None
+
+    def test_cached_image_paths_come_from_one_scan(self, tmp_path):
+        """Test that cached images are found from a single directory scan."""
+        images_dir = tmp_path / "card_images"
+        images_dir.mkdir()
+        (images_dir / "1.jpg").write_bytes(b"cached")
+        (images_dir / "notes.txt").write_text("ignored")
+        service = ScryfallBulkService(str(tmp_path))
+
+        assert service.get_cached_image_path(1) == images_dir / "1.jpg"
+        assert service.get_cached_image_path(2) is None
+
+    def test_cached_image_added_after_scan_is_found(self, tmp_path):
+        """Test that an image cached by another process after the scan is picked up."""
+        images_dir = tmp_path / "card_images"
+        images_dir.mkdir()
+        service = ScryfallBulkService(str(tmp_path))
+        assert service.get_cached_image_path(2) is None
+
+        (images_dir / "2.jpg").write_bytes(b"cached")
+
+        assert service.get_cached_image_path(2) == images_dir / "2.jpg"
+
+    def test_deleted_cached_image_is_downloaded_again(self, tmp_path, monkeypatch):
+        """Test that an image removed since the scan is fetched again."""
+        fetched = []
+
+        class FakeSession:
+            def get(self, url, **kwargs):
+                fetched.append(url)
+                response = _FakeResponse(None)
+                response.content = b"jpeg"
+                return response
+
+        monkeypatch.setattr(scryfall.requests, "Session", FakeSession)
+        images_dir = tmp_path / "card_images"
+        images_dir.mkdir()
+        (images_dir / "1.jpg").write_bytes(b"cached")
+        service = ScryfallBulkService(str(tmp_path))
+        service._arena_id_index = {1: {"name": "Card 1", "image_uri": "https://example.com/1.jpg"}}
+        service._index_loaded = True
+        assert service.get_cached_image_path(1) is not None
+
+        (images_dir / "1.jpg").unlink()
+        results = service.download_card_images([1])
+
+        assert fetched == ["https://example.com/1.jpg"]
+        assert results[1].read_bytes() == b"jpeg"
@@ -239,3 +239,73 @@ class TestAPIEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "daily" in data
+
+
+@pytest.mark.django_db
+class TestAdminChangelists:
+    """Tests for admin changelist search and rendering."""
+
+    def test_card_search_by_grp_id(self, admin_client, sample_data):
+        """Test that a numeric term finds the card by exact grp_id."""
+        response = admin_client.get("/admin/stats/card/", {"q": "12345"})
+
+        assert response.status_code == 200
+        assert list(response.context["cl"].result_list) == [sample_data["card"]]
+
+    def test_card_search_by_partial_grp_id_finds_nothing(self, admin_client, sample_data):
+        """Test that grp_id is matched exactly rather than as a substring."""
+        response = admin_client.get("/admin/stats/card/", {"q": "234"})
+
+        assert list(response.context["cl"].result_list) == []
+
+    def test_match_search_by_id_prefix(self, admin_client, sample_data):
+        """Test that matches are found by the start of their match ID."""
+        response = admin_client.get("/admin/stats/match/", {"q": "match-"})
+
+        assert response.status_code == 200
+        assert response.context["cl"].result_count == 2
+
+    def _changelist_queries(self, admin_client, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = admin_client.get(url)
+        assert response.status_code == 200
+        return len(ctx.captured_queries)
+
+    def test_snapshot_changelist_query_count_independent_of_rows(self, admin_client, sample_data):
+        """Test that per-snapshot counts do not cost extra queries per row."""
+        from stats.models import DeckCard, DeckSnapshot, Match
+
+        url = "/admin/stats/decksnapshot/"
+        before = self._changelist_queries(admin_client, url)
+        for i in range(3):
+            snapshot = DeckSnapshot.objects.create(deck=sample_data["deck"])
+            DeckCard.objects.create(snapshot=snapshot, card=sample_data["card"], quantity=4)
+            DeckCard.objects.create(
+                snapshot=snapshot, card=sample_data["card"], quantity=2, is_sideboard=True
+            )
+            Match.objects.create(match_id=f"extra-{i}", snapshot=snapshot)
+            Match.objects.create(match_id=f"again-{i}", snapshot=snapshot)
+
+        assert self._changelist_queries(admin_client, url) == before
+        changelist = admin_client.get(url).context["cl"]
+        snapshot = changelist.result_list[0]
+        assert (snapshot._match_count, snapshot._mainboard_count) == (2, 4)
+        assert snapshot._sideboard_count == 2
+
+    def test_unknown_card_changelist_query_count_independent_of_rows(
+        self, admin_client, sample_data
+    ):
+        """Test that each unknown card's card, deck and session come from one query."""
+        from stats.models import Card, ImportSession, UnknownCard
+
+        url = "/admin/stats/unknowncard/"
+        session = ImportSession.objects.create(log_file="Player.log", status="completed")
+        before = self._changelist_queries(admin_client, url)
+        for i in range(3):
+            card = Card.objects.create(grp_id=90000 + i, name=f"Unknown Card ({90000 + i})")
+            UnknownCard.objects.create(card=card, deck=sample_data["deck"], import_session=session)
+
+        assert self._changelist_queries(admin_client, url) == before